@@ -0,0 +1,77 @@
+"""
+Wait for new IAM roles to propagate instead of sleeping a fixed time.
+
+A role created with CreateRole is not usable everywhere at once: IAM itself may not
+return it for a moment, and Lambda rejects CreateFunction with "The role defined for
+the function cannot be assumed by Lambda" until the role's trust policy has
+propagated, which usually takes a few seconds and occasionally much longer.
+utils.py used to sleep 10 or 100 seconds after every CreateRole to cover the worst
+case. These helpers poll instead:
+
+  - wait_for_role() polls GetRole until IAM returns the role
+  - create_function_when_role_ready() calls lambda CreateFunction and retries while
+    it fails only because the role cannot be assumed yet
+
+Both back off exponentially with full jitter (a random delay between 0 and
+min(max_delay, initial_delay * 2**attempt)) and give up after `timeout` seconds,
+re-raising the last error.
+"""
+
+import random
+import time
+
+from botocore.exceptions import ClientError
+
+ROLE_NOT_ASSUMABLE = "cannot be assumed"
+
+
+def backoff_delays(initial_delay=0.5, max_delay=8.0, rng=random.random):
+    """Yield full-jitter exponential backoff delays, forever."""
+    attempt = 0
+    while True:
+        yield rng() * min(max_delay, initial_delay * 2**attempt)
+        attempt += 1
+
+
+def retry_while(
+    call,
+    should_retry,
+    timeout=120,
+    initial_delay=0.5,
+    max_delay=8.0,
+    sleep=time.sleep,
+    clock=time.monotonic,
+    rng=random.random,
+):
+    """Return call(), retrying with backoff while it raises an error should_retry(error) accepts.
+
+    Any other error, or a retryable one once `timeout` seconds have passed, is raised.
+    """
+    deadline = clock() + timeout
+    for delay in backoff_delays(initial_delay, max_delay, rng):
+        try:
+            return call()
+        except ClientError as error:
+            if not should_retry(error) or clock() + delay > deadline:
+                raise
+        sleep(delay)
+
+
+def is_role_not_assumable(error):
+    """Lambda's error for a role whose trust policy has not propagated yet."""
+    details = error.response.get("Error", {})
+    return details.get("Code") == "InvalidParameterValueException" and ROLE_NOT_ASSUMABLE in details.get("Message", "")
+
+
+def is_no_such_entity(error):
+    return error.response.get("Error", {}).get("Code") == "NoSuchEntity"
+
+
+def wait_for_role(iam_client, role_name, timeout=60, **backoff):
+    """Poll GetRole until IAM returns the role; returns the GetRole response."""
+    return retry_while(lambda: iam_client.get_role(RoleName=role_name), is_no_such_entity, timeout, **backoff)
+
+
+def create_function_when_role_ready(lambda_client, function_config, timeout=120, **backoff):
+    """lambda_client.create_function(**function_config), retried until the role can be assumed."""
+    return retry_while(lambda: lambda_client.create_function(**function_config), is_role_not_assumable, timeout, **backoff)
@@ -0,0 +1,158 @@
+"""
+Check iam_waiters against stubbed botocore responses.
+
+Uses botocore's Stubber on real lambda and iam clients (no AWS calls) and a fake
+clock whose sleep() just advances time, so each check runs instantly and reports
+how long the waiter would have waited. The checks:
+
+  - CreateFunction failing with "cannot be assumed" is retried until it succeeds
+  - any other CreateFunction error is raised at once, without sleeping
+  - a role that never becomes assumable raises the last error after the timeout
+  - wait_for_role() polls GetRole through NoSuchEntity until the role appears
+  - for role propagation taking 2-15 s, the total wait stays close to the actual
+    propagation time, against the fixed 100 s sleep it replaces
+
+Usage:
+  python iam_waiters_local.py
+"""
+
+import random
+
+import boto3
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from iam_waiters import create_function_when_role_ready, wait_for_role
+
+ROLE_ARN = "arn:aws:iam::123456789012:role/gateway_lambda_iamrole"
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:123456789012:function:gateway_lambda"
+FUNCTION_CONFIG = {
+    "FunctionName": "gateway_lambda",
+    "Role": ROLE_ARN,
+    "Runtime": "python3.12",
+    "Handler": "lambda_function_code.lambda_handler",
+    "Code": {"ZipFile": b"zip"},
+    "PackageType": "Zip",
+}
+NOT_ASSUMABLE = "The role defined for the function cannot be assumed by Lambda."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def stubbed(service):
+    client = boto3.client(service, region_name="us-east-1", aws_access_key_id="stub", aws_secret_access_key="stub")
+    stubber = Stubber(client)
+    stubber.activate()
+    return client, stubber
+
+
+def check_retries_until_assumable():
+    client, stubber = stubbed("lambda")
+    clock = FakeClock()
+    for _ in range(3):
+        stubber.add_client_error("create_function", "InvalidParameterValueException", NOT_ASSUMABLE)
+    stubber.add_response("create_function", {"FunctionArn": FUNCTION_ARN}, FUNCTION_CONFIG)
+    response = create_function_when_role_ready(client, FUNCTION_CONFIG, sleep=clock.sleep, clock=clock)
+    stubber.assert_no_pending_responses()
+    assert response["FunctionArn"] == FUNCTION_ARN and len(clock.sleeps) == 3
+    assert all(0 <= delay <= 0.5 * 2**attempt for attempt, delay in enumerate(clock.sleeps))
+    print(f"{'not assumable x3:':<28}created after {len(clock.sleeps)} retries, {clock.now:.2f} s waited")
+
+
+def check_other_errors_raise():
+    client, stubber = stubbed("lambda")
+    clock = FakeClock()
+    stubber.add_client_error("create_function", "ResourceConflictException", "Function already exist: gateway_lambda")
+    try:
+        create_function_when_role_ready(client, FUNCTION_CONFIG, sleep=clock.sleep, clock=clock)
+    except ClientError as error:
+        assert error.response["Error"]["Code"] == "ResourceConflictException" and not clock.sleeps
+        print(f"{'other error:':<28}{error.response['Error']['Code']} raised, no retries")
+    else:
+        raise AssertionError("ResourceConflictException was swallowed")
+
+
+def check_timeout():
+    client, stubber = stubbed("lambda")
+    clock = FakeClock()
+    for _ in range(100):
+        stubber.add_client_error("create_function", "InvalidParameterValueException", NOT_ASSUMABLE)
+    try:
+        create_function_when_role_ready(client, FUNCTION_CONFIG, timeout=30, sleep=clock.sleep, clock=clock)
+    except ClientError:
+        assert clock.now <= 30
+        print(f"{'never assumable, 30 s:':<28}gave up after {len(clock.sleeps) + 1} attempts at {clock.now:.2f} s")
+    else:
+        raise AssertionError("a role that never propagated was accepted")
+
+
+def check_wait_for_role():
+    client, stubber = stubbed("iam")
+    clock = FakeClock()
+    for _ in range(2):
+        stubber.add_client_error("get_role", "NoSuchEntity", "The role cannot be found.", 404)
+    role = {
+        "Path": "/",
+        "RoleName": "gateway_lambda_iamrole",
+        "RoleId": "AROAEXAMPLEEXAMPLE123",
+        "Arn": ROLE_ARN,
+        "CreateDate": "2025-08-01T00:00:00Z",
+    }
+    stubber.add_response("get_role", {"Role": role}, {"RoleName": "gateway_lambda_iamrole"})
+    response = wait_for_role(client, "gateway_lambda_iamrole", sleep=clock.sleep, clock=clock)
+    stubber.assert_no_pending_responses()
+    assert response["Role"]["Arn"] == ROLE_ARN
+    print(f"{'get_role NoSuchEntity x2:':<28}found after {len(clock.sleeps)} retries, {clock.now:.2f} s waited")
+
+
+def simulate_propagation(propagation_seconds, trials=200):
+    """Mean wait and attempts when CreateFunction starts working after propagation_seconds."""
+    total_wait = total_attempts = 0
+    for seed in range(trials):
+        clock = FakeClock()
+        attempts = 0
+
+        class Lambda:
+            def create_function(self, **config):
+                nonlocal attempts
+                attempts += 1
+                if clock.now < propagation_seconds:
+                    raise ClientError(
+                        {"Error": {"Code": "InvalidParameterValueException", "Message": NOT_ASSUMABLE}}, "CreateFunction"
+                    )
+                return {"FunctionArn": FUNCTION_ARN}
+
+        create_function_when_role_ready(
+            Lambda(), FUNCTION_CONFIG, sleep=clock.sleep, clock=clock, rng=random.Random(seed).random
+        )
+        total_wait += clock.now
+        total_attempts += attempts
+    return total_wait / trials, total_attempts / trials
+
+
+def main():
+    check_retries_until_assumable()
+    check_other_errors_raise()
+    check_timeout()
+    check_wait_for_role()
+
+    print()
+    print(f"{'propagation s':>14}{'mean wait s':>13}{'mean calls':>12}{'fixed sleep s':>15}")
+    for propagation_seconds in (2, 5, 8, 15):
+        wait, attempts = simulate_propagation(propagation_seconds)
+        print(f"{propagation_seconds:>14}{wait:>13.1f}{attempts:>12.1f}{100:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Run the provisioning steps in utils.py as a dependency graph instead of in sequence.
+
+Setting up a gateway stack calls setup/create helpers one after another (user pool,
+resource server, client, gateway role, Lambda roles, Lambda functions, DynamoDB
+tables), although most of them do not depend on each other. A Plan records each
+step and what it needs; Provisioner runs it:
+
+  - steps whose dependencies have finished run concurrently in a thread pool, so
+    total time approaches the critical path rather than the sum of the steps
+  - a dependency is declared by passing Ref("step") as an argument (the step's
+    result is substituted, and Ref("step", "key") picks an item out of it) or with
+    after=[...] for ordering without a value
+  - every step's start and end are recorded; report() prints the timing breakdown
+    along with the critical path and the sequential total
+  - when a step fails, nothing that depends on it starts, the rest of the plan
+    still runs, and ProvisioningError is raised. Results of finished steps are kept
+    (and written to state_path if given), so running the plan again, in this
+    process or a new one, skips them and carries on where it failed
+
+Results loaded from a state file have been through JSON (datetimes become strings).
+
+Usage:
+    plan = Plan()
+    plan.add("pool", utils.get_or_create_user_pool, cognito, "MCPServerPool")
+    plan.add("resource_server", utils.get_or_create_resource_server, cognito, Ref("pool"), ...)
+    plan.add("gateway_role", utils.create_agentcore_gateway_role, "my-gateway")
+    provisioner = Provisioner(plan, state_path="provisioning.json")
+    results = provisioner.run()
+    print(provisioner.report())
+
+gateway_stack_plan() builds the plan for a multi-target Lambda gateway from utils.py.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import boto3
+
+import utils
+
+
+@dataclass(frozen=True)
+class Ref:
+    """Placeholder for another step's result (or result[key]) in a step's arguments."""
+
+    step: str
+    key: Any = None
+
+    def resolve(self, results):
+        result = results[self.step]
+        return result if self.key is None else result[self.key]
+
+
+@dataclass
+class Step:
+    name: str
+    fn: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    after: tuple = ()
+
+    @property
+    def requires(self):
+        refs = [value.step for value in (*self.args, *self.kwargs.values()) if isinstance(value, Ref)]
+        return tuple(dict.fromkeys([*refs, *self.after]))
+
+
+@dataclass
+class StepTiming:
+    start: float
+    end: float
+    status: str
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class ProvisioningError(Exception):
+    """One or more steps failed; `errors` maps step names to their exceptions."""
+
+    def __init__(self, errors, skipped):
+        self.errors = errors
+        self.skipped = skipped
+        failed = ", ".join(f"{name} ({type(error).__name__}: {error})" for name, error in errors.items())
+        super().__init__(f"failed: {failed}; not started: {', '.join(skipped) or 'none'}")
+
+
+class Plan:
+    """Provisioning steps and the dependencies between them."""
+
+    def __init__(self):
+        self.steps = {}
+
+    def add(self, name, fn, *args, after=(), **kwargs):
+        """Add a step calling fn(*args, **kwargs), with Ref arguments resolved first."""
+        if name in self.steps:
+            raise ValueError(f"duplicate step {name!r}")
+        self.steps[name] = Step(name, fn, args, kwargs, tuple(after))
+        return Ref(name)
+
+    def validate(self):
+        """Raise ValueError for unknown dependencies or cycles; returns a topological order."""
+        for step in self.steps.values():
+            unknown = [name for name in step.requires if name not in self.steps]
+            if unknown:
+                raise ValueError(f"step {step.name!r} depends on unknown step(s): {', '.join(unknown)}")
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"dependency cycle: {' -> '.join([*path, name])}")
+            state[name] = "visiting"
+            for dependency in self.steps[name].requires:
+                visit(dependency, [*path, name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, [])
+        return order
+
+
+class Provisioner:
+    """Runs a Plan concurrently, records timings, and resumes after failures."""
+
+    def __init__(self, plan, max_workers=8, state_path=None, clock=time.perf_counter):
+        """
+        Args:
+            plan: The Plan to run.
+            max_workers: Steps allowed to run at the same time.
+            state_path: JSON file recording finished steps' results (mode 0600, as they
+                can include client secrets); None keeps them in memory only.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.plan = plan
+        self.max_workers = max_workers
+        self.state_path = Path(state_path) if state_path else None
+        self.clock = clock
+        self.results = {}
+        self.timings = {}
+        self._lock = threading.Lock()
+        if self.state_path is not None and self.state_path.exists():
+            self.results.update(json.loads(self.state_path.read_text()))
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.state_path.parent, prefix=self.state_path.name)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.results, f, indent=2, default=str)
+            os.replace(tmp, self.state_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _run_step(self, step, started):
+        args = [value.resolve(self.results) if isinstance(value, Ref) else value for value in step.args]
+        kwargs = {key: value.resolve(self.results) if isinstance(value, Ref) else value for key, value in step.kwargs.items()}
+        start = self.clock() - started
+        try:
+            result = step.fn(*args, **kwargs)
+        except BaseException:
+            self.timings[step.name] = StepTiming(start, self.clock() - started, "failed")
+            raise
+        self.timings[step.name] = StepTiming(start, self.clock() - started, "done")
+        return result
+
+    def run(self):
+        """Run every step not already completed; returns {step name: result}.
+
+        If a step fails, the steps that do not depend on it still run; then
+        ProvisioningError is raised, listing the steps that were not started.
+        """
+        self.plan.validate()
+        steps = self.plan.steps
+        pending = {name for name in steps if name not in self.results}
+        for name in set(steps) - pending:
+            self.timings.setdefault(name, StepTiming(0.0, 0.0, "resumed"))
+        errors = {}
+        started = self.clock()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="provision") as executor:
+            running = {}
+            while True:
+                # A failed step never gets a result, so its dependents never become ready
+                ready = [name for name in pending if all(dep in self.results for dep in steps[name].requires)]
+                for name in sorted(ready):
+                    pending.discard(name)
+                    running[executor.submit(self._run_step, steps[name], started)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        errors[name] = error
+                        continue
+                    with self._lock:
+                        self.results[name] = result
+                        self._save()
+
+        if errors:
+            raise ProvisioningError(errors, sorted(pending))
+        return self.results
+
+    def critical_path(self):
+        """(step names, seconds) of the longest dependency chain by measured duration."""
+        longest = {}
+        for name in self.plan.validate():
+            timing = self.timings.get(name)
+            duration = timing.duration if timing else 0.0
+            best = max((longest[dep] for dep in self.plan.steps[name].requires), key=lambda path: path[1], default=((), 0.0))
+            longest[name] = ((*best[0], name), best[1] + duration)
+        return max(longest.values(), key=lambda path: path[1], default=((), 0.0))
+
+    def report(self):
+        """Timing breakdown: one line per step, then wall time vs critical path vs sequential."""
+        lines = [f"{'step':<32}{'status':<10}{'start s':>9}{'duration s':>12}", "=" * 63]
+        for name, timing in sorted(self.timings.items(), key=lambda item: (item[1].start, item[0])):
+            lines.append(f"{name:<32}{timing.status:<10}{timing.start:>9.2f}{timing.duration:>12.2f}")
+        wall = max((timing.end for timing in self.timings.values()), default=0.0)
+        sequential = sum(timing.duration for timing in self.timings.values())
+        path, path_seconds = self.critical_path()
+        lines.append("=" * 63)
+        lines.append(f"wall {wall:.2f} s, critical path {path_seconds:.2f} s, sequential {sequential:.2f} s")
+        lines.append(f"critical path: {' -> '.join(path)}")
+        return "\n".join(lines)
+
+
+def prime_boto3(services, region=None):
+    """Create the default boto3 session and one client per service on this thread.
+
+    boto3's default session is created lazily and is not safe to create, or to build
+    the first client of a service from, on several threads at once.
+    """
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+    for service in services:
+        boto3.DEFAULT_SESSION.client(service, region_name=region)
+
+
+def gateway_stack_plan(
+    gateway_name,
+    targets,
+    tables=(),
+    region="us-east-1",
+    user_pool_name="MCPServerPool",
+    resource_server_id="gateway-resource-server",
+    resource_server_name="Gateway Resource Server",
+    client_name="gateway-m2m-client",
+    scopes=({"ScopeName": "invoke", "ScopeDescription": "Invoke the gateway"},),
+):
+    """Plan the resources for a multi-target Lambda gateway.
+
+    Args:
+        gateway_name: Name passed to create_agentcore_gateway_role.
+        targets: Dicts with "name" and "code_path" for each Lambda target, and
+            optionally "policy_statements", "environment", "description" and
+            "tables" (table names that must exist before the function is deployed).
+        tables: Dicts of create_dynamodb_table arguments (table_name, key_schema,
+            attribute_definitions).
+
+    The steps and their dependencies:
+        user_pool -> resource_server -> m2m_client
+        gateway_role
+        table:<name>
+        role:<target> -> lambda:<target> -> permission:<target>
+    """
+    prime_boto3(["cognito-idp", "iam", "lambda", "sts", "dynamodb"], region)
+    cognito = boto3.client("cognito-idp", region_name=region)
+    scopes = [dict(scope) for scope in scopes]
+    plan = Plan()
+
+    pool = plan.add("user_pool", utils.get_or_create_user_pool, cognito, user_pool_name)
+    resource_server = plan.add(
+        "resource_server",
+        utils.get_or_create_resource_server,
+        cognito,
+        pool,
+        resource_server_id,
+        resource_server_name,
+        scopes,
+    )
+    plan.add(
+        "m2m_client",
+        utils.get_or_create_m2m_client,
+        cognito,
+        pool,
+        client_name,
+        resource_server,
+        [f"{resource_server_id}/{scope['ScopeName']}" for scope in scopes],
+    )
+    plan.add("gateway_role", utils.create_agentcore_gateway_role, gateway_name)
+
+    for table in tables:
+        plan.add(f"table:{table['table_name']}", utils.create_dynamodb_table, region=region, **table)
+
+    for target in targets:
+        name = target["name"]
+        role = plan.add(
+            f"role:{name}",
+            utils.create_lambda_role_with_policies,
+            f"{name}-role",
+            target.get("policy_statements"),
+            f"Execution role for the {name} gateway target",
+        )
+        plan.add(
+            f"lambda:{name}",
+            utils.deploy_lambda_function,
+            name,
+            role,
+            target["code_path"],
+            environment_vars=target.get("environment"),
+            description=target.get("description", f"{name} gateway target"),
+            region=region,
+            after=[f"table:{table}" for table in target.get("tables", ())],
+        )
+        plan.add(f"permission:{name}", utils.grant_gateway_invoke_permission, name, region, after=[f"lambda:{name}"])
+    return plan
@@ -0,0 +1,129 @@
+"""
+Run gateway_stack_plan() with simulated AWS calls to check Provisioner's scheduling.
+
+The plan is the real one for a three-target gateway with two DynamoDB tables, but
+every step's function is replaced with one that sleeps for a typical duration of
+that call (scaled down by SCALE) and returns a placeholder, so nothing touches AWS.
+The checks:
+
+  - every step starts only after the steps it depends on have finished
+  - wall time is close to the critical path, not the sequential sum
+  - after an injected failure the dependents of the failed step do not start, and a
+    second Provisioner reading the same state file runs only the remaining steps
+  - unknown dependencies and cycles are rejected before anything runs
+
+Usage:
+  python provisioner_local.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from provisioner import Plan, Provisioner, ProvisioningError, Ref, gateway_stack_plan
+
+SCALE = 0.02
+# Rough seconds each kind of step takes against AWS
+DURATIONS = {
+    "user_pool": 1.5,
+    "resource_server": 1.0,
+    "m2m_client": 1.0,
+    "gateway_role": 3.0,
+    "table": 8.0,
+    "role": 6.0,
+    "lambda": 10.0,
+    "permission": 0.5,
+}
+TARGETS = [
+    {"name": "calc", "code_path": "calc/lambda_function_code.py"},
+    {"name": "restaurant", "code_path": "restaurant/lambda_function_code.py", "tables": ["bookings"]},
+    {"name": "search", "code_path": "search/lambda_function_code.py", "tables": ["documents"]},
+]
+TABLES = [
+    {"table_name": name, "key_schema": [], "attribute_definitions": []} for name in ("bookings", "documents")
+]
+
+
+def simulated(name, fail=False):
+    seconds = DURATIONS[name.split(":")[0]] * SCALE
+
+    def step(*args, **kwargs):
+        time.sleep(seconds)
+        if fail:
+            raise RuntimeError("simulated throttling")
+        return ["id", f"{name}-result"] if name == "m2m_client" else f"{name}-result"
+
+    return step
+
+
+def simulated_plan(fail=()):
+    plan = gateway_stack_plan("demo-gateway", TARGETS, TABLES)
+    for name, step in plan.steps.items():
+        step.fn = simulated(name, fail=name in fail)
+    return plan
+
+
+def check_order(provisioner):
+    for name, step in provisioner.plan.steps.items():
+        timing = provisioner.timings[name]
+        for dependency in step.requires:
+            assert provisioner.timings[dependency].end <= timing.start, f"{name} started before {dependency} finished"
+
+
+def check_full_run():
+    provisioner = Provisioner(simulated_plan())
+    results = provisioner.run()
+    check_order(provisioner)
+    assert results["m2m_client"] == ["id", "m2m_client-result"]
+    print(provisioner.report())
+    wall = max(timing.end for timing in provisioner.timings.values())
+    _, critical = provisioner.critical_path()
+    sequential = sum(timing.duration for timing in provisioner.timings.values())
+    assert wall < critical * 1.2, "wall time is well above the critical path"
+    print(f"\nspeedup over sequential: {sequential / wall:.1f}x\n")
+
+
+def check_resume():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = Path(tmp) / "provisioning.json"
+        first = Provisioner(simulated_plan(fail={"role:restaurant"}), state_path=state_path)
+        try:
+            first.run()
+        except ProvisioningError as error:
+            assert set(error.errors) == {"role:restaurant"}
+            assert "lambda:restaurant" not in first.timings and "permission:restaurant" not in first.timings
+            print(f"{'first run:':<16}{error}")
+        else:
+            raise AssertionError("the injected failure was not raised")
+        print(f"{'state file:':<16}{len(first.results)} steps saved, mode {oct(state_path.stat().st_mode & 0o777)}")
+
+        second = Provisioner(simulated_plan(), state_path=state_path)
+        second.run()
+        ran = sorted(name for name, timing in second.timings.items() if timing.status == "done")
+        assert set(ran) == set(second.plan.steps) - set(first.results)
+        print(f"{'second run:':<16}ran {', '.join(ran)}")
+
+
+def check_validation():
+    for label, build in (
+        ("unknown step:", lambda plan: plan.add("a", print, Ref("missing"))),
+        ("cycle:", lambda plan: (plan.add("a", print, Ref("b")), plan.add("b", print, after=["a"]))),
+    ):
+        plan = Plan()
+        build(plan)
+        try:
+            Provisioner(plan).run()
+        except ValueError as error:
+            print(f"{label:<16}{error}")
+        else:
+            raise AssertionError(f"{label} accepted")
+
+
+def main():
+    check_full_run()
+    check_resume()
+    check_validation()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Cached Cognito client-credentials tokens for Gateway callers.
+
+get_token() in utils.py used to POST to the Cognito /oauth2/token endpoint, on a new
+connection, every time a token was needed. TokenManager keeps one access token per
+(user pool, client, scope) and hands out the cached token until it is about to
+expire:
+
+  - tokens are cached until expiry_margin seconds (default 30) before expires_in
+  - once a token is within refresh_ahead seconds (default 300) of expiring, the next
+    caller triggers a refresh in a background thread and still gets the cached
+    token, so in steady state callers never wait for Cognito
+  - fetches are single-flight: however many threads or asyncio tasks ask for the
+    same token at once, one request goes to Cognito and they all share its result
+  - all requests go through one pooled requests.Session
+  - get() is for threads; aget() is the asyncio variant and never blocks the event
+    loop (fetches run in the manager's thread pool)
+
+Usage:
+    manager = TokenManager()
+    token = manager.get(user_pool_id, client_id, client_secret, scope, region)
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def token_endpoint(user_pool_id, region):
+    """The Cognito domain's token URL for a user pool created by setup_cognito_user_pool()."""
+    return f"https://{user_pool_id.replace('_', '')}.auth.{region}.amazoncognito.com/oauth2/token"
+
+
+@dataclass
+class CachedToken:
+    response: dict
+    issued_at: float
+    expires_at: float
+
+
+class TokenManager:
+    """Thread-safe and asyncio-safe cache of client-credentials access tokens."""
+
+    def __init__(
+        self,
+        refresh_ahead=300,
+        expiry_margin=30,
+        timeout=10,
+        pool_size=10,
+        endpoint=token_endpoint,
+        clock=time.time,
+    ):
+        """
+        Args:
+            refresh_ahead: Start a background refresh this many seconds before expiry.
+            expiry_margin: Stop handing out a token this many seconds before expiry.
+            timeout: Seconds to wait for the token endpoint.
+            pool_size: Connections kept open in the HTTP session.
+            endpoint: Callable (user_pool_id, region) -> token URL; overridable for testing.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.refresh_ahead = refresh_ahead
+        self.expiry_margin = expiry_margin
+        self.timeout = timeout
+        self.endpoint = endpoint
+        self.clock = clock
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="token-refresh")
+        self.stats = {"hits": 0, "fetches": 0, "background_refreshes": 0, "errors": 0}
+        self._tokens = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, key, client_secret, region):
+        user_pool_id, client_id, scope = key
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "scope": scope,
+        }
+        issued_at = self.clock()
+        try:
+            response = self.session.post(
+                self.endpoint(user_pool_id, region),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                data=data,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            token = response.json()
+            cached = CachedToken(token, issued_at, issued_at + float(token.get("expires_in", 3600)))
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+                del self._in_flight[key]
+            raise
+        with self._lock:
+            self._tokens[key] = cached
+            self.stats["fetches"] += 1
+            del self._in_flight[key]
+        return cached
+
+    def _lookup(self, key, client_secret, region):
+        """Return (cached token or None, in-flight fetch or None) for `key`."""
+        now = self.clock()
+        with self._lock:
+            cached = self._tokens.get(key)
+            usable = cached is not None and now < cached.expires_at - self.expiry_margin
+            if usable and now < cached.expires_at - self.refresh_ahead:
+                self.stats["hits"] += 1
+                return cached, None
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = self.executor.submit(self._fetch, key, client_secret, region)
+                if usable:
+                    self.stats["background_refreshes"] += 1
+                    future.add_done_callback(self._log_refresh_failure)
+            if usable:
+                # Refresh window: the refresh runs in the background, this caller keeps the old token
+                self.stats["hits"] += 1
+                return cached, None
+            return None, future
+
+    @staticmethod
+    def _log_refresh_failure(future: Future):
+        if future.exception() is not None:
+            logger.warning("Background token refresh failed: %s", future.exception())
+
+    def _response(self, cached):
+        token = dict(cached.response)
+        token["expires_in"] = max(0, int(cached.expires_at - self.clock()))
+        return token
+
+    def get(self, user_pool_id, client_id, client_secret, scope, region):
+        """Return the token response ({"access_token": ..., "expires_in": ...}) for a client.
+
+        expires_in is the time the cached token has left. Raises
+        requests.RequestException if a token has to be fetched and the fetch fails.
+        """
+        key = (user_pool_id, client_id, scope)
+        cached, future = self._lookup(key, client_secret, region)
+        if cached is None:
+            cached = future.result()
+        return self._response(cached)
+
+    async def aget(self, user_pool_id, client_id, client_secret, scope, region):
+        """Like get(), for asyncio callers; waits for a fetch without blocking the loop."""
+        key = (user_pool_id, client_id, scope)
+        cached, future = self._lookup(key, client_secret, region)
+        if cached is None:
+            # shield: a cancelled caller must not cancel the fetch other callers share
+            cached = await asyncio.shield(asyncio.wrap_future(future))
+        return self._response(cached)
+
+    def invalidate(self, user_pool_id, client_id, scope):
+        """Drop a cached token, e.g. after the Gateway rejected it."""
+        with self._lock:
+            self._tokens.pop((user_pool_id, client_id, scope), None)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,139 @@
+"""
+Exercise TokenManager against a local stub of the Cognito token endpoint.
+
+The stub answers client-credentials requests after a fixed delay and counts them.
+With a controllable clock, the script checks that:
+
+  - concurrent threads and asyncio tasks asking for a token share one fetch
+  - cached tokens are served without touching the endpoint
+  - inside the refresh window callers get the cached token immediately while one
+    background refresh runs
+  - an expired token is fetched again, and a failing endpoint surfaces through
+    get_token() as {"error": ...} as before
+
+and compares steady-state get() latency with an uncached requests.post.
+
+Usage:
+  python token_manager_local.py --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+import utils
+from token_manager import TokenManager
+
+EXPIRES_IN = 3600
+
+
+def start_stub_cognito(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+            time.sleep(latency)
+            server.requests += 1
+            if form.get("client_secret") != ["secret"]:
+                self.send_response(400)
+                self.end_headers()
+                self.wfile.write(b'{"error": "invalid_client"}')
+                return
+            body = json.dumps(
+                {"access_token": f"token-{server.requests}", "expires_in": EXPIRES_IN, "token_type": "Bearer"}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def show(label, detail):
+    print(f"{label:<28}{detail}")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check TokenManager against a stub Cognito endpoint")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub token endpoint delay in seconds")
+    parser.add_argument("--callers", type=int, default=50, help="Concurrent callers per check")
+    args = parser.parse_args()
+
+    stub = start_stub_cognito(args.latency)
+    url = f"http://127.0.0.1:{stub.server_address[1]}/oauth2/token"
+    clock = Clock()
+    manager = TokenManager(endpoint=lambda user_pool_id, region: url, clock=clock)
+    client = ("us-east-1_pool", "client", "secret", "gateway/invoke", "us-east-1")
+
+    with ThreadPoolExecutor(args.callers) as pool:
+        tokens = set(pool.map(lambda _: manager.get(*client)["access_token"], range(args.callers)))
+    show(f"cold start, {args.callers} threads:", f"{stub.requests} request(s), tokens {sorted(tokens)}")
+    assert stub.requests == 1 and tokens == {"token-1"}
+
+    async def many(n):
+        return {token["access_token"] for token in await asyncio.gather(*(manager.aget(*client) for _ in range(n)))}
+
+    tokens = asyncio.run(many(args.callers))
+    show(f"cached, {args.callers} tasks:", f"{stub.requests} request(s), tokens {sorted(tokens)}")
+    assert stub.requests == 1 and tokens == {"token-1"}
+
+    clock.now += EXPIRES_IN - manager.refresh_ahead + 1
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.callers) as pool:
+        tokens = set(pool.map(lambda _: manager.get(*client)["access_token"], range(args.callers)))
+    waited = time.perf_counter() - start
+    show("refresh window:", f"served {sorted(tokens)} in {waited * 1000:.1f} ms")
+    assert tokens == {"token-1"} and waited < args.latency
+    time.sleep(args.latency * 2)
+    token = manager.get(*client)
+    show("after background refresh:", f"{stub.requests} request(s), token {token['access_token']}")
+    assert stub.requests == 2 and token["access_token"] == "token-2"
+
+    clock.now += EXPIRES_IN
+    tokens = asyncio.run(many(args.callers))
+    show(f"expired, {args.callers} tasks:", f"{stub.requests} request(s), tokens {sorted(tokens)}")
+    assert stub.requests == 3 and tokens == {"token-3"}
+
+    utils.token_manager = TokenManager(endpoint=lambda user_pool_id, region: url)
+    error = utils.get_token("us-east-1_pool", "client", "wrong", "gateway/invoke", "us-east-1")
+    show("bad secret via get_token:", f"{error}")
+    assert "error" in error
+
+    calls = 200
+    start = time.perf_counter()
+    for _ in range(calls):
+        manager.get(*client)
+    cached = (time.perf_counter() - start) / calls
+    data = {"grant_type": "client_credentials", "client_id": "client", "client_secret": "secret"}
+    start = time.perf_counter()
+    for _ in range(10):
+        requests.post(url, data=data).raise_for_status()
+    uncached = (time.perf_counter() - start) / 10
+    show("per call:", f"cached get() {cached * 1e6:.1f} us, uncached requests.post {uncached * 1000:.1f} ms")
+    show("stats:", f"{manager.stats}")
+
+
+if __name__ == "__main__":
+    main()
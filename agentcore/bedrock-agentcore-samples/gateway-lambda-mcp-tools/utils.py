@@ -5,8 +5,25 @@ from boto3.session import Session
 import botocore
 from botocore.exceptions import ClientError
 import requests
+import threading
 import time
 
+from iam_waiters import create_function_when_role_ready, wait_for_role
+from token_manager import TokenManager
+
+# One per process, shared by every get_token() caller. Created by the first
+# get_token() call, so importing utils does not start the refresh executor
+token_manager = None
+_token_manager_lock = threading.Lock()
+
+def _get_token_manager():
+    global token_manager
+    if token_manager is None:
+        with _token_manager_lock:
+            if token_manager is None:
+                token_manager = TokenManager()
+    return token_manager
+
 def setup_cognito_user_pool():
     boto_session = Session()
     region = boto_session.region_name
@@ -156,21 +173,9 @@ def get_or_create_m2m_client(cognito, user_pool_id, CLIENT_NAME, RESOURCE_SERVER
     return created["UserPoolClient"]["ClientId"], created["UserPoolClient"]["ClientSecret"]
 
 def get_token(user_pool_id: str, client_id: str, client_secret: str, scope_string: str, REGION: str) -> dict:
+    # Cached per (pool, client, scope) and refreshed in the background; see token_manager.py
     try:
-        user_pool_id_without_underscore = user_pool_id.replace("_", "")
-        url = f"https://{user_pool_id_without_underscore}.auth.{REGION}.amazoncognito.com/oauth2/token"
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "scope": scope_string,
-
-        }
-        print(client_id)
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        return response.json()
+        return _get_token_manager().get(user_pool_id, client_id, client_secret, scope_string, REGION)
 
     except requests.exceptions.RequestException as err:
         return {"error": str(err)}
@@ -307,9 +312,6 @@ def create_agentcore_role(agent_name):
             RoleName=agentcore_role_name,
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
-
-        # Pause to make sure role is created
-        time.sleep(10)
     except iam_client.exceptions.EntityAlreadyExistsException:
         print("Role already exists -- deleting and creating it again")
         policies = iam_client.list_role_policies(
@@ -332,6 +334,9 @@ def create_agentcore_role(agent_name):
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
 
+    # Wait until IAM returns the role (new or recreated)
+    wait_for_role(iam_client, agentcore_role_name)
+
     # Attach the AWSLambdaBasicExecutionRole policy
     print(f"attaching role policy {agentcore_role_name}")
     try:
@@ -402,9 +407,6 @@ def create_agentcore_gateway_role(gateway_name):
             RoleName=agentcore_gateway_role_name,
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
-
-        # Pause to make sure role is created
-        time.sleep(10)
     except iam_client.exceptions.EntityAlreadyExistsException:
         print("Role already exists -- deleting and creating it again")
         policies = iam_client.list_role_policies(
@@ -427,6 +429,9 @@ def create_agentcore_gateway_role(gateway_name):
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
 
+    # Wait until IAM returns the role (new or recreated)
+    wait_for_role(iam_client, agentcore_gateway_role_name)
+
     # Attach the AWSLambdaBasicExecutionRole policy
     print(f"attaching role policy {agentcore_gateway_role_name}")
     try:
@@ -495,7 +500,6 @@ def create_agentcore_gateway_role_with_region(gateway_name, region):
             RoleName=agentcore_gateway_role_name,
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
-        time.sleep(10)
     except iam_client.exceptions.EntityAlreadyExistsException:
         print("Role already exists -- deleting and creating it again")
         policies = iam_client.list_role_policies(
@@ -516,6 +520,9 @@ def create_agentcore_gateway_role_with_region(gateway_name, region):
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
 
+    # Wait until IAM returns the role (new or recreated)
+    wait_for_role(iam_client, agentcore_gateway_role_name)
+
     print(f"attaching role policy {agentcore_gateway_role_name}")
     try:
         iam_client.put_role_policy(
@@ -587,9 +594,6 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
             RoleName=agentcore_gateway_role_name,
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
-
-        # Pause to make sure role is created
-        time.sleep(10)
     except iam_client.exceptions.EntityAlreadyExistsException:
         print("Role already exists -- deleting and creating it again")
         policies = iam_client.list_role_policies(
@@ -612,6 +616,9 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
             AssumeRolePolicyDocument=assume_role_policy_document_json
         )
 
+    # Wait until IAM returns the role (new or recreated)
+    wait_for_role(iam_client, agentcore_gateway_role_name)
+
     # Attach the AWSLambdaBasicExecutionRole policy
     print(f"attaching role policy {agentcore_gateway_role_name}")
     try:
@@ -673,7 +680,6 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
         )
 
         print(f"Role '{role_name}' created successfully: {role_arn}")
-        time.sleep(100)
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == "EntityAlreadyExists":
             response = iam_client.get_role(RoleName=role_name)
@@ -688,7 +694,8 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
         print("Creating lambda function")
         # Create lambda function    
         try:
-            lambda_response = lambda_client.create_function(
+            # Retries (with backoff) while Lambda cannot assume the new role yet
+            lambda_response = create_function_when_role_ready(lambda_client, dict(
                 FunctionName=lambda_function_name,
                 Role=role_arn,
                 Runtime='python3.12',
@@ -696,7 +703,7 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
                 Code = {'ZipFile': lambda_function_code},
                 Description='Lambda function example for Bedrock AgentCore Gateway',
                 PackageType='Zip'
-            )
+            ))
 
             return_resp['lambda_function_arn'] = lambda_response['FunctionArn']
             return_resp['exit_code'] = 0
@@ -996,8 +1003,9 @@ def create_lambda_role_with_policies(role_name, policy_statements, description='
         except Exception as e:
             print(f"  ⚠ Policy error: {e}")
     
-    # Wait for role to propagate
-    time.sleep(10)
+    # Wait until IAM returns the role; deploy_lambda_function retries while Lambda
+    # cannot assume it yet
+    wait_for_role(iam_client, role_name)
     
     return role_arn
 
@@ -1045,7 +1053,7 @@ def deploy_lambda_function(function_name, role_arn, lambda_code_path, environmen
         function_config['Environment'] = {'Variables': environment_vars}
     
     try:
-        response = lambda_client.create_function(**function_config)
+        response = create_function_when_role_ready(lambda_client, function_config)
         lambda_arn = response['FunctionArn']
         print(f"✓ Lambda created: {function_name}")
         
@@ -1136,8 +1144,9 @@ def create_lambda_role(role_name, description='Lambda execution role'):
         PolicyArn='arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole'
     )
     
-    # Wait for role to propagate
-    time.sleep(10)
+    # Wait until IAM returns the role; deploy_lambda_function retries while Lambda
+    # cannot assume it yet
+    wait_for_role(iam_client, role_name)
     
     return role_arn
 
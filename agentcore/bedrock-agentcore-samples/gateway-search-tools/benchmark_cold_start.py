@@ -0,0 +1,113 @@
+"""
+Benchmark cold-start versus warm invocations of the Gateway Lambda targets.
+
+Each sample runs in a fresh Python process, as a new Lambda container would, and
+times:
+
+  - init:   importing lambda_function_code.py, which builds the Telemetry, the
+            booking store and the ToolRegistry (schema load, validator compilation)
+  - first:  the first invocation in the container
+  - warm:   the median of the following invocations, through the registry
+  - inline: the same warm invocations with the old per-call dispatch (split the
+            Gateway tool name, look up the handler, no validation) for comparison
+
+Python start-up itself is not included.
+
+Usage:
+  python benchmark_cold_start.py --samples 5 --invocations 1000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark_lambda_logging import TARGETS, FakeLambdaContext, load_handler_module
+
+
+def event_for(target, i):
+    _, event = TARGETS[target]
+    if target == "restaurant":
+        # A new guest per call, so every warm call makes a booking
+        return {**event, "guest_name": f"Guest {i}", "num_guests": 1}
+    return event
+
+
+def child(target, invocations):
+    """Measure one cold start and the warm invocations after it; prints JSON."""
+    tool_name, _ = TARGETS[target]
+    context = FakeLambdaContext(f"{target}___{tool_name}")
+
+    start = time.perf_counter()
+    module = load_handler_module(target)
+    init = time.perf_counter() - start
+
+    start = time.perf_counter()
+    module.lambda_handler(event_for(target, 0), context)
+    first = time.perf_counter() - start
+
+    warm = []
+    for i in range(1, invocations + 1):
+        start = time.perf_counter()
+        module.lambda_handler(event_for(target, i), context)
+        warm.append(time.perf_counter() - start)
+
+    handlers = {name: tool.handler for name, tool in module.registry.tools.items()}
+
+    @module.telemetry.instrument
+    def inline_handler(event, context):
+        return handlers[context.client_context.custom["bedrockAgentCoreToolName"].split("___")[1]](event)
+
+    inline = []
+    for i in range(invocations + 1, 2 * invocations + 1):
+        start = time.perf_counter()
+        inline_handler(event_for(target, i), context)
+        inline.append(time.perf_counter() - start)
+
+    print(json.dumps({"init": init, "first": first, "warm": statistics.median(warm), "inline": statistics.median(inline)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gateway Lambda cold starts and warm invocations")
+    parser.add_argument("--samples", type=int, default=5, help="Cold starts (fresh processes) per target")
+    parser.add_argument("--invocations", type=int, default=1000, help="Warm invocations per sample")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.invocations)
+        return
+
+    print(f"{'target':<12}{'init ms':>10}{'first ms':>10}{'warm us':>10}{'inline us':>11}")
+    print("=" * 53)
+    for target in TARGETS:
+        samples = []
+        for _ in range(args.samples):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = {
+                    **os.environ,
+                    "LOG_LEVEL": "WARNING",
+                    "BOOKINGS_DB": os.path.join(tmp, "bookings.sqlite3"),
+                    "RESTAURANT_SLOT_CAPACITY": str(10 * args.invocations),
+                }
+                output = subprocess.run(
+                    [sys.executable, __file__, "--child", target, "--invocations", str(args.invocations)],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+            samples.append(json.loads(output.splitlines()[-1]))
+        median = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+        print(
+            f"{target:<12}{median['init'] * 1e3:>10.2f}{median['first'] * 1e3:>10.3f}"
+            f"{median['warm'] * 1e6:>10.2f}{median['inline'] * 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
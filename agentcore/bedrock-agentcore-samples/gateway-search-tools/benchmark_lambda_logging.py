@@ -0,0 +1,169 @@
+"""
+Benchmark Gateway Lambda handler overhead: print-everything logging vs lambda_telemetry.
+
+Runs the calc and restaurant handlers locally with a fake Lambda context and writes
+all output to a temporary file (standing in for the CloudWatch Logs pipe), comparing:
+
+  - bare:       the handler with no logging at all
+  - print:      what the handlers used to do (print event, context, client_context,
+                tool name and result on every call)
+  - telemetry:  Telemetry.instrument at INFO with 1-in-100 sampling plus EMF metrics
+  - debug:      Telemetry.instrument at DEBUG (full dumps, as when troubleshooting)
+
+Reports the mean and p99 handler time and the log bytes written per invocation (a
+proxy for CloudWatch Logs ingest).
+
+Usage:
+  python benchmark_lambda_logging.py --invocations 20000
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+TARGETS = {
+    "calc": ("add_numbers", {"firstNumber": 5, "secondNumber": 3}),
+    "restaurant": (
+        "create_booking",
+        {"date": "2025-08-01", "hour": "19:30", "restaurant_name": "Tasty", "guest_name": "Sam", "num_guests": 4},
+    ),
+}
+
+
+class FakeClientContext:
+    def __init__(self, tool_name):
+        self.client = None
+        self.env = None
+        self.custom = {
+            "bedrockAgentCoreToolName": tool_name,
+            "bedrockAgentCoreGatewayId": "gateway-123abc",
+            "bedrockAgentCoreTargetId": "TARGET1",
+            "bedrockAgentCoreMessageVersion": "1.0",
+            "bedrockAgentCoreAwsRequestId": str(uuid.uuid4()),
+            "bedrockAgentCoreMcpMessageId": "3",
+        }
+
+    def __repr__(self):
+        return f"ClientContext([custom={self.custom},env={self.env},client={self.client}])"
+
+
+class FakeLambdaContext:
+    """Mirrors the attributes (and the long repr) of the Python runtime's LambdaContext."""
+
+    def __init__(self, tool_name):
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = "/aws/lambda/calc_lambda_gateway"
+        self.log_stream_name = "2025/08/01/[$LATEST]0123456789abcdef0123456789abcdef"
+        self.function_name = "calc_lambda_gateway"
+        self.memory_limit_in_mb = "128"
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:calc_lambda_gateway"
+        self.client_context = FakeClientContext(tool_name)
+        self.identity = None
+
+    def __repr__(self):
+        fields = ",".join(f"{name}={value}" for name, value in vars(self).items())
+        return f"LambdaContext([{fields}])"
+
+
+def load_handler_module(target):
+    """Import <target>/lambda_function_code.py under a unique module name.
+
+    calc/ and restaurant/ ship modules with the same names (lambda_telemetry,
+    tool_registry), so each target is imported with its own directory on sys.path
+    and sys.path and sys.modules are put back afterwards (as gateway_emulator does).
+    """
+    directory = HERE / target
+    local_names = {path.stem for path in directory.glob("*.py")}
+    saved_path = sys.path[:]
+    hidden = {name: sys.modules.pop(name) for name in local_names if name in sys.modules}
+    sys.path.insert(0, str(directory))
+    try:
+        spec = importlib.util.spec_from_file_location(f"{target}_lambda_function_code", directory / "lambda_function_code.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path[:] = saved_path
+        for name in local_names:
+            sys.modules.pop(name, None)
+        sys.modules.update(hidden)
+    return module
+
+
+def print_everything(handler):
+    """The handlers' old logging, around the undecorated handler."""
+
+    def wrapper(event, context):
+        print(f"event: {event}")
+        print(f"context: {context}")
+        print(f"context.client_context: {context.client_context}")
+        tool_name = context.client_context.custom["bedrockAgentCoreToolName"].split("___")[1]
+        print(f"tool_name: {tool_name}")
+        result = handler(event, context)
+        print(f"result: {result}")
+        return result
+
+    return wrapper
+
+
+def run(handler, event, context, invocations, sink):
+    durations = []
+    start_bytes = sink.tell()
+    with contextlib.redirect_stdout(sink):
+        for _ in range(invocations):
+            start = time.perf_counter()
+            handler(event, context)
+            durations.append(time.perf_counter() - start)
+    sink.flush()
+    return durations, (sink.tell() - start_bytes) / invocations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gateway Lambda logging overhead")
+    parser.add_argument("--invocations", type=int, default=20000, help="Handler calls per variant")
+    args = parser.parse_args()
+
+    # The restaurant handler books into a throwaway SQLite file (see booking_store.py)
+    bookings_dir = tempfile.TemporaryDirectory()
+    os.environ["BOOKINGS_DB"] = os.path.join(bookings_dir.name, "bookings.sqlite3")
+
+    print(f"{'target':<12}{'variant':<11}{'mean us':>9}{'p99 us':>9}{'log B/call':>12}")
+    print("=" * 53)
+    for target, (tool_name, event) in TARGETS.items():
+        module = load_handler_module(target)
+        raw_handler = module.lambda_handler.__wrapped__
+        context = FakeLambdaContext(f"{target}___{tool_name}")
+
+        with tempfile.TemporaryFile("w+") as sink:
+            sampled = module.Telemetry(
+                f"Benchmark/{target}/info", level="INFO", sample_rate=100, tool_name=module.registry.tool_name, stream=sink
+            )
+            verbose = module.Telemetry(
+                f"Benchmark/{target}/debug", level="DEBUG", tool_name=module.registry.tool_name, stream=sink
+            )
+            variants = {
+                "bare": raw_handler,
+                "print": print_everything(raw_handler),
+                "telemetry": sampled.instrument(raw_handler),
+                "debug": verbose.instrument(raw_handler),
+            }
+            for name, handler in variants.items():
+                durations, bytes_per_call = run(handler, event, context, args.invocations, sink)
+                us = sorted(duration * 1e6 for duration in durations)
+                print(
+                    f"{target:<12}{name:<11}{statistics.mean(us):>9.2f}"
+                    f"{us[int(len(us) * 0.99) - 1]:>9.2f}{bytes_per_call:>12.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
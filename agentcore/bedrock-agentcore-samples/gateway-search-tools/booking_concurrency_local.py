@@ -0,0 +1,117 @@
+"""
+Concurrency check for the restaurant booking engine (restaurant/booking_store.py).
+
+Many workers book the same restaurant time slot at once against one SQLite store.
+Each worker has its own connection, like separate Lambda containers would. Every
+worker also retries its booking, as an agent does after a timeout. The check
+verifies four things:
+
+  - the slot is never overbooked
+  - exactly as many bookings succeed as fit in the slot
+  - retries return the original booking instead of booking again
+  - reusing an idempotency key for different details raises BookingError
+
+The same checks apply to DynamoDBBookingStore against a real table. Set
+--dynamodb-table to run them there (it needs AWS credentials, and the table must
+have string keys pk and sk).
+
+Usage:
+  python booking_concurrency_local.py --workers 64 --capacity 40 --guests 2
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "restaurant"))
+
+from booking_store import (  # noqa: E402
+    BookingError,
+    DynamoDBBookingStore,
+    SlotFullError,
+    SQLiteBookingStore,
+    create_booking,
+)
+
+SLOT = {"restaurant_name": "Tasty Bites", "date": "2025-08-01", "hour": "19:30"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hammer one booking slot from many workers")
+    parser.add_argument("--workers", type=int, default=64, help="Concurrent bookers")
+    parser.add_argument("--capacity", type=int, default=40, help="Seats in the slot")
+    parser.add_argument("--guests", type=int, default=2, help="Guests per booking")
+    parser.add_argument("--retries", type=int, default=3, help="Retries of each booking")
+    parser.add_argument("--dynamodb-table", help="Run against this DynamoDB table instead of SQLite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dynamodb_table:
+
+            def new_store():
+                return DynamoDBBookingStore(args.dynamodb_table)
+
+            # Each run books a fresh slot so earlier runs do not count
+            SLOT["hour"] = time.strftime("%H:%M")
+            SLOT["restaurant_name"] += f" {time.time_ns()}"
+        else:
+            path = Path(tmp) / "bookings.sqlite3"
+            SQLiteBookingStore(path)
+
+            def new_store():
+                return SQLiteBookingStore(path)
+
+        start_line = threading.Barrier(args.workers)
+        outcomes = Counter()
+
+        def book(worker):
+            store = new_store()
+            start_line.wait()
+            ids = set()
+            for _ in range(1 + args.retries):
+                try:
+                    booking, created = create_booking(
+                        store, guest_name=f"Guest {worker}", num_guests=args.guests, capacity=args.capacity, **SLOT
+                    )
+                except SlotFullError:
+                    outcomes["full"] += 1
+                    continue
+                outcomes["created" if created else "replayed"] += 1
+                ids.add(booking.booking_id)
+            return ids
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.workers) as pool:
+            results = list(pool.map(book, range(args.workers)))
+        elapsed = time.perf_counter() - started
+
+        booked = new_store().seats_booked(**SLOT)
+        expected = min(args.workers, args.capacity // args.guests)
+        print(f"{args.workers} workers x {1 + args.retries} attempts in {elapsed * 1000:.0f} ms: {dict(outcomes)}")
+        print(f"seats booked: {booked} / {args.capacity}")
+
+        assert booked <= args.capacity, "slot overbooked"
+        assert outcomes["created"] == expected, f"expected {expected} bookings, got {outcomes['created']}"
+        assert booked == expected * args.guests
+        assert all(len(ids) <= 1 for ids in results), "a retry created a second booking"
+
+        # Reusing a key for a different party size must not confirm the old booking
+        store = new_store()
+        slot = {**SLOT, "hour": "12:00"}
+        create_booking(store, guest_name="Key Reuser", num_guests=2, idempotency_key="reused-key", **slot)
+        try:
+            create_booking(store, guest_name="Key Reuser", num_guests=4, idempotency_key="reused-key", **slot)
+        except BookingError as e:
+            print(f"reused key: {e}")
+        else:
+            raise AssertionError("a reused idempotency key confirmed a different booking")
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()
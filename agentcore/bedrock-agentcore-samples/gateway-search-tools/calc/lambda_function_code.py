@@ -1,19 +1,33 @@
+import os
+
+from lambda_telemetry import Telemetry
+from tool_registry import ToolRegistry
+
+# Validators compiled from calc-api.json; see tool_registry.py
+registry = ToolRegistry.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "calc-api.json"))
+# Built once per container; see lambda_telemetry.py for LOG_LEVEL / LOG_SAMPLE_RATE
+telemetry = Telemetry(namespace="GatewaySearchTools/calc", tool_name=registry.tool_name)
+
+
 def get_named_parameter(event, name):
     return event[name]
 
 
+@registry.tool("add_numbers")
 def handle_add(event):
     firstNumber = int(get_named_parameter(event, "firstNumber"))
     secondNumber = int(get_named_parameter(event, "secondNumber"))
     return {"sum": firstNumber + secondNumber}
 
 
+@registry.tool("multiply_numbers")
 def handle_multiply(event):
     multiplicand = int(get_named_parameter(event, "multiplicand"))
     multiplier = int(get_named_parameter(event, "multiplier"))
     return {"product": multiplicand * multiplier}
 
 
+@registry.tool("divide_numbers")
 def handle_divide(event):
     divisor = int(get_named_parameter(event, "divisor"))
     dividend = int(get_named_parameter(event, "dividend"))
@@ -26,6 +40,7 @@ def handle_divide(event):
     return {"quotient": quotient}
 
 
+@registry.tool("subtract_numbers")
 def handle_subtract(event):
     minuend = int(get_named_parameter(event, "minuend"))
     subtrahend = int(get_named_parameter(event, "subtrahend"))
@@ -35,26 +50,27 @@ def handle_subtract(event):
     return {"difference": difference}
 
 
+@registry.tool("batch_calculate")
+def handle_batch(event):
+    """Evaluate many tool invocations in one Lambda call.
+
+    event["invocations"] is a list of {"tool_name": ..., "arguments": {...}}, each
+    run through the registry in turn. Results come back in invocation order, with
+    {"error": ...} for invocations that failed.
+    """
+    results = []
+    for invocation in get_named_parameter(event, "invocations"):
+        tool_name = invocation.get("tool_name", "")
+        if tool_name not in registry.tools or tool_name == "batch_calculate":
+            results.append({"error": f"Unrecognized tool_name: {tool_name}"})
+            continue
+        try:
+            results.append(registry.call(tool_name, invocation.get("arguments", {})))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return {"results": results}
+
+
+@telemetry.instrument
 def lambda_handler(event, context):
-    print(f"event: {event}")
-    print(f"context: {context}")
-    print(f"context.client_context: {context.client_context}")
-
-    extended_tool_name = context.client_context.custom["bedrockAgentCoreToolName"]
-    tool_name = extended_tool_name.split("___")[1]
-
-    print(f"tool_name: {tool_name}")
-
-    if tool_name == "add_numbers":
-        result = handle_add(event)
-    elif tool_name == "multiply_numbers":
-        result = handle_multiply(event)
-    elif tool_name == "divide_numbers":
-        result = handle_divide(event)
-    elif tool_name == "subtract_numbers":
-        result = handle_subtract(event)
-    else:
-        result = f"Unrecognized tool_name: {tool_name}"
-
-    print(f"result: {result}")
-    return result
+    return registry.dispatch(event, context)
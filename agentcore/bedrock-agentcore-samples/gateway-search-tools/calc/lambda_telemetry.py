@@ -0,0 +1,183 @@
+"""
+Low-overhead logging and latency metrics for Gateway Lambda tool targets.
+
+The handlers used to print the full event, context and client_context on every
+invocation, which adds to both duration and CloudWatch Logs ingest on busy targets.
+Telemetry.instrument wraps a handler instead:
+
+  - logs are single-line JSON and gated by LOG_LEVEL (default INFO)
+  - full event / context / result dumps are only written at DEBUG
+  - successful invocations are logged at INFO for 1 in LOG_SAMPLE_RATE calls
+    (default 100); failures are always logged, with the traceback
+  - per-tool latencies are written as CloudWatch Embedded Metric Format records,
+    so CloudWatch builds a latency distribution (p50/p99) per tool without a
+    PutMetricData call; the values recorded during an invocation are written as
+    one record per tool when it ends (or sooner once a tool has 100 values, the
+    most one EMF metric can hold), so nothing is left buffered in an idle or
+    recycled container
+
+Usage:
+    telemetry = Telemetry(namespace="GatewaySearchTools/calc", tool_name=registry.tool_name)
+
+    @telemetry.instrument
+    def lambda_handler(event, context):
+        ...
+"""
+
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+EMF_MAX_VALUES = 100
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"level": record.levelname, "message": record.getMessage()}
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def gateway_tool_name(context):
+    """The Gateway's bedrockAgentCoreToolName, TARGET___ prefix included."""
+    return context.client_context.custom["bedrockAgentCoreToolName"]
+
+
+class Telemetry:
+    """Sampled structured logs plus buffered EMF latency histograms for one Lambda."""
+
+    def __init__(
+        self,
+        namespace,
+        level=None,
+        sample_rate=None,
+        tool_name=None,
+        stream=None,
+        clock=time.time,
+    ):
+        """Initialize from arguments, falling back to environment variables.
+
+        Args:
+            namespace: CloudWatch metric namespace, also used as the logger name.
+            level: Log level name; defaults to LOG_LEVEL or INFO.
+            sample_rate: Log 1 in N successful invocations; defaults to LOG_SAMPLE_RATE or 100.
+            tool_name: Maps the Lambda context to the tool name in logs and metrics; pass
+                ToolRegistry.tool_name so the TARGET___ prefix is parsed in one place.
+                Defaults to the Gateway's full tool name.
+            stream: Where log and EMF lines go; defaults to stdout (CloudWatch Logs in Lambda).
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.namespace = namespace
+        self.sample_rate = max(1, int(sample_rate or os.environ.get("LOG_SAMPLE_RATE", 100)))
+        self.tool_name = tool_name or gateway_tool_name
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        # Lambda runs one invocation at a time per container, but local runners
+        # (gateway_emulator.py) call the handler from a thread pool
+        self._lock = threading.Lock()
+
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(JsonFormatter())
+        self.logger = logger = logging.getLogger(namespace)
+        logger.handlers[:] = [handler]
+        logger.propagate = False
+        logger.setLevel((level or os.environ.get("LOG_LEVEL", "INFO")).upper())
+
+    def instrument(self, handler):
+        """Wrap a Gateway Lambda handler with sampled logging and latency metrics."""
+        logger = self.logger
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            tool_name = self.tool_name(context)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                fields = {"tool": tool_name, "event": event, "context": context, "client_context": context.client_context}
+                logger.debug("invocation", extra={"fields": fields})
+
+            start = time.perf_counter()
+            try:
+                result = handler(event, context)
+            except Exception:
+                duration_ms = (time.perf_counter() - start) * 1000
+                self.record(tool_name, duration_ms, failed=True)
+                logger.exception(
+                    "tool failed",
+                    extra={"fields": {"tool": tool_name, "duration_ms": round(duration_ms, 3), "event": event}},
+                )
+                self.flush()
+                raise
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.record(tool_name, duration_ms)
+            # Written before returning: Lambda may freeze or recycle the container
+            # right after, and buffered values would be delayed or lost
+            self.flush()
+
+            if debug:
+                logger.debug("result", extra={"fields": {"tool": tool_name, "result": result}})
+            elif logger.isEnabledFor(logging.INFO) and random.randrange(self.sample_rate) == 0:
+                fields = {
+                    "tool": tool_name,
+                    "duration_ms": round(duration_ms, 3),
+                    "request_id": getattr(context, "aws_request_id", None),
+                    "sample_rate": self.sample_rate,
+                }
+                logger.info("tool succeeded", extra={"fields": fields})
+            return result
+
+        return wrapper
+
+    def record(self, tool_name, duration_ms, failed=False):
+        with self._lock:
+            values = self._latencies[tool_name]
+            values.append(duration_ms)
+            if failed:
+                self._errors[tool_name] += 1
+            if len(values) >= EMF_MAX_VALUES:
+                self._flush()
+
+    def flush(self):
+        """Write one EMF record per tool with the buffered latencies and error count."""
+        with self._lock:
+            if self._latencies:
+                self._flush()
+
+    def _flush(self):
+        timestamp = int(self.clock() * 1000)
+        for tool_name, values in self._latencies.items():
+            if not values:
+                continue
+            record = {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": self.namespace,
+                            "Dimensions": [["Tool"]],
+                            "Metrics": [
+                                {"Name": "Latency", "Unit": "Milliseconds"},
+                                {"Name": "Invocations", "Unit": "Count"},
+                                {"Name": "Errors", "Unit": "Count"},
+                            ],
+                        }
+                    ],
+                },
+                "Tool": tool_name,
+                "Latency": [round(value, 3) for value in values],
+                "Invocations": len(values),
+                "Errors": self._errors[tool_name],
+            }
+            self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+        self._latencies.clear()
+        self._errors.clear()
@@ -0,0 +1,193 @@
+"""
+Per-container tool registry for Gateway Lambda targets.
+
+The handlers used to split bedrockAgentCoreToolName on "___" and pick a handler by
+string comparison on every invocation, then pull arguments out of the event one by
+one. A ToolRegistry is built at import time, so once per container, and moves that
+work out of the warm path:
+
+  - each registered tool gets an argument validator compiled from its inputSchema
+    in the target's *-api.json: required properties are checked and values are
+    converted to the schema type ("5" -> 5 for an integer, "2.5" -> 2.5 for a
+    number), so handlers receive typed arguments
+  - the Gateway's TARGET___tool names are resolved to tools through a memo, so a
+    warm container splits each distinct name once
+
+Usage:
+    registry = ToolRegistry.from_file(os.path.join(os.path.dirname(__file__), "calc-api.json"))
+
+    @registry.tool("add_numbers")
+    def handle_add(arguments):
+        ...
+
+    def lambda_handler(event, context):
+        return registry.dispatch(event, context)
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+TOOL_NAME_DELIMITER = "___"
+MAX_RESOLVED_NAMES = 1024
+
+
+class ToolArgumentError(ValueError):
+    """The arguments do not match the tool's inputSchema."""
+
+
+def _to_integer(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value.strip())
+    raise TypeError
+
+
+def _to_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return float(value.strip())
+    raise TypeError
+
+
+def _to_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise TypeError
+
+
+def _expect(kind):
+    def convert(value):
+        if not isinstance(value, kind):
+            raise TypeError
+        return value
+
+    return convert
+
+
+CONVERTERS = {
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+    "string": _expect(str),
+    "array": _expect(list),
+    "object": _expect(dict),
+}
+
+
+def compile_validator(input_schema):
+    """Build a function that checks and converts arguments for one inputSchema.
+
+    The returned function takes the event (the tool arguments) and returns them
+    with each declared property converted to its schema type (a copy, if anything
+    was converted); properties the schema does not declare are passed through.
+    It raises ToolArgumentError for a missing required property, a value that
+    cannot be converted, or a value outside the property's enum.
+    """
+    required = tuple(input_schema.get("required", ()))
+    fields = []
+    for name, schema in input_schema.get("properties", {}).items():
+        schema_type = schema.get("type")
+        converter = CONVERTERS.get(schema_type) if isinstance(schema_type, str) else None
+        enum = frozenset(schema["enum"]) if "enum" in schema else None
+        fields.append((name, schema_type, converter, enum))
+
+    def validate(arguments):
+        for name in required:
+            if name not in arguments:
+                missing = [name for name in required if name not in arguments]
+                raise ToolArgumentError(f"missing required argument(s): {', '.join(missing)}")
+        # Arguments that already have the right types are returned as they are;
+        # the dict is only copied once a value needs converting
+        converted = arguments
+        for name, schema_type, converter, enum in fields:
+            if name not in arguments:
+                continue
+            value = arguments[name]
+            if converter is not None:
+                try:
+                    new_value = converter(value)
+                except (TypeError, ValueError):
+                    raise ToolArgumentError(f"{name}: expected {schema_type}, got {value!r}") from None
+                if new_value is not value:
+                    if converted is arguments:
+                        converted = dict(arguments)
+                    converted[name] = value = new_value
+            if enum is not None and value not in enum:
+                raise ToolArgumentError(f"{name}: {value!r} is not one of {sorted(enum)}")
+        return converted
+
+    return validate
+
+
+@dataclass(frozen=True)
+class RegisteredTool:
+    name: str
+    handler: Callable[[dict], Any]
+    validate: Callable[[dict], dict]
+
+    def __call__(self, arguments):
+        return self.handler(self.validate(arguments))
+
+
+class ToolRegistry:
+    """Tool handlers and their compiled validators for one Lambda target."""
+
+    def __init__(self, tool_schemas):
+        self.schemas = {tool["name"]: tool.get("inputSchema", {}) for tool in tool_schemas}
+        self.tools = {}
+        self._resolved = {}
+
+    @classmethod
+    def from_file(cls, path):
+        """Load the tool schemas from a *-api.json file (a list of name/inputSchema entries)."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def tool(self, name):
+        """Decorator registering a handler for `name`, validated against its inputSchema."""
+
+        def register(handler):
+            self.tools[name] = RegisteredTool(name, handler, compile_validator(self.schemas.get(name, {})))
+            self._resolved.clear()
+            return handler
+
+        return register
+
+    def resolve(self, extended_tool_name):
+        """Map a Gateway tool name (TARGET___tool) to (tool name, RegisteredTool or None)."""
+        resolved = self._resolved.get(extended_tool_name)
+        if resolved is None:
+            tool_name = extended_tool_name.split(TOOL_NAME_DELIMITER, 1)[-1]
+            resolved = (tool_name, self.tools.get(tool_name))
+            if len(self._resolved) >= MAX_RESOLVED_NAMES:
+                self._resolved.clear()
+            self._resolved[extended_tool_name] = resolved
+        return resolved
+
+    def tool_name(self, context):
+        """The tool name the Gateway invoked, from the Lambda context."""
+        return self.resolve(context.client_context.custom["bedrockAgentCoreToolName"])[0]
+
+    def call(self, tool_name, arguments):
+        """Validate `arguments` and run the tool registered as `tool_name`."""
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            raise KeyError(tool_name)
+        return tool(arguments)
+
+    def dispatch(self, event, context):
+        """Run the tool the Gateway invoked; the event is the tool's arguments."""
+        tool_name, tool = self.resolve(context.client_context.custom["bedrockAgentCoreToolName"])
+        if tool is None:
+            return f"Unrecognized tool_name: {tool_name}"
+        return tool(event)
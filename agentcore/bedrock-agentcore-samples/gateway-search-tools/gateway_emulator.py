@@ -0,0 +1,235 @@
+"""
+Local AgentCore Gateway emulator for Lambda tool targets.
+
+Serves Gateway-style Lambda handlers (the calc and restaurant lambda_function_code.py)
+as a stateless streamable HTTP MCP server, without deploying them through
+create_gateway_lambda or a real Gateway. It does what the Gateway does for a Lambda
+target:
+
+  - tools/list returns every target's tools from its *-api.json schema, named
+    TARGET___tool
+  - tools/call validates the arguments against the tool's inputSchema, builds a
+    Lambda context whose client_context.custom carries bedrockAgentCoreToolName
+    (and the other bedrockAgentCore* keys), and invokes the handler with the
+    arguments as the event
+  - handlers run in a thread pool, like concurrent Lambda invocations; a handler
+    exception comes back as an isError result, as a Lambda function error would
+
+Usage:
+  python gateway_emulator.py --target calc=calc --target restaurant=restaurant --port 8000
+
+then point an MCP client at http://localhost:8000/mcp. GatewayEmulator.invoke() calls
+a tool in-process, without HTTP, for load tests of the handlers themselves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import mcp.types as types
+import uvicorn
+from mcp.server.lowlevel import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+TOOL_NAME_DELIMITER = "___"
+
+
+class ClientContext:
+    """Shape of the Lambda runtime's client_context as the Gateway sends it."""
+
+    def __init__(self, custom: dict[str, str]):
+        self.custom = custom
+        self.env = None
+        self.client = None
+
+    def __repr__(self):
+        return f"ClientContext([custom={self.custom},env={self.env},client={self.client}])"
+
+
+class LambdaContext:
+    """The LambdaContext attributes the tool handlers (and lambda_telemetry) use."""
+
+    def __init__(self, function_name: str, client_context: ClientContext):
+        self.aws_request_id = str(uuid.uuid4())
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.memory_limit_in_mb = "128"
+        self.invoked_function_arn = f"arn:aws:lambda:local:000000000000:function:{function_name}"
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self.log_stream_name = "local"
+        self.client_context = client_context
+        self.identity = None
+
+    def __repr__(self):
+        fields = ",".join(f"{name}={value}" for name, value in vars(self).items())
+        return f"LambdaContext([{fields}])"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 300_000
+
+
+def load_handler_module(module_name: str, directory: Path):
+    """Import <directory>/lambda_function_code.py as module_name, isolated from other targets.
+
+    Handlers import their sibling modules by plain name (lambda_telemetry,
+    tool_registry, booking_store), and calc/ and restaurant/ ship modules with the
+    same names. While the handler is imported, its directory is first on sys.path
+    and any already-imported modules with those names are hidden; afterwards the
+    target's own copies are dropped from sys.modules (the handler keeps its
+    references) and sys.path and the hidden modules are restored, so the next
+    target imports its own copies.
+    """
+    local_names = {path.stem for path in directory.glob("*.py")}
+    saved_path = sys.path[:]
+    hidden = {name: sys.modules.pop(name) for name in local_names if name in sys.modules}
+    sys.path.insert(0, str(directory))
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, directory / "lambda_function_code.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path[:] = saved_path
+        for name in local_names:
+            sys.modules.pop(name, None)
+        sys.modules.update(hidden)
+    return module
+
+
+@dataclass
+class LambdaTarget:
+    """One Gateway target: a Lambda handler and the tool schemas it serves."""
+
+    name: str
+    handler: Callable[[dict, Any], Any]
+    tools: list[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_directory(cls, name: str, directory: str | Path) -> LambdaTarget:
+        """Load <directory>/lambda_function_code.py and the *-api.json schema beside it."""
+        directory = Path(directory).resolve()
+        module = load_handler_module(f"gateway_target_{name}", directory)
+
+        tools = []
+        for schema_path in sorted(directory.glob("*-api.json")):
+            tools.extend(json.loads(schema_path.read_text(encoding="utf-8")))
+        return cls(name, module.lambda_handler, tools)
+
+
+class GatewayEmulator:
+    """Routes TARGET___tool calls to Lambda handlers, as an AgentCore Gateway would."""
+
+    def __init__(self, targets: list[LambdaTarget], max_workers: int = 32):
+        self.targets = {target.name: target for target in targets}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lambda")
+        self.tools = [
+            types.Tool(
+                name=f"{target.name}{TOOL_NAME_DELIMITER}{tool['name']}",
+                description=tool.get("description"),
+                inputSchema=tool.get("inputSchema", {"type": "object"}),
+            )
+            for target in targets
+            for tool in target.tools
+        ]
+        self.server = self._build_server()
+
+    def _build_server(self) -> Server:
+        server = Server("gateway-emulator")
+
+        @server.list_tools()
+        async def list_tools() -> list[types.Tool]:
+            return self.tools
+
+        @server.call_tool()
+        async def call_tool(name: str, arguments: dict) -> types.CallToolResult:
+            result = await self.invoke(name, arguments)
+            text = result if isinstance(result, str) else json.dumps(result)
+            return types.CallToolResult(content=[types.TextContent(type="text", text=text)], isError=False)
+
+        return server
+
+    def resolve(self, name: str) -> LambdaTarget:
+        target_name, delimiter, _ = name.partition(TOOL_NAME_DELIMITER)
+        target = self.targets.get(target_name)
+        if not delimiter or target is None:
+            raise ValueError(f"Unknown tool {name!r}; Gateway tool names look like TARGET{TOOL_NAME_DELIMITER}tool")
+        return target
+
+    def context_for(self, target: LambdaTarget, name: str) -> LambdaContext:
+        custom = {
+            "bedrockAgentCoreToolName": name,
+            "bedrockAgentCoreGatewayId": "local-gateway-emulator",
+            "bedrockAgentCoreTargetId": target.name,
+            "bedrockAgentCoreMessageVersion": "1.0",
+            "bedrockAgentCoreAwsRequestId": str(uuid.uuid4()),
+            "bedrockAgentCoreMcpMessageId": str(uuid.uuid4()),
+        }
+        return LambdaContext(target.name, ClientContext(custom))
+
+    async def invoke(self, name: str, arguments: dict) -> Any:
+        """Run the target's handler for a TARGET___tool call in the thread pool."""
+        target = self.resolve(name)
+        context = self.context_for(target, name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, target.handler, dict(arguments), context)
+
+    def streamable_http_app(self) -> Starlette:
+        """Stateless streamable HTTP app serving the emulated Gateway at /mcp."""
+        session_manager = StreamableHTTPSessionManager(app=self.server, stateless=True, json_response=True)
+
+        async def handle(scope, receive, send):
+            await session_manager.handle_request(scope, receive, send)
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Starlette):
+            async with session_manager.run():
+                try:
+                    yield
+                finally:
+                    self.executor.shutdown(wait=False)
+
+        return Starlette(routes=[Mount("/mcp", app=handle)], lifespan=lifespan)
+
+
+def parse_target(value: str) -> LambdaTarget:
+    name, _, directory = value.partition("=")
+    return LambdaTarget.from_directory(name, directory or name)
+
+
+def main():
+    # The restaurant target books into SQLite when run locally (see booking_store.py)
+    os.environ.setdefault("BOOKINGS_DB", os.path.join(tempfile.gettempdir(), "gateway_emulator_bookings.sqlite3"))
+    parser = argparse.ArgumentParser(description="Serve Gateway Lambda handlers as a local MCP server")
+    parser.add_argument(
+        "--target",
+        action="append",
+        type=parse_target,
+        help="NAME=DIRECTORY holding lambda_function_code.py and *-api.json (repeatable)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--max-workers", type=int, default=32, help="Handler thread pool size")
+    args = parser.parse_args()
+
+    targets = args.target or [parse_target("calc"), parse_target("restaurant")]
+    emulator = GatewayEmulator(targets, max_workers=args.max_workers)
+    print(f"Serving {len(emulator.tools)} tools from {', '.join(emulator.targets)} at http://{args.host}:{args.port}/mcp")
+    uvicorn.run(emulator.streamable_http_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Booking engine for the restaurant Gateway target.
+
+create_booking() validates a booking request, checks the time slot's remaining
+capacity and records the booking in a pluggable store:
+
+  - DynamoDBBookingStore: one table (pk/sk strings). Each time slot has a counter
+    item keyed by restaurant, date and hour, so the capacity check is a single key
+    lookup, and the slot's bookings live under the same partition key. A booking
+    is one TransactWriteItems call: claim the idempotency key, bump the slot
+    counter only if the seats fit, and put the booking.
+  - SQLiteBookingStore: a local stand-in with the same behaviour, using an index
+    on (restaurant, date, hour) and BEGIN IMMEDIATE to serialise writers.
+
+Every booking has an idempotency key: the caller's, or else a hash of the normalised
+booking details. An agent that retries a booking after a timeout therefore gets the
+original booking back instead of a second one. Reusing a key for different booking
+details raises BookingError rather than confirming the earlier booking.
+
+The deployed Lambda uses DynamoDB (BOOKINGS_TABLE, set by
+utils.create_restaurant_gateway_lambda). SQLite is only for local runs and must be
+asked for with BOOKINGS_DB: a file in one container's /tmp would give every
+container its own capacity count.
+"""
+
+import abc
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+DEFAULT_SLOT_CAPACITY = 40
+
+
+class BookingError(Exception):
+    """The booking request is invalid."""
+
+
+class SlotFullError(BookingError):
+    """The time slot does not have enough seats left."""
+
+    def __init__(self, seats_left):
+        super().__init__(f"only {seats_left} seats left")
+        self.seats_left = seats_left
+
+
+@dataclass(frozen=True)
+class Booking:
+    booking_id: str
+    idempotency_key: str
+    restaurant_name: str
+    date: str
+    hour: str
+    guest_name: str
+    num_guests: int
+    created_at: float
+
+    def same_request(self, other):
+        """Whether two bookings are for the same slot, guest and party size."""
+        return (
+            self.restaurant_name.casefold() == other.restaurant_name.casefold()
+            and (self.date, self.hour, self.num_guests) == (other.date, other.hour, other.num_guests)
+            and self.guest_name.casefold() == other.guest_name.casefold()
+        )
+
+
+def normalise_request(restaurant_name, date, hour, guest_name, num_guests):
+    """Validate a booking request and return it in canonical form."""
+    try:
+        date = datetime.strptime(str(date), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise BookingError(f"date must be YYYY-MM-DD, got {date!r}") from None
+    try:
+        hour = datetime.strptime(str(hour), "%H:%M").strftime("%H:%M")
+    except ValueError:
+        raise BookingError(f"hour must be HH:MM, got {hour!r}") from None
+    restaurant_name = " ".join(str(restaurant_name).split())
+    guest_name = " ".join(str(guest_name).split())
+    if not restaurant_name or not guest_name:
+        raise BookingError("restaurant_name and guest_name are required")
+    try:
+        num_guests = int(num_guests)
+    except (TypeError, ValueError):
+        raise BookingError(f"num_guests must be an integer, got {num_guests!r}") from None
+    if num_guests < 1:
+        raise BookingError("num_guests must be at least 1")
+    return restaurant_name, date, hour, guest_name, num_guests
+
+
+def default_idempotency_key(restaurant_name, date, hour, guest_name, num_guests):
+    """Same booking details -> same key, so a retried request is recognised."""
+    details = "\x1f".join([restaurant_name.casefold(), date, hour, guest_name.casefold(), str(num_guests)])
+    return hashlib.sha256(details.encode()).hexdigest()
+
+
+def replayed(existing, booking):
+    """(existing, False) for a retry of `booking`; BookingError if the key was reused."""
+    if not existing.same_request(booking):
+        raise BookingError(
+            f"idempotency key {booking.idempotency_key!r} was already used for booking "
+            f"{existing.booking_id} ({existing.num_guests} guests at {existing.restaurant_name} "
+            f"on {existing.date} at {existing.hour} for {existing.guest_name})"
+        )
+    return existing, False
+
+
+class BookingStore(abc.ABC):
+    """Interface the booking engine needs from a store."""
+
+    @abc.abstractmethod
+    def book(self, booking, capacity):
+        """Atomically record `booking` if its slot has room.
+
+        Returns (booking, created). If a booking with the same idempotency key
+        exists for the same details, returns (existing booking, False) without
+        booking again; for different details, raises BookingError. Raises
+        SlotFullError if the seats do not fit.
+        """
+
+    @abc.abstractmethod
+    def seats_booked(self, restaurant_name, date, hour):
+        """Seats already booked in the slot."""
+
+
+class SQLiteBookingStore(BookingStore):
+    """Local stand-in for DynamoDBBookingStore, safe across threads and processes."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connection() as db:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS bookings (
+                    booking_id TEXT PRIMARY KEY,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    restaurant_name TEXT NOT NULL COLLATE NOCASE,
+                    date TEXT NOT NULL,
+                    hour TEXT NOT NULL,
+                    guest_name TEXT NOT NULL,
+                    num_guests INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS bookings_by_slot ON bookings (restaurant_name, date, hour);
+                """
+            )
+
+    def _connection(self):
+        # One connection per thread; isolation_level=None so BEGIN IMMEDIATE is explicit
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def _find(self, db, idempotency_key):
+        row = db.execute(
+            "SELECT booking_id, idempotency_key, restaurant_name, date, hour, guest_name, num_guests, created_at "
+            "FROM bookings WHERE idempotency_key = ?",
+            (idempotency_key,),
+        ).fetchone()
+        return Booking(*row) if row else None
+
+    def book(self, booking, capacity):
+        db = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so the capacity check and
+        # the insert cannot interleave with another writer's
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            existing = self._find(db, booking.idempotency_key)
+            if existing is None:
+                booked = self._seats_booked(db, booking.restaurant_name, booking.date, booking.hour)
+                if booked + booking.num_guests > capacity:
+                    raise SlotFullError(max(0, capacity - booked))
+                db.execute("INSERT INTO bookings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", tuple(asdict(booking).values()))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if existing is not None:
+            return replayed(existing, booking)
+        return booking, True
+
+    @staticmethod
+    def _seats_booked(db, restaurant_name, date, hour):
+        (booked,) = db.execute(
+            "SELECT COALESCE(SUM(num_guests), 0) FROM bookings WHERE restaurant_name = ? AND date = ? AND hour = ?",
+            (restaurant_name, date, hour),
+        ).fetchone()
+        return booked
+
+    def seats_booked(self, restaurant_name, date, hour):
+        return self._seats_booked(self._connection(), restaurant_name, date, hour)
+
+
+class DynamoDBBookingStore(BookingStore):
+    """Single-table DynamoDB store: slot counters, bookings and idempotency keys."""
+
+    def __init__(self, table_name, client=None):
+        if client is None:
+            import boto3
+
+            client = boto3.client("dynamodb")
+        self.table_name = table_name
+        self.client = client
+
+    @staticmethod
+    def slot_key(restaurant_name, date, hour):
+        return f"SLOT#{restaurant_name.casefold()}#{date}#{hour}"
+
+    def _get_booking(self, idempotency_key):
+        item = self.client.get_item(
+            TableName=self.table_name,
+            Key={"pk": {"S": f"IDEMPOTENCY#{idempotency_key}"}, "sk": {"S": "IDEMPOTENCY"}},
+            ConsistentRead=True,
+        ).get("Item")
+        if item is None:
+            return None
+        return Booking(
+            booking_id=item["booking_id"]["S"],
+            idempotency_key=idempotency_key,
+            restaurant_name=item["restaurant_name"]["S"],
+            date=item["date"]["S"],
+            hour=item["hour"]["S"],
+            guest_name=item["guest_name"]["S"],
+            num_guests=int(item["num_guests"]["N"]),
+            created_at=float(item["created_at"]["N"]),
+        )
+
+    def book(self, booking, capacity):
+        slot = self.slot_key(booking.restaurant_name, booking.date, booking.hour)
+        attributes = {
+            "booking_id": {"S": booking.booking_id},
+            "restaurant_name": {"S": booking.restaurant_name},
+            "date": {"S": booking.date},
+            "hour": {"S": booking.hour},
+            "guest_name": {"S": booking.guest_name},
+            "num_guests": {"N": str(booking.num_guests)},
+            "created_at": {"N": repr(booking.created_at)},
+        }
+        try:
+            self.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": self.table_name,
+                            "Item": {
+                                "pk": {"S": f"IDEMPOTENCY#{booking.idempotency_key}"},
+                                "sk": {"S": "IDEMPOTENCY"},
+                                **attributes,
+                            },
+                            "ConditionExpression": "attribute_not_exists(pk)",
+                        }
+                    },
+                    {
+                        "Update": {
+                            "TableName": self.table_name,
+                            "Key": {"pk": {"S": slot}, "sk": {"S": "SLOT"}},
+                            "UpdateExpression": "ADD seats_booked :n",
+                            "ConditionExpression": "attribute_not_exists(seats_booked) OR seats_booked <= :limit",
+                            "ExpressionAttributeValues": {
+                                ":n": {"N": str(booking.num_guests)},
+                                ":limit": {"N": str(capacity - booking.num_guests)},
+                            },
+                        }
+                    },
+                    {
+                        "Put": {
+                            "TableName": self.table_name,
+                            "Item": {
+                                "pk": {"S": slot},
+                                "sk": {"S": f"BOOKING#{booking.booking_id}"},
+                                "idempotency_key": {"S": booking.idempotency_key},
+                                **attributes,
+                            },
+                        }
+                    },
+                ]
+            )
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = [reason.get("Code") for reason in e.response.get("CancellationReasons", [])]
+            if reasons and reasons[0] == "ConditionalCheckFailed":
+                existing = self._get_booking(booking.idempotency_key)
+                if existing is not None:
+                    return replayed(existing, booking)
+            if len(reasons) > 1 and reasons[1] == "ConditionalCheckFailed":
+                booked = self.seats_booked(booking.restaurant_name, booking.date, booking.hour)
+                raise SlotFullError(max(0, capacity - booked)) from None
+            raise
+        return booking, True
+
+    def seats_booked(self, restaurant_name, date, hour):
+        item = self.client.get_item(
+            TableName=self.table_name,
+            Key={"pk": {"S": self.slot_key(restaurant_name, date, hour)}, "sk": {"S": "SLOT"}},
+            ConsistentRead=True,
+        ).get("Item")
+        return int(item["seats_booked"]["N"]) if item else 0
+
+
+def store_from_environment():
+    """DynamoDB table BOOKINGS_TABLE, or for local runs only, SQLite file BOOKINGS_DB."""
+    table_name = os.environ.get("BOOKINGS_TABLE")
+    if table_name:
+        return DynamoDBBookingStore(table_name)
+    db_path = os.environ.get("BOOKINGS_DB")
+    if db_path:
+        return SQLiteBookingStore(db_path)
+    raise RuntimeError(
+        "Set BOOKINGS_TABLE to the bookings DynamoDB table "
+        "(utils.create_restaurant_gateway_lambda does this), or BOOKINGS_DB to a SQLite file for local runs"
+    )
+
+
+def create_booking(
+    store,
+    restaurant_name,
+    date,
+    hour,
+    guest_name,
+    num_guests,
+    idempotency_key=None,
+    capacity=DEFAULT_SLOT_CAPACITY,
+):
+    """Validate, capacity-check and store a booking; returns (booking, created)."""
+    restaurant_name, date, hour, guest_name, num_guests = normalise_request(
+        restaurant_name, date, hour, guest_name, num_guests
+    )
+    if num_guests > capacity:
+        raise BookingError(f"a time slot seats at most {capacity} guests")
+    booking = Booking(
+        booking_id=uuid.uuid4().hex[:12],
+        idempotency_key=idempotency_key or default_idempotency_key(restaurant_name, date, hour, guest_name, num_guests),
+        restaurant_name=restaurant_name,
+        date=date,
+        hour=hour,
+        guest_name=guest_name,
+        num_guests=num_guests,
+        created_at=time.time(),
+    )
+    return store.book(booking, capacity)
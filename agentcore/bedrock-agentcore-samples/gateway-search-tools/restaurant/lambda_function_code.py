@@ -1,30 +1,54 @@
+import os
+
+from booking_store import DEFAULT_SLOT_CAPACITY, BookingError, SlotFullError, create_booking, store_from_environment
+from lambda_telemetry import Telemetry
+from tool_registry import ToolRegistry
+
+# Validators compiled from restaurant-api.json; see tool_registry.py
+registry = ToolRegistry.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "restaurant-api.json"))
+# Built once per container; see lambda_telemetry.py for LOG_LEVEL / LOG_SAMPLE_RATE
+telemetry = Telemetry(namespace="GatewaySearchTools/restaurant", tool_name=registry.tool_name)
+
+# DynamoDB table BOOKINGS_TABLE; SQLite BOOKINGS_DB only for local runs (see booking_store.py)
+store = store_from_environment()
+SLOT_CAPACITY = int(os.environ.get("RESTAURANT_SLOT_CAPACITY", DEFAULT_SLOT_CAPACITY))
+
+
 def get_named_parameter(event, name):
     return event[name]
 
 
+@registry.tool("create_booking")
 def handle_create_booking(event):
     bookingDate = get_named_parameter(event, "date")
     bookingHour = get_named_parameter(event, "hour")
     restaurantName = get_named_parameter(event, "restaurant_name")
     guestName = get_named_parameter(event, "guest_name")
-    numGuests = int(get_named_parameter(event, "num_guests"))
-    return f"Booking id 12345, for {numGuests} guests at {restaurantName} on {bookingDate} at {bookingHour} for {guestName} created."
-
-
+    numGuests = get_named_parameter(event, "num_guests")
+
+    # A retried request (same idempotency_key, or same details) returns the original booking
+    try:
+        booking, _ = create_booking(
+            store,
+            restaurantName,
+            bookingDate,
+            bookingHour,
+            guestName,
+            numGuests,
+            idempotency_key=event.get("idempotency_key"),
+            capacity=SLOT_CAPACITY,
+        )
+    except SlotFullError as e:
+        return f"Unable to book {numGuests} guests at {restaurantName} on {bookingDate} at {bookingHour}: {e}."
+    except BookingError as e:
+        return f"Unable to create booking: {e}."
+
+    return (
+        f"Booking id {booking.booking_id}, for {booking.num_guests} guests at {booking.restaurant_name} "
+        f"on {booking.date} at {booking.hour} for {booking.guest_name} created."
+    )
+
+
+@telemetry.instrument
 def lambda_handler(event, context):
-    print(f"event: {event}")
-    print(f"context: {context}")
-    print(f"context.client_context: {context.client_context}")
-
-    extended_tool_name = context.client_context.custom["bedrockAgentCoreToolName"]
-    tool_name = extended_tool_name.split("___")[1]
-
-    print(f"tool_name: {tool_name}")
-
-    if tool_name == "create_booking":
-        result = handle_create_booking(event)
-    else:
-        result = f"Unrecognized tool_name: {tool_name}"
-
-    print(f"result: {result}")
-    return result
\ No newline at end of file
+    return registry.dispatch(event, context)
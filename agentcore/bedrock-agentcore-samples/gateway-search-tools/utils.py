@@ -5,6 +5,8 @@ from typing import Dict, List, Optional, Union
 import boto3
 from botocore.exceptions import ClientError
 
+from bearer_token_provider import BearerTokenProvider
+
 LAMBDA_EXECUTION_ROLE_POLICY = (
     "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
 )
@@ -38,6 +40,10 @@ GATEWAY_AGENTCORE_TRUST_POLICY = {
 
 GATEWAY_AGENTCORE_POLICY_NAME = "BedrockAgentPolicy"
 
+# Restaurant bookings table (see restaurant/booking_store.py)
+BOOKINGS_TABLE_NAME = "RestaurantBookings"
+BOOKINGS_TABLE_POLICY_NAME = "BookingsTableAccess"
+
 # Cognito configuration constants
 COGNITO_POOL_NAME = "MCPServerPool"
 COGNITO_CLIENT_NAME = "MCPServerPoolClient"
@@ -58,8 +64,27 @@ def _format_error_message(error: ClientError) -> str:
     return f"{error.response['Error']['Code']}-{error.response['Error']['Message']}"
 
 
-def _create_or_get_iam_role(iam_client, role_name: str) -> str:
-    """Create IAM role or return existing role ARN."""
+def _create_or_get_iam_role(
+    iam_client, role_name: str, inline_policies: Optional[Dict[str, dict]] = None
+) -> str:
+    """Create IAM role or return existing role ARN.
+
+    inline_policies ({policy name: policy document}) are put on the role whether it
+    was created or already existed.
+    """
+    role_arn = _create_or_get_iam_role_arn(iam_client, role_name)
+    for policy_name, policy_document in (inline_policies or {}).items():
+        print(f"Putting policy {policy_name} on the IAM role")
+        iam_client.put_role_policy(
+            RoleName=role_name,
+            PolicyName=policy_name,
+            PolicyDocument=json.dumps(policy_document),
+        )
+    return role_arn
+
+
+def _create_or_get_iam_role_arn(iam_client, role_name: str) -> str:
+    """Create the Lambda role with the basic execution policy, or return the existing ARN."""
     try:
         print("Creating IAM role for lambda function")
         response = iam_client.create_role(
@@ -89,9 +114,16 @@ def _create_or_get_iam_role(iam_client, role_name: str) -> str:
 
 
 def _create_or_get_lambda_function(
-    lambda_client, function_name: str, role_arn: str, code: bytes
+    lambda_client,
+    function_name: str,
+    role_arn: str,
+    code: bytes,
+    environment: Optional[Dict[str, str]] = None,
 ) -> str:
-    """Create Lambda function or return existing function ARN."""
+    """Create Lambda function or return existing function ARN.
+
+    An existing function gets `environment` applied, so it matches a new one.
+    """
     try:
         print("Creating lambda function")
         response = lambda_client.create_function(
@@ -102,6 +134,7 @@ def _create_or_get_lambda_function(
             Code={"ZipFile": code},
             Description="Lambda function example for Bedrock AgentCore Gateway",
             PackageType=LAMBDA_PACKAGE_TYPE,
+            Environment={"Variables": environment or {}},
         )
         return response["FunctionArn"]
 
@@ -112,19 +145,30 @@ def _create_or_get_lambda_function(
             print(
                 f"AWS Lambda function {function_name} already exists. Using the same ARN {lambda_arn}"
             )
+            if environment:
+                print("Updating the environment of the existing lambda function")
+                lambda_client.update_function_configuration(
+                    FunctionName=function_name,
+                    Environment={"Variables": environment},
+                )
             return lambda_arn
         else:
             raise error
 
 
 def create_gateway_lambda(
-    lambda_function_code_path: str, lambda_function_name: str
+    lambda_function_code_path: str,
+    lambda_function_name: str,
+    environment: Optional[Dict[str, str]] = None,
+    inline_policies: Optional[Dict[str, dict]] = None,
 ) -> Dict[str, Union[str, int]]:
     """Create AWS Lambda function with IAM role for AgentCore Gateway.
 
     Args:
         lambda_function_code_path: Path to the Lambda function code zip file
         lambda_function_name: Name for the Lambda function
+        environment: Environment variables for the Lambda function
+        inline_policies: Extra {policy name: policy document} for the Lambda role
 
     Returns:
         Dictionary with 'lambda_function_arn' and 'exit_code' keys
@@ -142,15 +186,23 @@ def create_gateway_lambda(
         lambda_function_code = f.read()
 
     try:
-        role_arn = _create_or_get_iam_role(iam_client, role_name)
+        role_arn = _create_or_get_iam_role(iam_client, role_name, inline_policies)
         time.sleep(20)
         try:
             lambda_arn = _create_or_get_lambda_function(
-                lambda_client, lambda_function_name, role_arn, lambda_function_code
+                lambda_client,
+                lambda_function_name,
+                role_arn,
+                lambda_function_code,
+                environment,
             )
         except ClientError:
             lambda_arn = _create_or_get_lambda_function(
-                lambda_client, lambda_function_name, role_arn, lambda_function_code
+                lambda_client,
+                lambda_function_name,
+                role_arn,
+                lambda_function_code,
+                environment,
             )
 
         return {"lambda_function_arn": lambda_arn, "exit_code": 0}
@@ -164,6 +216,129 @@ def create_gateway_lambda(
         return {"lambda_function_arn": str(error), "exit_code": 1}
 
 
+def create_bookings_table(
+    table_name: str = BOOKINGS_TABLE_NAME, region: Optional[str] = None
+) -> str:
+    """Create the restaurant bookings table (string keys pk and sk) and return its ARN.
+
+    Args:
+        table_name: Name for the DynamoDB table
+        region: AWS region (if None, uses session default)
+
+    Returns:
+        Table ARN; an existing table of the same name is reused
+    """
+    if not region:
+        region = boto3.Session().region_name
+    dynamodb_client = boto3.client("dynamodb", region_name=region)
+
+    try:
+        print(f"Creating DynamoDB table: {table_name}")
+        dynamodb_client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {"AttributeName": "pk", "KeyType": "HASH"},
+                {"AttributeName": "sk", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "pk", "AttributeType": "S"},
+                {"AttributeName": "sk", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+    except ClientError as error:
+        if error.response["Error"]["Code"] != "ResourceInUseException":
+            raise error
+        print(f"DynamoDB table {table_name} already exists")
+
+    dynamodb_client.get_waiter("table_exists").wait(TableName=table_name)
+    table_arn = dynamodb_client.describe_table(TableName=table_name)["Table"]["TableArn"]
+    print(f"DynamoDB table is active: {table_arn}")
+    return table_arn
+
+
+def bookings_table_policy(table_arn: str) -> dict:
+    """Policy letting the restaurant Lambda book through DynamoDBBookingStore.
+
+    IAM authorises TransactWriteItems by the actions inside the transaction
+    (PutItem, UpdateItem and the condition checks), so those are what is granted.
+    """
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "BookingsTable",
+                "Effect": "Allow",
+                "Action": [
+                    "dynamodb:GetItem",
+                    "dynamodb:PutItem",
+                    "dynamodb:UpdateItem",
+                    "dynamodb:ConditionCheckItem",
+                ],
+                "Resource": table_arn,
+            }
+        ],
+    }
+
+
+def create_restaurant_gateway_lambda(
+    lambda_function_code_path: str,
+    lambda_function_name: str,
+    table_name: str = BOOKINGS_TABLE_NAME,
+) -> Dict[str, Union[str, int]]:
+    """Create the bookings table and the restaurant Lambda that books into it.
+
+    The Lambda gets BOOKINGS_TABLE in its environment and a role policy for the
+    table, so every container shares one capacity count and idempotency record.
+
+    Args:
+        lambda_function_code_path: Path to the Lambda function code zip file
+        lambda_function_name: Name for the Lambda function
+        table_name: Name for the DynamoDB bookings table
+
+    Returns:
+        Dictionary with 'lambda_function_arn' and 'exit_code' keys
+    """
+    try:
+        table_arn = create_bookings_table(table_name)
+    except ClientError as error:
+        error_message = _format_error_message(error)
+        print(f"Error: {error_message}")
+        return {"lambda_function_arn": error_message, "exit_code": 1}
+
+    return create_gateway_lambda(
+        lambda_function_code_path,
+        lambda_function_name,
+        environment={"BOOKINGS_TABLE": table_name},
+        inline_policies={BOOKINGS_TABLE_POLICY_NAME: bookings_table_policy(table_arn)},
+    )
+
+
+def delete_bookings_table(table_name: str = BOOKINGS_TABLE_NAME) -> bool:
+    """Delete the restaurant bookings table.
+
+    Args:
+        table_name: Name of the DynamoDB table to delete
+
+    Returns:
+        True if deletion successful, False otherwise
+    """
+    session = boto3.Session()
+    dynamodb_client = boto3.client("dynamodb", region_name=session.region_name)
+
+    try:
+        print(f"Deleting DynamoDB table: {table_name}")
+        dynamodb_client.delete_table(TableName=table_name)
+        print(f"DynamoDB table {table_name} deleted successfully")
+        return True
+    except ClientError as error:
+        if error.response["Error"]["Code"] == "ResourceNotFoundException":
+            print(f"DynamoDB table {table_name} not found")
+        else:
+            print(f"Error deleting DynamoDB table: {_format_error_message(error)}")
+        return False
+
+
 def _create_cognito_user_pool(cognito_client, pool_name: str) -> str:
     """Create Cognito User Pool and return pool ID."""
     print(f"Creating Cognito User Pool: {pool_name}")
@@ -227,6 +402,9 @@ def _authenticate_user(
     return auth_response["AuthenticationResult"]["AccessToken"]
 
 
+_BEARER_TOKEN_PROVIDERS = {}
+
+
 def get_bearer_token(
     client_id: str, username: str, password: str, region: Optional[str] = None
 ) -> Optional[str]:
@@ -245,17 +423,18 @@ def get_bearer_token(
         session = boto3.Session()
         region = session.region_name
 
-    cognito_client = boto3.client("cognito-idp", region_name=region)
+    # The token is reused (in this process and, through the token store, by other
+    # local processes) until it is close to expiry, instead of signing in every call
+    key = (client_id, username, password, region)
+    provider = _BEARER_TOKEN_PROVIDERS.get(key)
+    if provider is None:
+        provider = _BEARER_TOKEN_PROVIDERS[key] = BearerTokenProvider.from_password(
+            client_id, username, password, region
+        )
 
     try:
         print(f"Authenticating user: {username}")
-        auth_response = cognito_client.initiate_auth(
-            ClientId=client_id,
-            AuthFlow="USER_PASSWORD_AUTH",
-            AuthParameters={"USERNAME": username, "PASSWORD": password},
-        )
-
-        bearer_token = auth_response["AuthenticationResult"]["AccessToken"]
+        bearer_token = provider.token()
         print(f"Bearer token obtained successfully")
         return bearer_token
 
@@ -423,6 +602,13 @@ def delete_gateway_lambda(lambda_function_arn: str) -> bool:
                 RoleName=role_name,
                 PolicyArn=LAMBDA_EXECUTION_ROLE_POLICY,
             )
+            # Inline policies (such as the bookings table's) must go before the role
+            for policy_name in iam_client.list_role_policies(RoleName=role_name)[
+                "PolicyNames"
+            ]:
+                iam_client.delete_role_policy(
+                    RoleName=role_name, PolicyName=policy_name
+                )
 
             print(f"Deleting IAM role: {role_name}")
             iam_client.delete_role(RoleName=role_name)
@@ -0,0 +1,201 @@
+"""
+Exercise BearerTokenProvider against a local stub of the Cognito InitiateAuth API.
+
+The stub speaks the cognito-idp JSON protocol (boto3 reaches it via endpoint_url),
+mints unsigned JWTs that expire after --ttl seconds plus the refresh margin, and
+counts sign-ins. The script checks that:
+
+  - many worker processes sharing one token store sign in once per expiry window
+  - a wrong password does not pick up the stored token
+  - provider.auth() plugs into streamablehttp_client: a local MCP server that only
+    accepts the newest token rejects a revoked one with 401, and the call still
+    succeeds after the auth flow refreshes the token
+
+Usage:
+  python bearer_token_local.py --workers 8 --ttl 2
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import boto3
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.server.fastmcp import FastMCP
+
+from bearer_token_provider import BearerTokenProvider, TokenStore
+
+CLIENT_ID = "stub-client"
+USERNAME = "testuser"
+PASSWORD = "MyPassword123!"
+REFRESH_MARGIN = 300
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def start_stub_cognito(ttl):
+    """cognito-idp InitiateAuth on a local port; .sign_ins counts issued tokens."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            flow, parameters = request["AuthFlow"], request["AuthParameters"]
+            if flow == "USER_PASSWORD_AUTH" and parameters.get("PASSWORD") != PASSWORD:
+                return self.reply(400, {"__type": "NotAuthorizedException", "message": "Incorrect username or password."})
+            if flow == "REFRESH_TOKEN_AUTH" and parameters.get("REFRESH_TOKEN") != "refresh-token":
+                return self.reply(400, {"__type": "NotAuthorizedException", "message": "Invalid Refresh Token"})
+            with server.lock:
+                server.sign_ins += 1
+                claims = {"sub": USERNAME, "jti": server.sign_ins, "exp": int(time.time() + REFRESH_MARGIN + ttl)}
+                token = f"{b64url({'alg': 'none'})}.{b64url(claims)}.sig"
+                server.latest = token
+            result = {"AccessToken": token, "ExpiresIn": REFRESH_MARGIN + ttl, "TokenType": "Bearer"}
+            if flow == "USER_PASSWORD_AUTH":
+                result["RefreshToken"] = "refresh-token"
+            self.reply(200, {"AuthenticationResult": result})
+
+        def reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.1")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.sign_ins = 0
+    server.latest = None
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def show(label, detail):
+    print(f"{label:<29}{detail}")
+
+
+def cognito_client(endpoint_url):
+    return boto3.client(
+        "cognito-idp",
+        region_name="us-east-1",
+        endpoint_url=endpoint_url,
+        aws_access_key_id="stub",
+        aws_secret_access_key="stub",
+    )
+
+
+def worker_token(endpoint_url, store_path, password=PASSWORD):
+    provider = BearerTokenProvider.from_password(
+        CLIENT_ID, USERNAME, password, store=TokenStore(store_path), cognito_client=cognito_client(endpoint_url)
+    )
+    return provider.token()
+
+
+def start_protected_mcp(stub):
+    """A stateless MCP server that only accepts the stub's newest token."""
+    mcp = FastMCP("protected", stateless_http=True, json_response=True, log_level="WARNING")
+    # The stateless JSON-response transport logs a spurious ClosedResourceError
+    # after every request in this mcp version
+    logging.getLogger("mcp.server.streamable_http").setLevel(logging.CRITICAL)
+
+    @mcp.tool()
+    def whoami() -> str:
+        return USERNAME
+
+    app = mcp.streamable_http_app()
+
+    async def require_latest_token(scope, receive, send):
+        headers = dict(scope.get("headers", []))
+        if scope["type"] == "http" and headers.get(b"authorization") != f"Bearer {stub.latest}".encode():
+            await send({"type": "http.response.start", "status": 401, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await app(scope, receive, send)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(require_latest_token, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/mcp"
+
+
+async def call_whoami(url, provider):
+    async with streamablehttp_client(url, auth=provider.auth()) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool("whoami", {})
+            return result.content[0].text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check BearerTokenProvider against a stub Cognito endpoint")
+    parser.add_argument("--workers", type=int, default=8, help="Worker processes sharing the token store")
+    parser.add_argument("--ttl", type=float, default=2, help="Seconds until a stub token is due for refresh")
+    args = parser.parse_args()
+
+    stub = start_stub_cognito(args.ttl)
+    endpoint_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(args.workers) as pool:
+        store_path = Path(tmp) / "tokens.json"
+
+        tokens = set(pool.map(worker_token, [endpoint_url] * args.workers, [store_path] * args.workers))
+        show(f"{args.workers} workers, cold:", f"{stub.sign_ins} sign-in(s), {len(tokens)} distinct token(s)")
+        assert stub.sign_ins == 1 and len(tokens) == 1
+
+        tokens = set(pool.map(worker_token, [endpoint_url] * args.workers, [store_path] * args.workers))
+        show(f"{args.workers} workers, warm:", f"{stub.sign_ins} sign-in(s), {len(tokens)} distinct token(s)")
+        assert stub.sign_ins == 1 and len(tokens) == 1
+
+        time.sleep(args.ttl + 0.5)
+        tokens = set(pool.map(worker_token, [endpoint_url] * args.workers, [store_path] * args.workers))
+        show(f"{args.workers} workers, after expiry:", f"{stub.sign_ins} sign-in(s), {len(tokens)} distinct token(s)")
+        assert stub.sign_ins == 2 and len(tokens) == 1
+
+        try:
+            worker_token(endpoint_url, store_path, password="wrong")
+        except Exception as e:
+            show("wrong password:", f"{type(e).__name__}")
+        else:
+            raise AssertionError("a wrong password got a token")
+
+        show("store mode:", f"{oct(store_path.stat().st_mode & 0o777)}")
+
+        server, url = start_protected_mcp(stub)
+        provider = BearerTokenProvider.from_password(
+            CLIENT_ID, USERNAME, PASSWORD, store=TokenStore(store_path), cognito_client=cognito_client(endpoint_url)
+        )
+        show("MCP call:", f"{asyncio.run(call_whoami(url, provider))} ({stub.sign_ins} sign-ins)")
+        # Revoke: a sign-in elsewhere makes the provider's token stale on the server
+        cognito_client(endpoint_url).initiate_auth(
+            ClientId=CLIENT_ID,
+            AuthFlow="USER_PASSWORD_AUTH",
+            AuthParameters={"USERNAME": USERNAME, "PASSWORD": PASSWORD},
+        )
+        before = stub.sign_ins
+        show("MCP call after revocation:", f"{asyncio.run(call_whoami(url, provider))} ({stub.sign_ins} sign-ins)")
+        assert stub.sign_ins == before + 1
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
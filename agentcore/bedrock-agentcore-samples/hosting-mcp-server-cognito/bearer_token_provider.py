@@ -0,0 +1,267 @@
+"""
+Cognito bearer tokens shared across processes, with local JWT expiry checks.
+
+The clients used to decode the access token by hand on every start, refresh it
+inline with REFRESH_TOKEN_AUTH (falling back to a refresh on any decoding error),
+or run a full USER_PASSWORD_AUTH every time a token was needed. BearerTokenProvider
+does this once per token lifetime, however many workers ask:
+
+  - expiry is read from the JWT's exp claim locally; no Cognito call is needed to
+    know whether the token is still good (the signature is left to the server)
+  - tokens are kept in memory and in a small JSON file (mode 0600) guarded by an
+    advisory file lock, so concurrent processes on one machine share a token: the
+    first worker to find it within refresh_margin seconds (default 300) of expiry
+    refreshes it, and the others pick the new token up from the file
+  - a refresh uses the refresh token when there is one (REFRESH_TOKEN_AUTH) and
+    otherwise the configured credentials (USER_PASSWORD_AUTH)
+  - provider.auth() is an httpx.Auth for streamablehttp_client(auth=...): it sets
+    the Authorization header on every request and, on a 401, refreshes the token
+    once and retries
+
+The file lock uses fcntl, so it is POSIX-only; elsewhere the store still works
+within a process but workers do not coordinate.
+
+Usage:
+    provider = BearerTokenProvider.from_refresh_token(client_id, refresh_token, region)
+    async with streamablehttp_client(mcp_url, auth=provider.auth()) as (read, write, _):
+        ...
+"""
+
+import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import boto3
+import httpx
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_STORE_PATH = Path(os.environ.get("BEARER_TOKEN_STORE", Path.home() / ".cache" / "agentcore" / "bearer_tokens.json"))
+
+
+def jwt_expiry(token):
+    """Return the exp claim of a JWT (seconds since the epoch), or None if it has none.
+
+    Only decodes the payload; it does not verify the signature.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return None
+
+
+class TokenStore:
+    """JSON file of cached tokens, shared by processes through an advisory lock."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._thread_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold the store's lock (threads in this process, then other processes)."""
+        with self._thread_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self, key):
+        """Return the entry for `key`, or None; call while holding locked()."""
+        try:
+            return json.loads(self.path.read_text()).get(key)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, key, entry):
+        """Store the entry for `key`; call while holding locked()."""
+        try:
+            entries = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            entries = {}
+        entries[key] = entry
+        # Write a private temporary file and rename it, so readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class BearerTokenProvider:
+    """Hands out a valid Cognito access token, refreshing it once per expiry window."""
+
+    def __init__(
+        self,
+        client_id,
+        region=None,
+        refresh_token=None,
+        username=None,
+        password=None,
+        access_token=None,
+        store=None,
+        refresh_margin=300,
+        cognito_client=None,
+        clock=time.time,
+    ):
+        """
+        Args:
+            client_id: Cognito app client ID.
+            region: AWS region; defaults to the boto3 session's.
+            refresh_token: Refresh token for REFRESH_TOKEN_AUTH.
+            username, password: Credentials for USER_PASSWORD_AUTH, used when there
+                is no refresh token (or it has been rejected).
+            access_token: A token already in hand, e.g. from Secrets Manager.
+            store: TokenStore shared with other processes; defaults to DEFAULT_STORE_PATH.
+            refresh_margin: Refresh tokens this many seconds before they expire.
+            cognito_client: boto3 cognito-idp client; created lazily if omitted.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        if refresh_token is None and (username is None or password is None):
+            raise ValueError("need a refresh_token or a username and password")
+        self.client_id = client_id
+        self.region = region
+        self.username = username
+        self.password = password
+        self.store = store or TokenStore()
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        # Keyed by the credentials too, so a provider with a wrong password or another
+        # user's refresh token never picks up a token it could not have obtained itself
+        credentials = "\x1f".join([client_id, username or "", password or "", refresh_token or ""])
+        self.key = hashlib.sha256(credentials.encode()).hexdigest()
+        self._cognito = cognito_client
+        self._refresh_token = refresh_token
+        self._access_token = None
+        self._expires_at = 0.0
+        if access_token is not None:
+            self._remember(access_token)
+
+    @classmethod
+    def from_refresh_token(cls, client_id, refresh_token, region=None, access_token=None, **kwargs):
+        return cls(client_id, region, refresh_token=refresh_token, access_token=access_token, **kwargs)
+
+    @classmethod
+    def from_password(cls, client_id, username, password, region=None, **kwargs):
+        return cls(client_id, region, username=username, password=password, **kwargs)
+
+    @property
+    def cognito(self):
+        if self._cognito is None:
+            self._cognito = boto3.client("cognito-idp", region_name=self.region)
+        return self._cognito
+
+    def _remember(self, access_token, refresh_token=None):
+        expires_at = jwt_expiry(access_token)
+        # A token without a readable exp is treated as expired, so it is replaced on first use
+        self._access_token = access_token
+        self._expires_at = expires_at if expires_at is not None else 0.0
+        if refresh_token:
+            self._refresh_token = refresh_token
+
+    def _fresh(self, expires_at):
+        return self.clock() < expires_at - self.refresh_margin
+
+    def _authenticate(self):
+        if self._refresh_token is not None:
+            try:
+                result = self.cognito.initiate_auth(
+                    ClientId=self.client_id,
+                    AuthFlow="REFRESH_TOKEN_AUTH",
+                    AuthParameters={"REFRESH_TOKEN": self._refresh_token},
+                )["AuthenticationResult"]
+                # REFRESH_TOKEN_AUTH does not return a new refresh token; keep the old one
+                return result["AccessToken"], self._refresh_token
+            except self.cognito.exceptions.NotAuthorizedException:
+                if self.username is None:
+                    raise
+        result = self.cognito.initiate_auth(
+            ClientId=self.client_id,
+            AuthFlow="USER_PASSWORD_AUTH",
+            AuthParameters={"USERNAME": self.username, "PASSWORD": self.password},
+        )["AuthenticationResult"]
+        return result["AccessToken"], result.get("RefreshToken")
+
+    def cached_token(self):
+        """The in-memory token if it is not yet due for a refresh, else None."""
+        return self._access_token if self._fresh(self._expires_at) else None
+
+    def token(self, force_refresh=False):
+        """Return a valid access token, refreshing it if it is close to expiry.
+
+        force_refresh replaces the current token even if it looks valid (e.g. the
+        server rejected it), unless another worker has already replaced it.
+        """
+        rejected = self._access_token if force_refresh else None
+        if not force_refresh and self._fresh(self._expires_at):
+            return self._access_token
+
+        with self.store.locked():
+            entry = self.store.read(self.key)
+            if entry and entry["access_token"] != rejected and self._fresh(entry["expires_at"]):
+                # Another worker refreshed while we waited for the lock
+                self._remember(entry["access_token"], entry.get("refresh_token"))
+                return self._access_token
+            if rejected is None and self._fresh(self._expires_at):
+                return self._access_token
+            if entry and entry.get("refresh_token") and not self._refresh_token:
+                self._refresh_token = entry["refresh_token"]
+
+            access_token, refresh_token = self._authenticate()
+            self._remember(access_token, refresh_token)
+            self.store.write(
+                self.key,
+                {"access_token": access_token, "refresh_token": self._refresh_token, "expires_at": self._expires_at},
+            )
+        return self._access_token
+
+    def auth(self):
+        """An httpx.Auth that sends this provider's token (for streamablehttp_client(auth=...))."""
+        return BearerAuth(self)
+
+
+class BearerAuth(httpx.Auth):
+    """Authorization: Bearer <token>, refreshed once and retried on a 401."""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def sync_auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {self.provider.token()}"
+        response = yield request
+        if response.status_code == 401:
+            request.headers["Authorization"] = f"Bearer {self.provider.token(force_refresh=True)}"
+            yield request
+
+    async def async_auth_flow(self, request):
+        # token() only blocks (file lock, Cognito call) when it refreshes; keep that off the event loop
+        provider = self.provider
+        token = provider.cached_token() or await asyncio.to_thread(provider.token)
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+        if response.status_code == 401:
+            token = await asyncio.to_thread(provider.token, True)
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
@@ -0,0 +1,206 @@
+"""
+Cached SSM parameter and Secrets Manager lookups for MCP client bootstrap.
+
+The invocation scripts look up the runtime ARN in SSM and the Cognito credentials in
+Secrets Manager on every run, creating a boto3 client for each first. ConfigResolver
+answers repeated lookups locally:
+
+  - values are cached in memory and in a small JSON file (mode 0600, default
+    ~/.cache/agentcore/config_cache.json, or CONFIG_CACHE_PATH; use /tmp in Lambda)
+    for ttl seconds (default 300), so a short-lived script or a Lambda cold start
+    that ran recently makes no AWS calls at all
+  - parameters() fetches all the names it is missing with batched get_parameters
+    calls (10 names per call, the API's limit) instead of one get_parameter each
+  - the ssm and secretsmanager clients are only created on a cache miss
+
+A cached value can be up to ttl seconds stale; pass ttl=0 to always go to AWS.
+
+Usage:
+    config = ConfigResolver(region)
+    agent_arn = config.parameter("/mcp_server/runtime/agent_arn")
+    credentials = config.secret_json("mcp_server/cognito/credentials")
+    mcp_url = runtime_invocation_url(agent_arn, region)
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import boto3
+
+DEFAULT_CACHE_PATH = Path(os.environ.get("CONFIG_CACHE_PATH", Path.home() / ".cache" / "agentcore" / "config_cache.json"))
+GET_PARAMETERS_BATCH = 10
+
+
+class MissingConfigError(LookupError):
+    """One or more SSM parameters do not exist."""
+
+
+@functools.lru_cache(maxsize=128)
+def encode_arn(arn):
+    """Percent-encode an ARN for use as one path segment (':' -> %3A, '/' -> %2F)."""
+    return quote(arn, safe="")
+
+
+def runtime_invocation_url(agent_arn, region, qualifier="DEFAULT"):
+    """The AgentCore Runtime MCP invocation URL for an agent runtime ARN."""
+    return (
+        f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encode_arn(agent_arn)}"
+        f"/invocations?qualifier={qualifier}"
+    )
+
+
+class ConfigResolver:
+    """SSM parameters and Secrets Manager secrets behind a memory and disk TTL cache."""
+
+    def __init__(self, region=None, ttl=300, cache_path=DEFAULT_CACHE_PATH, session=None, clock=time.time):
+        """
+        Args:
+            region: AWS region; defaults to the boto3 session's.
+            ttl: Seconds a resolved value is reused.
+            cache_path: JSON file shared with later runs; None keeps the cache in memory only.
+            session: boto3 Session to create clients from; created lazily if omitted.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self._session = session
+        self.region = region or self.session.region_name
+        self.ttl = ttl
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.clock = clock
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "aws_calls": 0}
+        self._memory = {}
+        self._disk = None
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = boto3.Session()
+        return self._session
+
+    def client(self, service):
+        """The boto3 client for `service`, created on first use."""
+        with self._lock:
+            if service not in self._clients:
+                self._clients[service] = self.session.client(service, region_name=self.region)
+            return self._clients[service]
+
+    def _key(self, kind, name, *qualifiers):
+        return "|".join((self.region, kind, name, *qualifiers))
+
+    def _load_disk(self):
+        if self._disk is None:
+            self._disk = {}
+            if self.cache_path is not None:
+                try:
+                    self._disk = json.loads(self.cache_path.read_text())
+                except (FileNotFoundError, ValueError):
+                    pass
+        return self._disk
+
+    def _cached(self, key):
+        now = self.clock()
+        entry = self._memory.get(key)
+        if entry is not None and entry["expires_at"] > now:
+            self.stats["memory_hits"] += 1
+            return entry["value"]
+        entry = self._load_disk().get(key)
+        if entry is not None and entry["expires_at"] > now:
+            self.stats["disk_hits"] += 1
+            self._memory[key] = entry
+            return entry["value"]
+        return None
+
+    def _store(self, values):
+        """Cache {key: value} in memory and on disk."""
+        expires_at = self.clock() + self.ttl
+        entries = {key: {"value": value, "expires_at": expires_at} for key, value in values.items()}
+        self._memory.update(entries)
+        if self.cache_path is None or self.ttl <= 0:
+            return
+        disk = self._load_disk()
+        now = self.clock()
+        for key in [key for key, entry in disk.items() if entry["expires_at"] <= now]:
+            del disk[key]
+        disk.update(entries)
+        self._write_disk(disk)
+
+    def _write_disk(self, disk):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Secrets end up in this file: write it private, then rename it into place
+        fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, prefix=self.cache_path.name)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(disk, f)
+            os.replace(tmp, self.cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def parameters(self, *names, decrypt=True):
+        """Resolve SSM parameters; returns {name: value}.
+
+        Raises MissingConfigError naming any parameters that do not exist.
+        """
+        # A decrypted SecureString and its ciphertext are cached separately
+        def key(name):
+            return self._key("ssm", name, "decrypted" if decrypt else "raw")
+
+        values, missing = {}, []
+        for name in dict.fromkeys(names):
+            value = self._cached(key(name))
+            if value is None:
+                missing.append(name)
+            else:
+                values[name] = value
+
+        fetched, invalid = {}, []
+        for start in range(0, len(missing), GET_PARAMETERS_BATCH):
+            self.stats["aws_calls"] += 1
+            response = self.client("ssm").get_parameters(
+                Names=missing[start : start + GET_PARAMETERS_BATCH], WithDecryption=decrypt
+            )
+            for parameter in response["Parameters"]:
+                fetched[parameter["Name"]] = parameter["Value"]
+            invalid.extend(response.get("InvalidParameters", []))
+        if fetched:
+            self._store({key(name): value for name, value in fetched.items()})
+        if invalid:
+            raise MissingConfigError(f"SSM parameter(s) not found: {', '.join(invalid)}")
+        values.update(fetched)
+        return {name: values[name] for name in names}
+
+    def parameter(self, name, decrypt=True):
+        return self.parameters(name, decrypt=decrypt)[name]
+
+    def secret(self, secret_id):
+        """Resolve a Secrets Manager secret's SecretString."""
+        key = self._key("secret", secret_id)
+        value = self._cached(key)
+        if value is None:
+            self.stats["aws_calls"] += 1
+            value = self.client("secretsmanager").get_secret_value(SecretId=secret_id)["SecretString"]
+            self._store({key: value})
+        return value
+
+    def secret_json(self, secret_id):
+        return json.loads(self.secret(secret_id))
+
+    def invalidate(self):
+        """Forget everything cached (in memory and on disk) for this region."""
+        prefix = f"{self.region}|"
+        for key in [key for key in self._memory if key.startswith(prefix)]:
+            del self._memory[key]
+        disk = self._load_disk()
+        stale = [key for key in disk if key.startswith(prefix)]
+        for key in stale:
+            del disk[key]
+        # Written directly: _store() skips the disk when ttl <= 0
+        if stale and self.cache_path is not None:
+            self._write_disk(disk)
@@ -0,0 +1,153 @@
+"""
+Check ConfigResolver's caching against stubbed SSM and Secrets Manager clients.
+
+Each "run" below is a fresh ConfigResolver sharing one cache file, as consecutive
+runs of mcp_client_remote.py would. botocore's Stubber fails on any AWS call that
+was not expected, so the script shows exactly which runs go to AWS:
+
+  - first run: one batched get_parameters for all names plus one get_secret_value
+  - second run: nothing (served from the cache file)
+  - after the TTL: the same two calls again
+  - a missing parameter raises MissingConfigError
+  - decrypt=False is cached separately from the decrypted value
+  - invalidate() forgets only its own region, and persists that with ttl=0 too
+
+Usage:
+  python config_resolver_local.py
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import boto3
+from botocore.stub import Stubber
+
+from config_resolver import ConfigResolver, MissingConfigError, runtime_invocation_url
+
+REGION = "us-east-1"
+AGENT_ARN = "arn:aws:bedrock-agentcore:us-east-1:123456789012:runtime/mcp_server-abc123"
+PARAMETERS = {
+    "/mcp_server/runtime/agent_arn": AGENT_ARN,
+    "/mcp_server/runtime/qualifier": "DEFAULT",
+}
+SECRET_ID = "mcp_server/cognito/credentials"
+SECRET = json.dumps({"client_id": "client", "bearer_token": "token", "refresh_token": "refresh"})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubbedSession:
+    """Hands out clients whose every call must have been queued with add_response."""
+
+    def __init__(self):
+        self.stubbers = {}
+
+    def client(self, service, region_name=None):
+        client = boto3.client(
+            service, region_name=region_name, aws_access_key_id="stub", aws_secret_access_key="stub"
+        )
+        stubber = Stubber(client)
+        stubber.activate()
+        self.stubbers[service] = stubber
+        return client
+
+
+def expect_bootstrap_calls(session, resolver):
+    """Queue the calls a cold resolver should make (creating its clients)."""
+    resolver.client("ssm")
+    resolver.client("secretsmanager")
+    session.stubbers["ssm"].add_response(
+        "get_parameters",
+        {"Parameters": [{"Name": name, "Value": value, "Type": "String"} for name, value in PARAMETERS.items()]},
+        {"Names": list(PARAMETERS), "WithDecryption": True},
+    )
+    session.stubbers["secretsmanager"].add_response(
+        "get_secret_value", {"SecretString": SECRET, "Name": SECRET_ID}, {"SecretId": SECRET_ID}
+    )
+
+
+def bootstrap(resolver):
+    parameters = resolver.parameters(*PARAMETERS)
+    credentials = resolver.secret_json(SECRET_ID)
+    return parameters, credentials
+
+
+def main():
+    clock = Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "config_cache.json"
+
+        def run(label, expect_calls):
+            session = StubbedSession()
+            resolver = ConfigResolver(REGION, cache_path=cache_path, session=session, clock=clock)
+            if expect_calls:
+                expect_bootstrap_calls(session, resolver)
+            parameters, credentials = bootstrap(resolver)
+            for stubber in session.stubbers.values():
+                stubber.assert_no_pending_responses()
+            assert parameters == PARAMETERS and credentials["client_id"] == "client"
+            print(f"{label:<24}{resolver.stats}")
+            return session, resolver
+
+        run("first run:", expect_calls=True)
+        session, _ = run("second run:", expect_calls=False)
+        assert not session.stubbers, "a cached run created AWS clients"
+        print(f"{'cache file mode:':<24}{oct(cache_path.stat().st_mode & 0o777)}")
+        clock.now += 301
+        run("after TTL:", expect_calls=True)
+
+        session = StubbedSession()
+        resolver = ConfigResolver(REGION, cache_path=cache_path, session=session, clock=clock)
+        resolver.client("ssm")
+        session.stubbers["ssm"].add_response(
+            "get_parameters",
+            {"Parameters": [], "InvalidParameters": ["/missing"]},
+            {"Names": ["/missing"], "WithDecryption": True},
+        )
+        try:
+            resolver.parameter("/missing")
+        except MissingConfigError as e:
+            print(f"{'missing parameter:':<24}{e}")
+        else:
+            raise AssertionError("missing parameter resolved")
+
+        # decrypt=False must not be answered from the decrypted value cached above
+        name = "/mcp_server/runtime/agent_arn"
+        session.stubbers["ssm"].add_response(
+            "get_parameters",
+            {"Parameters": [{"Name": name, "Value": "ciphertext", "Type": "SecureString"}]},
+            {"Names": [name], "WithDecryption": False},
+        )
+        assert resolver.parameter(name) == AGENT_ARN
+        assert resolver.parameter(name, decrypt=False) == "ciphertext"
+        session.stubbers["ssm"].assert_no_pending_responses()
+        print(f"{'decrypt=False:':<24}fetched separately from the decrypted value")
+
+        # invalidate() drops this region only, in memory and on disk, even with ttl=0
+        other = ConfigResolver("us-west-2", cache_path=cache_path, session=StubbedSession(), clock=clock)
+        other._store({other._key("secret", SECRET_ID): SECRET})
+        assert any(key.startswith(f"{REGION}|") for key in json.loads(cache_path.read_text()))
+        no_ttl = ConfigResolver(REGION, ttl=0, cache_path=cache_path, session=StubbedSession(), clock=clock)
+        no_ttl._memory.update(other._memory)
+        no_ttl.invalidate()
+        on_disk = json.loads(cache_path.read_text())
+        assert on_disk and all(key.startswith("us-west-2|") for key in on_disk), on_disk
+        assert list(no_ttl._memory) == [other._key("secret", SECRET_ID)]
+        print(f"{'invalidate(), ttl=0:':<24}{len(on_disk)} us-west-2 entry kept on disk and in memory")
+
+    print(f"{'invocation URL:':<24}{runtime_invocation_url(AGENT_ARN, REGION)}")
+    assert runtime_invocation_url(AGENT_ARN, REGION) == (
+        f"https://bedrock-agentcore.{REGION}.amazonaws.com/runtimes/"
+        f"{AGENT_ARN.replace(':', '%3A').replace('/', '%2F')}/invocations?qualifier=DEFAULT"
+    )
+
+
+if __name__ == "__main__":
+    main()
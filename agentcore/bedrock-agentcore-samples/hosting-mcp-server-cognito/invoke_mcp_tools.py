@@ -1,43 +1,13 @@
 import asyncio
-import boto3
-import json
 import sys
-import base64
-import time
 from boto3.session import Session
 from datetime import timedelta
 
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
-def get_refresh_token(client_id, refresh_token, region):
-    """Refresh access token using refresh token"""
-    cognito_client = boto3.client('cognito-idp', region_name=region)
-    auth_response = cognito_client.initiate_auth(
-        ClientId=client_id,
-        AuthFlow='REFRESH_TOKEN_AUTH',
-        AuthParameters={'REFRESH_TOKEN': refresh_token}
-    )
-    return auth_response['AuthenticationResult']['AccessToken']
-
-def get_valid_token(bearer_token, client_id, refresh_token, region):
-    """Check token expiry and refresh if needed"""
-    try:
-        payload = bearer_token.split('.')[1]
-        payload += '=' * (4 - len(payload) % 4)
-        decoded = json.loads(base64.b64decode(payload))
-
-        current_time = int(time.time())
-        if decoded['exp'] - current_time < 300:
-            print("🔄 Token expiring soon, refreshing...")
-            new_token = get_refresh_token(client_id, refresh_token, region)
-            print("✓ Token refreshed successfully")
-            return new_token
-
-        return bearer_token
-    except:
-        print("🔄 Invalid token, refreshing...")
-        return get_refresh_token(client_id, refresh_token, region)
+from bearer_token_provider import BearerTokenProvider
+from config_resolver import ConfigResolver, runtime_invocation_url
 
 async def main():
     boto_session = Session()
@@ -46,38 +16,39 @@ async def main():
     print(f"Using AWS region: {region}")
 
     try:
-        ssm_client = boto3.client('ssm', region_name=region)
-        agent_arn_response = ssm_client.get_parameter(Name='/mcp_server/runtime/agent_arn')
-        agent_arn = agent_arn_response['Parameter']['Value']
+        # Served from a local cache for five minutes after the first lookup
+        config = ConfigResolver(region, session=boto_session)
+        agent_arn = config.parameter('/mcp_server/runtime/agent_arn')
         print(f"Retrieved Agent ARN: {agent_arn}")
 
-        secrets_client = boto3.client('secretsmanager', region_name=region)
-        response = secrets_client.get_secret_value(SecretId='mcp_server/cognito/credentials')
-        secret_value = response['SecretString']
-        parsed_secret = json.loads(secret_value)
+        parsed_secret = config.secret_json('mcp_server/cognito/credentials')
         bearer_token = parsed_secret['bearer_token']
         refresh_token = parsed_secret['refresh_token']
         client_id = parsed_secret['client_id']
         print("✓ Retrieved credentials from Secrets Manager")
 
-        # Validate and refresh token if needed
-        bearer_token = get_valid_token(bearer_token, client_id, refresh_token, region)
+        # Checks the token's expiry locally and refreshes it (once, for all local
+        # clients) when it is within five minutes of expiring
+        token_provider = BearerTokenProvider.from_refresh_token(
+            client_id, refresh_token, region, access_token=bearer_token
+        )
+        bearer_token = token_provider.token()
 
     except Exception as e:
         print(f"Error retrieving credentials: {e}")
         sys.exit(1)
 
-    encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
-    mcp_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
+    mcp_url = runtime_invocation_url(agent_arn, region)
     headers = {
-        "authorization": f"Bearer {bearer_token}",
         "Content-Type": "application/json"
     }
 
     print(f"\nConnecting to: {mcp_url}")
 
     try:
-        async with streamablehttp_client(mcp_url, headers, timeout=timedelta(seconds=120), terminate_on_close=False) as (
+        async with streamablehttp_client(
+            mcp_url, headers, timeout=timedelta(seconds=120), terminate_on_close=False, auth=token_provider.auth()
+        ) as (
             read_stream,
             write_stream,
             _,
@@ -0,0 +1,290 @@
+"""
+Reusable raw JSON-RPC client for MCP servers hosted on AgentCore Runtime.
+
+The just_for_learning_* scripts used to open a new httpx client and resolve boto3
+credentials for every POST, so every tools/call paid for a TLS handshake and a
+credential lookup. These clients keep one pooled keep-alive connection (HTTP/2 when
+the `h2` package is installed), sign with the cached SigV4 signer, and reuse frozen
+credentials from a RefreshableCredentialProvider.
+
+Usage:
+    with AgentCoreMcpRpcClient(url, region) as client:
+        client.create_session()
+        print(client.list_tools().text)
+        print(client.call_tool("add_numbers", {"a": 5, "b": 3}).text)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from botocore.credentials import Credentials
+
+from jsonrpc_batch import parse_jsonrpc_body
+from streamable_http_sigv4 import RefreshableCredentialProvider, SigV4HTTPXAuth
+
+SERVICE_NAME = "bedrock-agentcore"
+PROTOCOL_VERSION = "2025-06-18"
+
+# Accept must include both JSON and SSE for MCP compatibility.
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+}
+
+
+def runtime_invocation_url(region: str, runtime_arn: str, qualifier: str = "DEFAULT") -> str:
+    """Build the InvokeAgentRuntime URL for an MCP runtime ARN."""
+    encoded = urllib.parse.quote(runtime_arn, safe="")
+    return f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded}/invocations?qualifier={qualifier}"
+
+
+def http2_available() -> bool:
+    """httpx only speaks HTTP/2 when the optional `h2` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parse_jsonrpc_messages(response: httpx.Response) -> list[dict]:
+    """Return every JSON-RPC message in a response body, JSON or SSE."""
+    return parse_jsonrpc_body(response.headers.get("content-type", ""), response.content)
+
+
+def match_responses(messages: list[dict], request_ids: list[int]) -> dict[int, dict | None]:
+    """Map each request id to its JSON-RPC response (None if the server sent none)."""
+    by_id = {message.get("id"): message for message in messages if "id" in message}
+    return {request_id: by_id.get(request_id) for request_id in request_ids}
+
+
+@dataclass
+class ToolCallResult:
+    """Outcome of one tools/call made by AsyncAgentCoreMcpRpcClient.fan_out()."""
+
+    name: str
+    arguments: dict
+    request_id: int
+    status_code: int
+    latency: float
+    message: dict | None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 and self.message is not None and "error" not in self.message
+
+
+class _McpRpcClientBase:
+    """Payload building and session bookkeeping shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        url: str,
+        region: str,
+        credentials: Credentials | RefreshableCredentialProvider | None = None,
+        service: str = SERVICE_NAME,
+    ):
+        self.url = url
+        self.region = region
+        self.credentials = credentials or RefreshableCredentialProvider()
+        self.auth = SigV4HTTPXAuth(self.credentials, service, region)
+        self.session_id: str | None = None
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def request(self, method: str, params: dict | None = None) -> dict:
+        """Build a JSON-RPC request object with a fresh id."""
+        payload = {"jsonrpc": "2.0", "id": self.next_id(), "method": method}
+        if params is not None:
+            payload["params"] = params
+        return payload
+
+    def tool_call_request(self, name: str, arguments: dict) -> dict:
+        return self.request("tools/call", {"name": name, "arguments": arguments})
+
+    def tool_call_batch(self, calls: list[tuple[str, dict]]) -> list[dict]:
+        """Build one JSON-RPC batch array of tools/call requests."""
+        return [self.tool_call_request(name, arguments) for name, arguments in calls]
+
+    @staticmethod
+    def demultiplex(response: httpx.Response, batch: list[dict]) -> list[dict | None]:
+        """Match a batch reply (JSON array or SSE events) back to the requests in order."""
+        responses = match_responses(parse_jsonrpc_messages(response), [r["id"] for r in batch])
+        return [responses[r["id"]] for r in batch]
+
+    def session_headers(self) -> dict[str, str]:
+        return {"Mcp-Session-Id": self.session_id} if self.session_id else {}
+
+    def _remember_session(self, response: httpx.Response) -> httpx.Response:
+        session_id = response.headers.get("mcp-session-id")
+        if session_id:
+            self.session_id = session_id
+        return response
+
+
+class AgentCoreMcpRpcClient(_McpRpcClientBase):
+    """Synchronous SigV4-signed JSON-RPC client over one pooled keep-alive connection."""
+
+    def __init__(
+        self,
+        url: str,
+        region: str,
+        credentials: Credentials | RefreshableCredentialProvider | None = None,
+        service: str = SERVICE_NAME,
+        timeout: float = 30.0,
+        http2: bool | None = None,
+        max_connections: int = 10,
+    ):
+        """Initialize the client.
+
+        Args:
+            url: The runtime invocation URL (see runtime_invocation_url()).
+            region: AWS region used for signing.
+            credentials: AWS credentials; defaults to a RefreshableCredentialProvider
+                over the default boto3 session.
+            service: AWS service name for SigV4 signing.
+            timeout: HTTP timeout in seconds.
+            http2: Use HTTP/2; defaults to True when `h2` is installed.
+            max_connections: Upper bound on pooled connections.
+        """
+        super().__init__(url, region, credentials, service)
+        self._client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            auth=self.auth,
+            timeout=timeout,
+            http2=http2_available() if http2 is None else http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def __enter__(self) -> AgentCoreMcpRpcClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._client.close()
+
+    def post(self, payload: Any) -> httpx.Response:
+        """POST a JSON-RPC payload on the pooled connection, signed with SigV4."""
+        response = self._client.post(self.url, json=payload, headers=self.session_headers())
+        return self._remember_session(response)
+
+    def create_session(self) -> httpx.Response:
+        return self.post(self.request("sessions/create", {"protocolVersion": PROTOCOL_VERSION}))
+
+    def list_tools(self) -> httpx.Response:
+        return self.post(self.request("tools/list"))
+
+    def call_tool(self, name: str, arguments: dict) -> httpx.Response:
+        return self.post(self.tool_call_request(name, arguments))
+
+    def batch_call(self, calls: list[tuple[str, dict]]) -> list[httpx.Response]:
+        """Call each (name, arguments) in turn, reusing the same warm connection."""
+        return [self.call_tool(name, arguments) for name, arguments in calls]
+
+    def jsonrpc_batch_call(self, calls: list[tuple[str, dict]]) -> list[dict | None]:
+        """Send every call as one JSON-RPC batch in a single signed POST.
+
+        Returns the JSON-RPC response for each call, in the order of `calls`
+        (None where the server sent no response for that id).
+        """
+        batch = self.tool_call_batch(calls)
+        response = self.post(batch)
+        response.raise_for_status()
+        return self.demultiplex(response, batch)
+
+
+class AsyncAgentCoreMcpRpcClient(_McpRpcClientBase):
+    """Asyncio counterpart of AgentCoreMcpRpcClient."""
+
+    def __init__(
+        self,
+        url: str,
+        region: str,
+        credentials: Credentials | RefreshableCredentialProvider | None = None,
+        service: str = SERVICE_NAME,
+        timeout: float = 30.0,
+        http2: bool | None = None,
+        max_connections: int = 10,
+    ):
+        """Initialize the client; arguments are the same as AgentCoreMcpRpcClient."""
+        super().__init__(url, region, credentials, service)
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            auth=self.auth,
+            timeout=timeout,
+            http2=http2_available() if http2 is None else http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def __aenter__(self) -> AsyncAgentCoreMcpRpcClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def post(self, payload: Any) -> httpx.Response:
+        """POST a JSON-RPC payload on the pooled connection, signed with SigV4."""
+        response = await self._client.post(self.url, json=payload, headers=self.session_headers())
+        return self._remember_session(response)
+
+    async def create_session(self) -> httpx.Response:
+        return await self.post(self.request("sessions/create", {"protocolVersion": PROTOCOL_VERSION}))
+
+    async def list_tools(self) -> httpx.Response:
+        return await self.post(self.request("tools/list"))
+
+    async def call_tool(self, name: str, arguments: dict) -> httpx.Response:
+        return await self.post(self.tool_call_request(name, arguments))
+
+    async def batch_call(self, calls: list[tuple[str, dict]]) -> list[httpx.Response]:
+        """Call every (name, arguments) concurrently over the shared connection pool."""
+        return list(await asyncio.gather(*(self.call_tool(name, arguments) for name, arguments in calls)))
+
+    async def jsonrpc_batch_call(self, calls: list[tuple[str, dict]]) -> list[dict | None]:
+        """Send every call as one JSON-RPC batch in a single signed POST."""
+        batch = self.tool_call_batch(calls)
+        response = await self.post(batch)
+        response.raise_for_status()
+        return self.demultiplex(response, batch)
+
+    async def fan_out(
+        self, calls: list[tuple[str, dict]], concurrency: int = 8
+    ) -> list[ToolCallResult]:
+        """Run tool calls concurrently, at most `concurrency` in flight at once.
+
+        Every call gets its own JSON-RPC id, and its response is picked out of the
+        reply by that id. Results come back in the order of `calls`, each with its
+        own latency, so a full smoke test takes about as long as the slowest tool.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(name: str, arguments: dict) -> ToolCallResult:
+            async with semaphore:
+                payload = self.tool_call_request(name, arguments)
+                start = time.perf_counter()
+                response = await self.post(payload)
+                latency = time.perf_counter() - start
+            message = match_responses(parse_jsonrpc_messages(response), [payload["id"]])[payload["id"]]
+            return ToolCallResult(name, arguments, payload["id"], response.status_code, latency, message)
+
+        return list(await asyncio.gather(*(run(name, arguments) for name, arguments in calls)))
@@ -0,0 +1,277 @@
+"""
+Load-generation benchmark for the FastMCP servers in this repository.
+
+Starts a server locally in a subprocess (one per transport mode) and drives concurrent
+tools/list and tools/call traffic through the real MCP streamable HTTP client. Each
+concurrent worker opens its own ClientSession, so in stateful mode there is one MCP
+session per worker. Reports p50/p95/p99 latency and requests per second for:
+
+  - stateful sessions vs stateless_http=True
+  - SSE responses vs json_response=True
+
+Servers:
+  - sigv4:   mcp_server.py in this directory
+  - me:      agentcore/me/mcp-server/my_mcp_server.py
+  - weather: strands/strands-docs/quick-start/mcp-weather/server-weather.py, pointed
+             at a local fake NWS API (fake_nws.py) so no real weather.gov requests
+             are made
+  - or the path to any module that defines a FastMCP instance named `mcp`
+
+Usage:
+  python benchmark_mcp_servers.py --server sigv4 --concurrency 16 --requests 200
+  python benchmark_mcp_servers.py --server weather --list-ratio 0.2 --nws-latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+REPO_ROOT = HERE.parents[2]
+
+SERVERS = {
+    "sigv4": HERE / "mcp_server.py",
+    "me": REPO_ROOT / "agentcore" / "me" / "mcp-server" / "my_mcp_server.py",
+    "weather": REPO_ROOT / "strands" / "strands-docs" / "quick-start" / "mcp-weather" / "server-weather.py",
+}
+
+# tools/call used for each server (any other module falls back to tools/list only)
+TOOL_CALLS = {
+    "sigv4": ("add_numbers", {"a": 5, "b": 3}),
+    "me": ("add_numbers", {"a": 5, "b": 3}),
+    "weather": ("get_alerts", {"state": "CA"}),
+}
+
+# name -> (stateless_http, json_response)
+MODES = {
+    "stateful-sse": (False, False),
+    "stateful-json": (False, True),
+    "stateless-sse": (True, False),
+    "stateless-json": (True, True),
+}
+
+
+def load_server_module(path: Path):
+    """Import a server script by path (server-weather.py is not a valid module name)."""
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location("benchmarked_mcp_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def configure_fastmcp(stateless_http: bool, json_response: bool) -> None:
+    """Make every FastMCP created from now on use the given transport settings.
+
+    Server modules create their FastMCP (and often their ASGI app) at import with
+    the settings hard-coded, so the benchmark swaps in a subclass that overrides
+    them before the module is imported. Each configuration runs in its own
+    subprocess, so each gets a fresh FastMCP and app built with its settings.
+    """
+    import mcp.server.fastmcp
+
+    class ConfiguredFastMCP(mcp.server.fastmcp.FastMCP):
+        def __init__(self, *args, **settings):
+            settings.update(stateless_http=stateless_http, json_response=json_response)
+            super().__init__(*args, **settings)
+
+    mcp.server.fastmcp.FastMCP = ConfiguredFastMCP
+
+
+def serve(path: Path, port: int, stateless_http: bool, json_response: bool, nws_latency: float) -> None:
+    """Run one server module with the given transport settings (subprocess entry point)."""
+    import uvicorn
+
+    configure_fastmcp(stateless_http, json_response)
+    module = load_server_module(path)
+    # FastMCP logs every request at INFO; that would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    # Serve the module's own ASGI app (with wrappers such as mcp_server.py's
+    # JsonRpcBatchMiddleware) when it defines one
+    if hasattr(module, "create_app"):
+        app = module.create_app()
+    elif hasattr(module, "app"):
+        app = module.app
+    else:
+        app = module.mcp.streamable_http_app()
+
+    if hasattr(module, "NWS_API_BASE"):
+        from fake_nws import start_fake_nws
+
+        nws = start_fake_nws(nws_latency)
+        module.NWS_API_BASE = f"http://127.0.0.1:{nws.server_port}"
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    path: Path, mode: str, nws_latency: float, show_output: bool = False
+) -> tuple[subprocess.Popen, str]:
+    """Start the server in a subprocess and wait until it accepts connections."""
+    stateless_http, json_response = MODES[mode]
+    port = free_port()
+    command = [sys.executable, __file__, "--serve", str(path), "--port", str(port), "--nws-latency-ms", str(nws_latency * 1000)]
+    if stateless_http:
+        command.append("--stateless-http")
+    if json_response:
+        command.append("--json-response")
+    # Stateless sessions log a harmless traceback per request when they close
+    output = None if show_output else subprocess.DEVNULL
+    process = subprocess.Popen(command, stdout=output, stderr=output)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{path.name} exited with code {process.returncode} before it was ready")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}/mcp"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{path.name} did not start listening on port {port}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def run_load(
+    url: str,
+    concurrency: int,
+    requests_per_worker: int,
+    list_ratio: float,
+    tool_call: tuple[str, dict] | None,
+) -> tuple[dict[str, list[float]], int, float]:
+    """Drive traffic from `concurrency` sessions; return latencies per op, errors and wall time."""
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors = 0
+    ready = 0
+    all_ready = asyncio.Event()
+    go = asyncio.Event()
+
+    async def worker(seed: int) -> None:
+        nonlocal errors, ready
+        rng = random.Random(seed)
+        async with streamablehttp_client(url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                # Session setup is not measured; every worker starts together
+                try:
+                    await session.initialize()
+                finally:
+                    ready += 1
+                    if ready == concurrency:
+                        all_ready.set()
+                await go.wait()
+
+                for _ in range(requests_per_worker):
+                    op = "tools/list" if tool_call is None or rng.random() < list_ratio else "tools/call"
+                    start = time.perf_counter()
+                    try:
+                        if op == "tools/list":
+                            await session.list_tools()
+                        else:
+                            result = await session.call_tool(*tool_call)
+                            if result.isError:
+                                raise RuntimeError(result.content)
+                    except Exception:
+                        errors += 1
+                        continue
+                    latencies[op].append(time.perf_counter() - start)
+
+    tasks = [asyncio.create_task(worker(seed)) for seed in range(concurrency)]
+    await all_ready.wait()
+    start = time.perf_counter()
+    go.set()
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentiles(values: list[float]) -> tuple[float, float, float]:
+    """p50, p95 and p99 in milliseconds."""
+    ms = [value * 1000 for value in values]
+    if len(ms) < 2:
+        return (ms[0],) * 3 if ms else (float("nan"),) * 3
+    cuts = statistics.quantiles(ms, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def report(mode: str, latencies: dict[str, list[float]], errors: int, elapsed: float) -> None:
+    total = sum(len(values) for values in latencies.values())
+    for op, values in sorted(latencies.items()) + [("all", [v for vs in latencies.values() for v in vs])]:
+        p50, p95, p99 = percentiles(values)
+        rate = len(values) / elapsed if op != "all" else total / elapsed
+        print(f"{mode:<16}{op:<12}{len(values):>7}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{rate:>10.0f}")
+    if errors:
+        print(f"{'':<16}{'errors':<12}{errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the FastMCP servers over streamable HTTP")
+    parser.add_argument("--server", default="sigv4", help=f"One of {', '.join(SERVERS)}, or a path to a server module")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated transport modes to compare")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client sessions")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per session")
+    parser.add_argument("--list-ratio", type=float, default=0.2, help="Fraction of requests that are tools/list")
+    parser.add_argument("--nws-latency-ms", type=float, default=0.0, help="Simulated fake NWS latency (weather server)")
+    parser.add_argument("--server-output", action="store_true", help="Show the server's stdout/stderr")
+    parser.add_argument("--serve", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--stateless-http", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--json-response", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.stateless_http, args.json_response, args.nws_latency_ms / 1000)
+        return
+
+    path = SERVERS.get(args.server, Path(args.server))
+    tool_call = TOOL_CALLS.get(args.server)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r}; choose from {', '.join(MODES)}")
+
+    print(
+        f"{path.name}: {args.concurrency} sessions x {args.requests} requests, "
+        f"{args.list_ratio:.0%} tools/list" + (f", tools/call {tool_call[0]}" if tool_call else "") + "\n"
+    )
+    print(f"{'mode':<16}{'op':<12}{'n':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}")
+    print("=" * 72)
+    for mode in modes:
+        process, url = start_server(path, mode, args.nws_latency_ms / 1000, args.server_output)
+        try:
+            latencies, errors, elapsed = asyncio.run(
+                run_load(url, args.concurrency, args.requests, args.list_ratio, tool_call)
+            )
+        finally:
+            stop_server(process)
+        report(mode, latencies, errors, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Latency benchmark: per-request httpx client vs pooled AgentCoreMcpRpcClient.
+
+Starts a local stand-in for the AgentCore runtime (a keep-alive HTTP/1.1 server that
+answers MCP JSON-RPC calls) and sends the same tools/call traffic two ways:
+
+  - per-request: what the just_for_learning_* scripts used to do for every call
+    (resolve boto3 credentials, sign with a fresh SigV4Auth, open a new httpx.Client)
+  - pooled: one AgentCoreMcpRpcClient reused for every call
+
+The stand-in is plain HTTP, so the TLS handshake that the per-request path pays
+against the real endpoint is not included; real-world gains are larger.
+
+Usage:
+  python benchmark_rpc_client.py --calls 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Dummy credentials so boto3 resolves them the way it would in a real run
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY")
+
+import boto3
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+
+from agentcore_mcp_rpc_client import AgentCoreMcpRpcClient
+
+REGION = "ap-southeast-2"
+TOOLS = {
+    "add_numbers": lambda args: args["a"] + args["b"],
+    "multiply_numbers": lambda args: args["a"] * args["b"],
+    "greet_user": lambda args: f"Hello, {args['name']}! Nice to meet you.",
+}
+
+
+def handle_rpc(message: dict) -> dict:
+    """Answer one JSON-RPC request the way the hosted mcp_server.py would."""
+    method = message.get("method")
+    if method == "tools/list":
+        result = {"tools": [{"name": name, "inputSchema": {"type": "object"}} for name in TOOLS]}
+    elif method == "tools/call":
+        params = message["params"]
+        value = TOOLS[params["name"]](params["arguments"])
+        result = {"content": [{"type": "text", "text": str(value)}], "isError": False}
+    else:
+        result = {"protocolVersion": "2025-06-18", "capabilities": {}}
+    return {"jsonrpc": "2.0", "id": message.get("id"), "result": result}
+
+
+class StandInRuntimeHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the AgentCore runtime invocation endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle plus delayed
+    # ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "Authorization" not in self.headers:
+            self.send_error(403, "Missing SigV4 signature")
+            return
+        if self.delay:
+            time.sleep(self.delay)
+
+        message = json.loads(body)
+        if isinstance(message, list):
+            reply = [handle_rpc(m) for m in message if "id" in m]
+        else:
+            reply = handle_rpc(message)
+        data = json.dumps(reply).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Mcp-Session-Id", self.headers.get("Mcp-Session-Id") or "standin-session")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_standin_server(delay: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stand-in on a free localhost port in a daemon thread."""
+    handler = type("Handler", (StandInRuntimeHandler,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def post_signed_per_request(url: str, payload: dict, session_id: str) -> httpx.Response:
+    """The old post_signed(): new credentials, signer and client for every call."""
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json, text/event-stream",
+        "Mcp-Session-Id": session_id,
+    }
+    creds = boto3.Session().get_credentials().get_frozen_credentials()
+    req = AWSRequest(method="POST", url=url, data=json.dumps(payload), headers=headers)
+    SigV4Auth(creds, "bedrock-agentcore", REGION).add_auth(req)
+    with httpx.Client() as client:
+        return client.post(url, headers=dict(req.headers), content=req.body)
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    ms = sorted(latency * 1000 for latency in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{label:<14}{statistics.mean(ms):>9.2f}{statistics.median(ms):>9.2f}"
+        f"{p95:>9.2f}{len(ms) / (sum(ms) / 1000):>10.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs pooled MCP JSON-RPC calls")
+    parser.add_argument("--calls", type=int, default=500, help="tools/call requests per mode")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Simulated server time per request")
+    args = parser.parse_args()
+
+    server = start_standin_server(args.delay_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_port}/runtimes/standin/invocations?qualifier=DEFAULT"
+    payload = {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "add_numbers", "arguments": {"a": 5, "b": 3}}}
+
+    per_request = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        post_signed_per_request(url, payload, "standin-session").raise_for_status()
+        per_request.append(time.perf_counter() - start)
+
+    pooled = []
+    with AgentCoreMcpRpcClient(url, REGION) as client:
+        client.create_session()
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            client.call_tool("add_numbers", {"a": 5, "b": 3}).raise_for_status()
+            pooled.append(time.perf_counter() - start)
+
+    server.shutdown()
+
+    print(f"{args.calls} tools/call requests per mode\n")
+    print(f"{'mode':<14}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>10}")
+    print("=" * 51)
+    summarize("per-request", per_request)
+    summarize("pooled", pooled)
+
+
+if __name__ == "__main__":
+    main()
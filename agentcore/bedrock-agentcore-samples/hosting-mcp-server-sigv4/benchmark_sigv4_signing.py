@@ -0,0 +1,131 @@
+"""
+Micro-benchmark: SigV4 signing of MCP requests, botocore path vs CachedSigV4Signer.
+
+The "botocore" path is what SigV4HTTPXAuth used to do on every request: copy the
+headers into an AWSRequest, run SigV4Auth.add_auth (which re-derives the signing
+key and hashes the whole body), then copy the headers back. The "cached" path is
+CachedSigV4Signer from streamable_http_sigv4.py.
+
+No AWS access is needed; dummy credentials are used.
+
+Usage:
+  python benchmark_sigv4_signing.py --iterations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+
+from streamable_http_sigv4 import SIGV4_TIMESTAMP, CachedSigV4Signer
+
+SERVICE = "bedrock-agentcore"
+REGION = "ap-southeast-2"
+ARN = "arn:aws:bedrock-agentcore:ap-southeast-2:123456789012:runtime/mcp_server_iam-abc123"
+URL = (
+    f"https://bedrock-agentcore.{REGION}.amazonaws.com/runtimes/"
+    f"{ARN.replace(':', '%3A').replace('/', '%2F')}/invocations?qualifier=DEFAULT"
+)
+
+
+def build_request(body: bytes) -> httpx.Request:
+    return httpx.Request(
+        "POST",
+        URL,
+        content=body,
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "Mcp-Session-Id": "6f1c5e0e-4a41-4c5b-9d1e-2f1f5b0b7d11",
+            "Connection": "keep-alive",
+        },
+    )
+
+
+def botocore_sign(signer: SigV4Auth, request: httpx.Request) -> None:
+    """The previous SigV4HTTPXAuth.auth_flow body."""
+    headers = dict(request.headers)
+    headers.pop("connection", None)
+    aws_request = AWSRequest(
+        method=request.method,
+        url=str(request.url),
+        data=request.content,
+        headers=headers,
+    )
+    signer.add_auth(aws_request)
+    request.headers.update(dict(aws_request.headers))
+
+
+def check_signatures_match(credentials: Credentials, body: bytes) -> None:
+    """Sign the same request both ways at the same instant and compare."""
+    reference = build_request(body)
+    botocore_sign(SigV4Auth(credentials, SERVICE, REGION), reference)
+    signed_at = datetime.strptime(reference.headers["X-Amz-Date"], SIGV4_TIMESTAMP)
+
+    candidate = build_request(body)
+    CachedSigV4Signer(
+        credentials, SERVICE, REGION, clock=lambda: signed_at.replace(tzinfo=timezone.utc)
+    ).sign(candidate)
+
+    if reference.headers["Authorization"] != candidate.headers["Authorization"]:
+        raise SystemExit(
+            "Signature mismatch:\n"
+            f"  botocore: {reference.headers['Authorization']}\n"
+            f"  cached:   {candidate.headers['Authorization']}"
+        )
+
+
+def time_per_request(sign, body: bytes, iterations: int) -> float:
+    """Return microseconds per signed request (request construction excluded)."""
+    requests = [build_request(body) for _ in range(iterations)]
+    start = time.perf_counter()
+    for request in requests:
+        sign(request)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SigV4 signing paths")
+    parser.add_argument("--iterations", type=int, default=5000, help="Requests per small-body run")
+    args = parser.parse_args()
+
+    credentials = Credentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "session-token")
+
+    tool_call = json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "tools/call",
+            "params": {"name": "add_numbers", "arguments": {"a": 5, "b": 3}},
+        }
+    ).encode()
+    cases = [
+        ("tools/call (~100 B)", tool_call, args.iterations),
+        ("64 KiB body", b"x" * (64 * 1024), max(args.iterations // 10, 1)),
+        ("8 MiB body", b"x" * (8 * 1024 * 1024), max(args.iterations // 500, 3)),
+    ]
+
+    for _, body, _ in cases:
+        check_signatures_match(credentials, body)
+    print("✓ Signatures identical to botocore SigV4Auth\n")
+
+    botocore_signer = SigV4Auth(credentials, SERVICE, REGION)
+    cached_signer = CachedSigV4Signer(credentials, SERVICE, REGION)
+
+    print(f"{'case':<22}{'botocore µs':>14}{'cached µs':>12}{'speedup':>10}")
+    print("=" * 58)
+    for label, body, iterations in cases:
+        old = time_per_request(lambda r: botocore_sign(botocore_signer, r), body, iterations)
+        new = time_per_request(cached_signer.sign, body, iterations)
+        print(f"{label:<22}{old:>14.1f}{new:>12.1f}{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
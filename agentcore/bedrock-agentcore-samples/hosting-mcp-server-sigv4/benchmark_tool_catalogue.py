@@ -0,0 +1,115 @@
+"""
+Benchmark get_full_tools_list with and without the on-disk tool catalogue cache,
+and iter_tools_pipelined against listing every page before using any tool.
+
+Uses a fake paginated MCP client that serves 1,000 tools with a simulated round-trip
+per tools/list page, so no server or AWS access is needed (strands-agents must be
+installed for MCPAgentTool).
+
+Usage:
+  python benchmark_tool_catalogue.py --tools 1000 --page-size 50 --page-latency-ms 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+
+from mcp.types import Tool
+from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
+from strands.types.collections import PaginatedList
+
+from invoke_mcp_tools import get_full_tools_list, iter_tools_pipelined
+from tool_catalogue_cache import ToolCatalogueCache
+
+SERVER_URL = "https://gateway.example.com/mcp"
+
+
+class FakePagedMCPClient:
+    """Stands in for strands MCPClient.list_tools_sync against a large gateway."""
+
+    def __init__(self, tool_count: int, page_size: int, page_latency: float):
+        self.tools = [
+            Tool(
+                name=f"target{i // 10}___tool_{i}",
+                description=f"Fake Lambda-backed tool number {i}",
+                inputSchema={"type": "object", "properties": {"a": {"type": "integer"}}, "required": ["a"]},
+            )
+            for i in range(tool_count)
+        ]
+        self.page_size = page_size
+        self.page_latency = page_latency
+        self.pages_served = 0
+
+    def list_tools_sync(self, pagination_token: str | None = None) -> PaginatedList[MCPAgentTool]:
+        time.sleep(self.page_latency)
+        self.pages_served += 1
+        start = int(pagination_token or 0)
+        end = start + self.page_size
+        page = [MCPAgentTool(tool, self) for tool in self.tools[start:end]]
+        return PaginatedList(page, token=str(end) if end < len(self.tools) else None)
+
+
+def timed(label: str, client: FakePagedMCPClient, **kwargs) -> None:
+    client.pages_served = 0
+    start = time.perf_counter()
+    tools = get_full_tools_list(client, **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<34}{elapsed:>10.1f}{client.pages_served:>8}{len(tools):>8}")
+
+
+def timed_consumer(label: str, list_tools, work_per_tool: float) -> None:
+    """Consume tools with some per-tool work, reporting time to first tool and total."""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in list_tools():
+        if first is None:
+            first = (time.perf_counter() - start) * 1000
+        time.sleep(work_per_tool)
+        count += 1
+    total = (time.perf_counter() - start) * 1000
+    print(f"{label:<34}{first:>10.1f}{total:>10.1f}{count:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tool catalogue cache")
+    parser.add_argument("--tools", type=int, default=1000, help="Tools served by the fake server")
+    parser.add_argument("--page-size", type=int, default=50, help="Tools per tools/list page")
+    parser.add_argument("--page-latency-ms", type=float, default=25, help="Simulated round-trip per page")
+    parser.add_argument("--work-per-tool-ms", type=float, default=0.5, help="Caller work per tool when streaming")
+    args = parser.parse_args()
+
+    client = FakePagedMCPClient(args.tools, args.page_size, args.page_latency_ms / 1000)
+    now = [time.time()]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ToolCatalogueCache(cache_dir, ttl=timedelta(minutes=10), clock=lambda: now[0])
+
+        print(f"{'scenario':<34}{'ms':>10}{'pages':>8}{'tools':>8}")
+        print("=" * 60)
+        timed("no cache", client)
+        timed("cold cache (fills it)", client, cache=cache, server_url=SERVER_URL)
+        timed("warm cache (within TTL)", client, cache=cache, server_url=SERVER_URL)
+
+        now[0] += 11 * 60
+        timed("expired, unchanged (revalidate)", client, cache=cache, server_url=SERVER_URL)
+
+        now[0] += 11 * 60
+        client.tools[0] = client.tools[0].model_copy(update={"description": "changed"})
+        timed("expired, changed (refetch)", client, cache=cache, server_url=SERVER_URL)
+
+        now[0] += 2 * 24 * 60 * 60
+        timed("past max_age (refetch)", client, cache=cache, server_url=SERVER_URL)
+
+    work = args.work_per_tool_ms / 1000
+    print(f"\n{'streaming (no cache)':<34}{'first ms':>10}{'total ms':>10}{'tools':>8}")
+    print("=" * 62)
+    timed_consumer("list all pages, then consume", lambda: get_full_tools_list(client), work)
+    timed_consumer("pipelined prefetch", lambda: iter_tools_pipelined(client), work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Throughput scaling benchmark for mcp_workers.py.
+
+Starts a stateless FastMCP server under mcp_workers.py with 1, 2, 4, ... worker
+processes (up to the core count), waits for its /ready probe, then drives tools/call
+traffic from several client processes through the real streamable HTTP client (one
+asyncio client process saturates a core long before the server does). Reports
+requests per second and p50/p95/p99 latency per worker count.
+
+Client and server share the machine, so the speed-up flattens once clients and
+workers together use every core; run the clients elsewhere for cleaner numbers.
+
+Usage:
+  python benchmark_workers.py --server sigv4 --client-processes 4 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from benchmark_mcp_servers import HERE, REPO_ROOT, TOOL_CALLS, free_port, percentiles, run_load
+
+# name -> (directory, module:app)
+SERVERS = {
+    "sigv4": (HERE, "mcp_server:app"),
+    "me": (REPO_ROOT / "agentcore" / "me" / "mcp-server", "my_mcp_server:app"),
+}
+
+
+def start_workers(server: str, workers: int) -> tuple[subprocess.Popen, str]:
+    """Launch mcp_workers.py and wait until /ready answers."""
+    directory, app = SERVERS[server]
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "mcp_workers.py", "--app", app, "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"mcp_workers.py exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=1).status_code == 200:
+                return process, f"{base_url}/mcp"
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("mcp_workers.py did not become ready")
+
+
+def client_process(url: str, concurrency: int, requests: int, tool_call: tuple[str, dict]) -> tuple[list[float], int, float]:
+    latencies, errors, elapsed = asyncio.run(run_load(url, concurrency, requests, 0.0, tool_call))
+    return latencies["tools/call"], errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark throughput against the number of server workers")
+    parser.add_argument("--server", choices=SERVERS, default="sigv4", help="Server to launch under mcp_workers.py")
+    parser.add_argument(
+        "--workers", default=None, help="Comma-separated worker counts (default: powers of two up to the core count)"
+    )
+    parser.add_argument("--client-processes", type=int, default=4, help="Load-generating processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent sessions per client process")
+    parser.add_argument("--requests", type=int, default=50, help="tools/call requests per session")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(count) for count in args.workers.split(",")]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cores:
+            worker_counts.append(worker_counts[-1] * 2)
+
+    tool_call = TOOL_CALLS[args.server]
+    print(
+        f"{args.server}: {cores} cores, {args.client_processes} client processes x "
+        f"{args.concurrency} sessions x {args.requests} tools/call\n"
+    )
+    print(f"{'workers':>8}{'n':>8}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'speed-up':>10}")
+    print("=" * 71)
+
+    baseline = None
+    for workers in worker_counts:
+        process, url = start_workers(args.server, workers)
+        try:
+            with ProcessPoolExecutor(args.client_processes) as pool:
+                futures = [
+                    pool.submit(client_process, url, args.concurrency, args.requests, tool_call)
+                    for _ in range(args.client_processes)
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+        latencies = [latency for result in results for latency in result[0]]
+        errors = sum(result[1] for result in results)
+        rate = sum(len(result[0]) / result[2] for result in results)
+        baseline = baseline or rate
+        p50, p95, p99 = percentiles(latencies)
+        print(
+            f"{workers:>8}{len(latencies):>8}{errors:>8}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}"
+            f"{rate:>10.0f}{rate / baseline:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
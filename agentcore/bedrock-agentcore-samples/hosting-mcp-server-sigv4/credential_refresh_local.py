@@ -0,0 +1,194 @@
+"""
+Check RefreshableCredentialProvider against a fake clock and a fake credential source.
+
+The source hands out numbered credentials that expire an hour after they were
+issued (by the fake clock), can be made slow to show overlapping callers, and can
+be made to fail. Nothing talks to AWS. The checks:
+
+  - outside the advisory window, no refresh happens
+  - inside the advisory window, callers keep the current credentials without
+    waiting while one background thread fetches the next set
+  - 32 concurrent callers inside the advisory window start one fetch, and inside
+    the mandatory window they block on one inline fetch
+  - a failing background fetch keeps the current credentials and is not retried
+    before retry_interval; a failing mandatory fetch raises to the caller
+  - credential_expiry() reads a botocore RefreshableCredentials' expiry through its
+    public refresh_needed()
+
+Usage:
+  python credential_refresh_local.py
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from botocore.credentials import RefreshableCredentials, ReadOnlyCredentials
+
+from streamable_http_sigv4 import RefreshableCredentialProvider, credential_expiry
+
+LIFETIME = timedelta(hours=1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2025, 8, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+    def advance_to(self, when):
+        self.now = when
+
+
+class FakeSource:
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+        self.delay = 0.0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("credential source unavailable")
+        return ReadOnlyCredentials(f"AKID{number}", "secret", "token"), self.clock() + LIFETIME
+
+
+def new_provider():
+    clock = FakeClock()
+    source = FakeSource(clock)
+    provider = RefreshableCredentialProvider(
+        source,
+        advisory_refresh=timedelta(minutes=15),
+        mandatory_refresh=timedelta(minutes=2),
+        retry_interval=timedelta(seconds=30),
+        clock=clock,
+    )
+    return provider, source, clock
+
+
+def show(label, detail):
+    print(f"{label:<30}{detail}")
+
+
+def hammer(provider, callers=32):
+    """Call get_frozen_credentials() from many threads at once; returns their access keys."""
+    start_line = threading.Barrier(callers)
+    keys = [None] * callers
+
+    def call(index):
+        start_line.wait()
+        keys[index] = provider.get_frozen_credentials().access_key
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return keys
+
+
+def wait_for_refresh(provider):
+    thread = provider._refresh_thread
+    if thread is not None:
+        thread.join()
+
+
+def check_refresh_ahead():
+    provider, source, clock = new_provider()
+    first_expiry = provider.expiry
+    clock.advance_to(first_expiry - timedelta(minutes=30))
+    assert provider.get_frozen_credentials().access_key == "AKID1" and source.calls == 1
+
+    clock.advance_to(first_expiry - timedelta(minutes=10))
+    source.delay = 0.2
+    started = time.perf_counter()
+    key = provider.get_frozen_credentials().access_key
+    waited = time.perf_counter() - started
+    assert key == "AKID1" and waited < 0.1, "the caller waited for the refresh"
+    wait_for_refresh(provider)
+    assert provider.get_frozen_credentials().access_key == "AKID2" and provider.expiry > first_expiry
+    show("advisory window:", f"served AKID1 in {waited * 1000:.1f} ms, AKID2 fetched in the background")
+    provider.close()
+
+
+def check_single_flight():
+    provider, source, clock = new_provider()
+    source.delay = 0.2
+    clock.advance_to(provider.expiry - timedelta(minutes=10))
+    keys = hammer(provider)
+    wait_for_refresh(provider)
+    assert set(keys) == {"AKID1"} and source.calls == 2, (keys, source.calls)
+    show("32 callers, advisory:", f"all served AKID1, {source.calls - 1} background fetch")
+
+    clock.advance_to(provider.expiry - timedelta(minutes=1))
+    keys = hammer(provider)
+    assert set(keys) == {"AKID3"} and source.calls == 3, (keys, source.calls)
+    show("32 callers, mandatory:", f"all served AKID3, {source.calls - 2} inline fetch")
+    provider.close()
+
+
+def check_source_failing():
+    provider, source, clock = new_provider()
+    source.fail = True
+    clock.advance_to(provider.expiry - timedelta(minutes=10))
+    assert provider.get_frozen_credentials().access_key == "AKID1"
+    wait_for_refresh(provider)
+    assert provider.get_frozen_credentials().access_key == "AKID1" and source.calls == 2
+    show("background fetch fails:", "kept AKID1, no retry within retry_interval")
+
+    clock.advance_to(clock.now + timedelta(seconds=31))
+    provider.get_frozen_credentials()
+    wait_for_refresh(provider)
+    assert source.calls == 3
+    show("after retry_interval:", "retried once")
+
+    clock.advance_to(provider.expiry - timedelta(minutes=1))
+    try:
+        provider.get_frozen_credentials()
+    except RuntimeError as error:
+        show("mandatory fetch fails:", f"raised {error!r}")
+    else:
+        raise AssertionError("credentials about to expire were served after a failed refresh")
+
+    source.fail = False
+    assert provider.get_frozen_credentials().access_key == "AKID5"
+    show("source recovers:", "next call refreshed to AKID5")
+    provider.close()
+
+
+def check_botocore_expiry():
+    now = datetime.now(timezone.utc)
+    for lifetime in (timedelta(minutes=5), timedelta(hours=1), timedelta(hours=12)):
+        credentials = RefreshableCredentials.create_from_metadata(
+            {
+                "access_key": "AKID",
+                "secret_key": "secret",
+                "token": "token",
+                "expiry_time": (now + lifetime).isoformat(),
+            },
+            refresh_using=lambda: None,
+            method="fake",
+        )
+        expiry = credential_expiry(credentials, datetime.now(timezone.utc))
+        assert abs((expiry - (now + lifetime)).total_seconds()) <= 2, (lifetime, expiry)
+        show(f"botocore expiry in {lifetime}:", f"read as {expiry.isoformat(timespec='seconds')}")
+
+
+def main():
+    # The failure checks log expected "Background credential refresh failed" warnings
+    logging.getLogger("streamable_http_sigv4").setLevel(logging.ERROR)
+    check_refresh_ahead()
+    check_single_flight()
+    check_source_failing()
+    check_botocore_expiry()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,16 @@ import asyncio
 import sys
 import os
 import logging
+import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 from boto3.session import Session
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import Tool
 from streamable_http_sigv4 import streamablehttp_client_with_sigv4
+from tool_catalogue_cache import ToolCatalogueCache, page_digest
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -39,46 +44,123 @@ def create_streamable_http_transport_sigv4(
         ...     region="us-west-2"
         ... )
     """
-    # Get AWS credentials from the current boto3 session
-    # These credentials will be used to sign requests with SigV4
-    session = boto3.Session()
-    credentials = session.get_credentials()
-
-    # Create and return the custom transport with SigV4 signing capability
+    # Create and return the custom transport with SigV4 signing capability.
+    # With credentials=None the transport builds a RefreshableCredentialProvider
+    # over the current boto3 session when it is entered (renewed in the background
+    # so long sessions keep working) and closes it, with its refresh timer, on exit
     return streamablehttp_client_with_sigv4(
         url=mcp_url,
-        credentials=credentials,
+        credentials=None,
         service=service_name,
         region=region,
     )
 
 
-def get_full_tools_list(client):
+class ToolPage(list):
+    """One tools/list page of mcp.types.Tool, with the cursor for the next page (None on the last)."""
+
+    def __init__(self, tools: list[Tool], pagination_token: str | None = None):
+        super().__init__(tools)
+        self.pagination_token = pagination_token
+
+
+def _mcp_tool(tool) -> Tool:
+    # A strands MCPAgentTool wraps the mcp.types.Tool; SessionToolClient pages hold it directly
+    return getattr(tool, "mcp_tool", tool)
+
+
+def _serialize_tool(tool) -> dict:
+    return {
+        "name": getattr(tool, "tool_name", None) or _mcp_tool(tool).name,
+        "tool": _mcp_tool(tool).model_dump(mode="json", exclude_none=True),
+    }
+
+
+def _deserialize_tools(client, cached_tools: list[dict]) -> list:
+    if isinstance(client, SessionToolClient):
+        return [Tool.model_validate(item["tool"]) for item in cached_tools]
+
+    # Only a strands MCPClient gets strands tools back, so strands is imported here
+    from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
+
+    return [
+        MCPAgentTool(Tool.model_validate(item["tool"]), client, name_override=item["name"])
+        for item in cached_tools
+    ]
+
+
+class SessionToolClient:
+    """
+    Present an async ClientSession as the list_tools_sync() client get_full_tools_list expects.
+
+    Scripts that drive a ClientSession directly (so they can install the cache's
+    list_changed_handler) call get_full_tools_list from a worker thread with this
+    wrapper; each page is requested on the session's event loop. Pages are
+    ToolPage lists of plain mcp.types.Tool, so no strands install is needed.
+
+    Example:
+        >>> client = SessionToolClient(session, asyncio.get_running_loop())
+        >>> tools = await asyncio.to_thread(get_full_tools_list, client, cache, mcp_url)
+    """
+
+    def __init__(self, session: ClientSession, loop: asyncio.AbstractEventLoop):
+        self.session = session
+        self.loop = loop
+
+    def list_tools_sync(self, pagination_token: str | None = None) -> ToolPage:
+        result = asyncio.run_coroutine_threadsafe(self.session.list_tools(cursor=pagination_token), self.loop).result()
+        return ToolPage(result.tools, result.nextCursor)
+
+
+def get_full_tools_list(client, cache: ToolCatalogueCache | None = None, server_url: str | None = None):
     """
     Retrieve the complete list of tools from an MCP client, handling pagination.
 
     MCP servers may return tools in paginated responses. This function handles the
     pagination automatically and returns all available tools in a single list.
 
+    With a ToolCatalogueCache, the catalogue for server_url is read from local disk
+    while it is within the TTL. After that, only the first page is re-fetched; if it
+    is unchanged the cached catalogue is reused, otherwise (or once the cache's
+    max_age has passed) every page is fetched again.
+
     Args:
-        client: An MCP client instance (from strands.tools.mcp.mcp_client.MCPClient)
+        client: An MCP client instance (from strands.tools.mcp.mcp_client.MCPClient,
+            or a SessionToolClient)
+        cache: Optional on-disk tool catalogue cache
+        server_url: The MCP server URL, used as the cache key (required with cache)
 
     Returns:
-        list: A complete list of all tools available from the MCP server
+        list: A complete list of all tools available from the MCP server (MCPAgentTool
+            for a strands MCPClient, mcp.types.Tool for a SessionToolClient)
 
     Example:
         >>> mcp_client = MCPClient(lambda: create_transport())
-        >>> all_tools = get_full_tools_list(mcp_client)
+        >>> all_tools = get_full_tools_list(mcp_client, ToolCatalogueCache(), mcp_url)
         >>> print(f"Found {len(all_tools)} tools")
     """
+    entry = cache.load(server_url) if cache else None
+    if entry and cache.is_fresh(entry):
+        logger.info("Loaded %d tools for %s from the local catalogue", len(entry["tools"]), server_url)
+        return _deserialize_tools(client, entry["tools"])
+
     more_tools = True
     tools = []
     pagination_token = None
+    first_page_digest = None
 
     # Loop until we've fetched all pages
     while more_tools:
         tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
 
+        if first_page_digest is None:
+            first_page_digest = page_digest([_mcp_tool(t) for t in tmp_tools], tmp_tools.pagination_token)
+            # Same first page as the cached catalogue: revalidate it instead of paging on
+            if entry and cache.can_revalidate(entry) and entry["first_page_digest"] == first_page_digest:
+                cache.touch(server_url, entry)
+                logger.info("Revalidated cached catalogue of %d tools for %s", len(entry["tools"]), server_url)
+                return _deserialize_tools(client, entry["tools"])
+
         tools.extend(tmp_tools)
 
         # Check if there are more pages to fetch
@@ -90,9 +172,138 @@ def get_full_tools_list(client):
             more_tools = True
             pagination_token = tmp_tools.pagination_token
 
+    if cache:
+        cache.store(server_url, [_serialize_tool(t) for t in tools], first_page_digest)
+
     return tools
 
 
+def iter_tools_pipelined(client) -> Iterator:
+    """
+    Stream tools from a paginated MCP server, prefetching the next page.
+
+    As soon as a page arrives, the request for the next page is sent from a
+    background thread before that page's tools are yielded. Fetching page N+1
+    therefore overlaps with the caller's handling of page N, and the caller can
+    start building agents from the first tools while later pages are in flight.
+
+    Args:
+        client: An MCP client instance (from strands.tools.mcp.mcp_client.MCPClient)
+
+    Yields:
+        Each tool, in server order
+
+    Example:
+        >>> for tool in iter_tools_pipelined(mcp_client):
+        ...     registry.register(tool)
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-tools-prefetch")
+    try:
+        future = executor.submit(client.list_tools_sync, pagination_token=None)
+        while future is not None:
+            page = future.result()
+            # Put the next page in flight before handing this one to the caller
+            future = (
+                executor.submit(client.list_tools_sync, pagination_token=page.pagination_token)
+                if page.pagination_token is not None
+                else None
+            )
+            yield from page
+    finally:
+        # The caller may stop early; don't wait on a prefetch nobody will read
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def stream_tool_call(
+    session: ClientSession, name: str, arguments: dict
+) -> AsyncIterator[dict]:
+    """
+    Call an MCP tool and yield its output as it becomes available.
+
+    Progress notifications sent by the server while the tool runs are yielded as
+    soon as they arrive, then each content block of the result is yielded in turn,
+    so callers can start acting on the output without waiting to collect it all.
+    Every event carries `elapsed` seconds since the call was sent; the final "done"
+    event carries time-to-first-byte (first progress or content event) and total time.
+
+    Args:
+        session: An initialized MCP ClientSession
+        name: Tool name
+        arguments: Tool arguments
+
+    Yields:
+        dict events:
+            {"type": "progress", "progress", "total", "message", "elapsed"}
+            {"type": "content", "index", "block", "elapsed"}
+            {"type": "done", "is_error", "structured", "ttfb", "elapsed"}
+
+    Example:
+        >>> async for event in stream_tool_call(session, "greet_user", {"name": "Alice"}):
+        ...     if event["type"] == "content":
+        ...         print(event["block"].text)
+    """
+    start = time.perf_counter()
+    ttfb = None
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        await events.put({"type": "progress", "progress": progress, "total": total, "message": message})
+
+    call = asyncio.ensure_future(
+        session.call_tool(name=name, arguments=arguments, progress_callback=on_progress)
+    )
+    try:
+        # Relay progress notifications until the call completes
+        while not call.done():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({call, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                continue
+            event = next_event.result()
+            event["elapsed"] = time.perf_counter() - start
+            ttfb = ttfb if ttfb is not None else event["elapsed"]
+            yield event
+
+        while not events.empty():
+            event = events.get_nowait()
+            event["elapsed"] = time.perf_counter() - start
+            ttfb = ttfb if ttfb is not None else event["elapsed"]
+            yield event
+
+        result = call.result()
+        for index, block in enumerate(result.content):
+            elapsed = time.perf_counter() - start
+            ttfb = ttfb if ttfb is not None else elapsed
+            yield {"type": "content", "index": index, "block": block, "elapsed": elapsed}
+
+        elapsed = time.perf_counter() - start
+        yield {
+            "type": "done",
+            "is_error": result.isError,
+            "structured": result.structuredContent,
+            "ttfb": ttfb if ttfb is not None else elapsed,
+            "elapsed": elapsed,
+        }
+    finally:
+        # The caller may stop iterating early; don't leave the call running
+        if not call.done():
+            call.cancel()
+
+
+async def print_streamed_tool_call(session: ClientSession, name: str, arguments: dict) -> None:
+    """Print a tool call's progress and content blocks as they arrive, with timings."""
+    async for event in stream_tool_call(session, name, arguments):
+        if event["type"] == "progress":
+            total = f"/{event['total']}" if event["total"] is not None else ""
+            print(f"   ⏳ {event['progress']}{total} {event['message'] or ''}")
+        elif event["type"] == "content":
+            text = getattr(event["block"], "text", None)
+            print(f"   Result: {text if text is not None else event['block']}")
+        else:
+            print(f"   TTFB: {event['ttfb'] * 1000:.0f} ms, total: {event['elapsed'] * 1000:.0f} ms")
+
+
 async def main():
     boto_session = Session()
     region = boto_session.region_name
@@ -113,6 +324,10 @@ async def main():
     encoded_arn = agent_arn.replace(":", "%3A").replace("/", "%2F")
     mcp_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
 
+    # One catalogue cache: it serves the tool list, and the session's handler drops
+    # its entry if the server says its tools changed
+    catalogue = ToolCatalogueCache()
+
     try:
         async with create_streamable_http_transport_sigv4(
                 mcp_url=mcp_url, service_name="bedrock-agentcore", region=region
@@ -121,17 +336,26 @@ async def main():
             write_stream,
             _,
         ):
-            async with ClientSession(read_stream, write_stream) as session:
+            async with ClientSession(
+                read_stream,
+                write_stream,
+                message_handler=catalogue.list_changed_handler(mcp_url),
+            ) as session:
                 print("\n🔄 Initializing MCP session...")
                 await session.initialize()
                 print("✓ MCP session initialized")
 
                 print("\n🔄 Listing available tools...")
-                tool_result = await session.list_tools()
+                tools = await asyncio.to_thread(
+                    get_full_tools_list,
+                    SessionToolClient(session, asyncio.get_running_loop()),
+                    catalogue,
+                    mcp_url,
+                )
 
                 print("\n📋 Available MCP Tools:")
                 print("=" * 50)
-                for tool in tool_result.tools:
+                for tool in tools:
                     print(f"🔧 {tool.name}: {tool.description}")
 
                 print("\n🧪 Testing MCP Tools:")
@@ -139,28 +363,19 @@ async def main():
 
                 try:
                     print("\n➕ Testing add_numbers(5, 3)...")
-                    add_result = await session.call_tool(
-                        name="add_numbers", arguments={"a": 5, "b": 3}
-                    )
-                    print(f"   Result: {add_result.content[0].text}")
+                    await print_streamed_tool_call(session, "add_numbers", {"a": 5, "b": 3})
                 except Exception as e:
                     print(f"   Error: {e}")
 
                 try:
                     print("\n✖️  Testing multiply_numbers(4, 7)...")
-                    multiply_result = await session.call_tool(
-                        name="multiply_numbers", arguments={"a": 4, "b": 7}
-                    )
-                    print(f"   Result: {multiply_result.content[0].text}")
+                    await print_streamed_tool_call(session, "multiply_numbers", {"a": 4, "b": 7})
                 except Exception as e:
                     print(f"   Error: {e}")
 
                 try:
                     print("\n👋 Testing greet_user('Alice')...")
-                    greet_result = await session.call_tool(
-                        name="greet_user", arguments={"name": "Alice"}
-                    )
-                    print(f"   Result: {greet_result.content[0].text}")
+                    await print_streamed_tool_call(session, "greet_user", {"name": "Alice"})
                 except Exception as e:
                     print(f"   Error: {e}")
 
@@ -0,0 +1,170 @@
+"""
+JSON-RPC batch support for FastMCP's streamable HTTP app.
+
+The MCP SDK's streamable HTTP transport only accepts a single JSON-RPC object per
+POST. JsonRpcBatchMiddleware wraps the ASGI app: when a POST body is a JSON array,
+every element is replayed concurrently as its own request through the wrapped app,
+the JSON or SSE replies are collected, and the responses go back as one JSON array
+(the JSON-RPC 2.0 batch format). Everything else passes straight through.
+
+This lets clients sign one request for many tools/call messages, e.g.
+AgentCoreMcpRpcClient.jsonrpc_batch_call().
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import anyio
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def parse_jsonrpc_body(content_type: str, body: bytes) -> list[dict]:
+    """Return every JSON-RPC message in a JSON or SSE body.
+
+    Shared by the batch middleware (replies captured from the wrapped app) and
+    agentcore_mcp_rpc_client.parse_jsonrpc_messages (HTTP responses).
+    """
+    if not body:
+        return []
+    if not content_type.startswith("text/event-stream"):
+        payload = json.loads(body)
+        return payload if isinstance(payload, list) else [payload]
+
+    # SSE: an event's data lines are joined with newlines and end at a blank line
+    messages, data_lines = [], []
+    for line in body.decode().splitlines() + [""]:
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+        elif not line and data_lines:
+            payload = json.loads("\n".join(data_lines))
+            messages.extend(payload if isinstance(payload, list) else [payload])
+            data_lines = []
+    return messages
+
+
+class JsonRpcBatchMiddleware:
+    """ASGI middleware that fans JSON-RPC batch POSTs out to the wrapped MCP app."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        if not body.lstrip().startswith(b"["):
+            await self.app(scope, self._replay(body, receive), send)
+            return
+
+        try:
+            batch = json.loads(body)
+        except json.JSONDecodeError as e:
+            await self._send_json(send, 400, self._error(None, -32700, f"Parse error: {e}"))
+            return
+        if not batch:
+            await self._send_json(send, 400, self._error(None, -32600, "Invalid Request: empty batch"))
+            return
+
+        results: list[list[dict] | None] = [None] * len(batch)
+        session_id: str | None = None
+
+        async def dispatch(index: int, item: Any) -> None:
+            nonlocal session_id
+            if not isinstance(item, dict):
+                results[index] = [self._error(None, -32600, "Invalid Request: not an object")]
+                return
+            status, headers, reply = await self._call_one(scope, json.dumps(item).encode())
+            session_id = session_id or headers.get("mcp-session-id")
+            # Notifications and responses are acknowledged with 202 and no body
+            if status == 202 or "id" not in item:
+                results[index] = []
+                return
+            try:
+                results[index] = parse_jsonrpc_body(headers.get("content-type", ""), reply)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                results[index] = [self._error(item.get("id"), -32603, f"HTTP {status}: {reply[:200]!r}")]
+            if not results[index]:
+                results[index] = [self._error(item.get("id"), -32603, f"HTTP {status} with no response")]
+
+        async with anyio.create_task_group() as tg:
+            for index, item in enumerate(batch):
+                tg.start_soon(dispatch, index, item)
+
+        responses = [
+            message
+            for messages in results
+            for message in messages or []
+            if "id" in message and ("result" in message or "error" in message)
+        ]
+        if not responses:
+            await self._send_json(send, 202, None, session_id)
+            return
+        await self._send_json(send, 200, responses, session_id)
+
+    async def _call_one(self, scope: Scope, body: bytes) -> tuple[int, dict[str, str], bytes]:
+        """Run one JSON-RPC message through the wrapped app and capture its reply."""
+        headers = [(k, v) for k, v in scope["headers"] if k != b"content-length"]
+        headers.append((b"content-length", str(len(body)).encode()))
+        sub_scope = dict(scope, headers=headers)
+
+        status = 500
+        response_headers: dict[str, str] = {}
+        chunks: list[bytes] = []
+        done = anyio.Event()
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.update(
+                    (k.decode().lower(), v.decode()) for k, v in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        async def wait_for_reply() -> Message:
+            # SSE responses watch for a disconnect; only report one once the reply is done
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        await self.app(sub_scope, self._replay(body, wait_for_reply), capture)
+        return status, response_headers, b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, then: Receive) -> Receive:
+        """Receive callable that yields the already-read body, then defers to `then`."""
+        sent = False
+
+        async def receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await then()
+
+        return receive
+
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> dict:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    @staticmethod
+    async def _send_json(send: Send, status: int, payload: Any, session_id: str | None = None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if session_id:
+            headers.append((b"mcp-session-id", session_id.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -9,50 +9,14 @@ Usage:
 Requirements:
   - Your AWS credentials (profile/SSO/ENV) must be able to InvokeRuntime.
   - httpx, boto3, botocore installed (already in this project).
+  - Requests go through AgentCoreMcpRpcClient (agentcore_mcp_rpc_client.py).
 """
 
 from __future__ import annotations
 
 import argparse
-import json
-import urllib.parse
 
-import boto3
-import httpx
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-
-
-def sign_request(url: str, region: str, payload: str, extra_headers: dict[str, str] | None = None):
-    """Sign the request for bedrock-agentcore Invocations with SigV4."""
-    # Accept must include both JSON and SSE for MCP compatibility.
-    base_headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json, text/event-stream",
-    }
-    if extra_headers:
-        base_headers.update(extra_headers)
-
-    creds = boto3.Session().get_credentials().get_frozen_credentials()
-    req = AWSRequest(method="POST", url=url, data=payload, headers=base_headers)
-    SigV4Auth(creds, "bedrock-agentcore", region).add_auth(req)
-    return req
-
-
-def post_signed(url: str, region: str, payload: dict, extra_headers: dict[str, str] | None = None) -> httpx.Response:
-    signed = sign_request(url, region, json.dumps(payload), extra_headers)
-    with httpx.Client() as client:
-        return client.post(url, headers=dict(signed.headers), content=signed.body)
-
-
-def create_session(url: str, region: str) -> httpx.Response:
-    payload = {"jsonrpc": "2.0", "id": 1, "method": "sessions/create", "params": {"protocolVersion": "2025-06-18"}}
-    return post_signed(url, region, payload)
-
-
-def list_tools(url: str, region: str, session_id: str) -> httpx.Response:
-    payload = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
-    return post_signed(url, region, payload, extra_headers={"Mcp-Session-Id": session_id})
+from agentcore_mcp_rpc_client import AgentCoreMcpRpcClient, runtime_invocation_url
 
 
 def main():
@@ -62,28 +26,28 @@ def main():
     parser.add_argument("--qualifier", default="DEFAULT", help="Qualifier/version (default: DEFAULT)")
     args = parser.parse_args()
 
-    encoded = urllib.parse.quote(args.runtime_arn, safe="")
-    url = f"https://bedrock-agentcore.{args.region}.amazonaws.com/runtimes/{encoded}/invocations?qualifier={args.qualifier}"
-
-    # 1) Create session
-    print(f"Creating session to {url}")
-    resp = create_session(url, args.region)
-    print("Session status:", resp.status_code)
-    print("Request ID:", resp.headers.get("x-amzn-requestid"))
-    session_id = resp.headers.get("mcp-session-id")
-    print("MCP Session ID:", session_id)
-    print("Body:", resp.text or repr(resp.content))
-
-    if resp.status_code != 200 or not session_id:
-        print("Failed to create session; aborting.")
-        return
-
-    # 2) List tools
-    print("\nListing tools...")
-    resp2 = list_tools(url, args.region, session_id)
-    print("List status:", resp2.status_code)
-    print("Request ID:", resp2.headers.get("x-amzn-requestid"))
-    print("Body:", resp2.text or repr(resp2.content))
+    url = runtime_invocation_url(args.region, args.runtime_arn, args.qualifier)
+
+    # One pooled client (and one credential lookup) for both requests
+    with AgentCoreMcpRpcClient(url, args.region) as client:
+        # 1) Create session
+        print(f"Creating session to {url}")
+        resp = client.create_session()
+        print("Session status:", resp.status_code)
+        print("Request ID:", resp.headers.get("x-amzn-requestid"))
+        print("MCP Session ID:", client.session_id)
+        print("Body:", resp.text or repr(resp.content))
+
+        if resp.status_code != 200 or not client.session_id:
+            print("Failed to create session; aborting.")
+            return
+
+        # 2) List tools
+        print("\nListing tools...")
+        resp2 = client.list_tools()
+        print("List status:", resp2.status_code)
+        print("Request ID:", resp2.headers.get("x-amzn-requestid"))
+        print("Body:", resp2.text or repr(resp2.content))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Local check that mcp_server.py answers JSON-RPC batch requests.
+
+Starts the server app (with JsonRpcBatchMiddleware) in a background thread, then
+POSTs one batch containing several tools/call requests plus a notification, and
+checks that every request id comes back with the right result in a single reply.
+No AWS access is needed.
+
+Usage:
+  python mcp_client_local_batch.py --port 8765
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from agentcore_mcp_rpc_client import match_responses, parse_jsonrpc_messages
+from mcp_server import app
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+}
+
+
+def start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check JSON-RPC batch handling of mcp_server.py")
+    parser.add_argument("--port", type=int, default=8765, help="Local port for the test server")
+    args = parser.parse_args()
+
+    server = start_server(args.port)
+    url = f"http://127.0.0.1:{args.port}/mcp"
+
+    batch = [
+        {"jsonrpc": "2.0", "id": 10, "method": "tools/call", "params": {"name": "add_numbers", "arguments": {"a": 5, "b": 3}}},
+        {"jsonrpc": "2.0", "id": 11, "method": "tools/call", "params": {"name": "multiply_numbers", "arguments": {"a": 4, "b": 7}}},
+        {"jsonrpc": "2.0", "id": 12, "method": "tools/call", "params": {"name": "greet_user", "arguments": {"name": "Alice"}}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 13, "method": "tools/list"},
+    ]
+    expected = {10: "8", 11: "28", 12: "Hello, Alice! Nice to meet you."}
+
+    failures = 0
+    with httpx.Client(headers=HEADERS, timeout=30) as client:
+        # A plain single request must still work unchanged
+        single = client.post(url, json=batch[0])
+        print("Single request:", single.status_code)
+        failures += single.status_code != 200
+
+        print("\nBatch request with", len(batch), "messages...")
+        resp = client.post(url, json=batch)
+        print("Status:", resp.status_code)
+        responses = match_responses(parse_jsonrpc_messages(resp), [10, 11, 12, 13])
+
+    for request_id, text in expected.items():
+        message = responses[request_id]
+        got = message and message.get("result", {}).get("content", [{}])[0].get("text")
+        status = "✓" if got == text else "✗"
+        failures += got != text
+        print(f"  {status} id={request_id}: {got!r}")
+
+    tools = (responses[13] or {}).get("result", {}).get("tools", [])
+    print(f"  {'✓' if len(tools) == 3 else '✗'} id=13: {len(tools)} tools listed")
+    failures += len(tools) != 3
+
+    server.should_exit = True
+    if failures:
+        print(f"\n❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✅ Batches are handled")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ import boto3
 from boto3.session import Session
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from invoke_mcp_tools import SessionToolClient, get_full_tools_list
 from streamable_http_sigv4 import streamablehttp_client_with_sigv4
+from tool_catalogue_cache import ToolCatalogueCache
 
 
 logging.basicConfig(
@@ -39,60 +41,18 @@ def create_streamable_http_transport_sigv4(
         ...     region="us-west-2"
         ... )
     """
-    # Get AWS credentials from the current boto3 session
-    # These credentials will be used to sign requests with SigV4
-    session = boto3.Session()
-    credentials = session.get_credentials()
-
-    # Create and return the custom transport with SigV4 signing capability
+    # Create and return the custom transport with SigV4 signing capability.
+    # With credentials=None the transport builds a RefreshableCredentialProvider
+    # over the current boto3 session when it is entered (renewed in the background
+    # so long sessions keep working) and closes it, with its refresh timer, on exit
     return streamablehttp_client_with_sigv4(
         url=mcp_url,
-        credentials=credentials,
+        credentials=None,
         service=service_name,
         region=region,
     )
 
 
-def get_full_tools_list(client):
-    """
-    Retrieve the complete list of tools from an MCP client, handling pagination.
-
-    MCP servers may return tools in paginated responses. This function handles the
-    pagination automatically and returns all available tools in a single list.
-
-    Args:
-        client: An MCP client instance (from strands.tools.mcp.mcp_client.MCPClient)
-
-    Returns:
-        list: A complete list of all tools available from the MCP server
-
-    Example:
-        >>> mcp_client = MCPClient(lambda: create_transport())
-        >>> all_tools = get_full_tools_list(mcp_client)
-        >>> print(f"Found {len(all_tools)} tools")
-    """
-    more_tools = True
-    tools = []
-    pagination_token = None
-
-    # Loop until we've fetched all pages
-    while more_tools:
-        tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
-
-        tools.extend(tmp_tools)
-
-        # Check if there are more pages to fetch
-        if tmp_tools.pagination_token is None:
-            # No more pages - we're done
-            more_tools = False
-        else:
-            # More pages exist - prepare to fetch the next one
-            more_tools = True
-            pagination_token = tmp_tools.pagination_token
-
-    return tools
-
-
 async def main():
     boto_session = Session()
     region = boto_session.region_name
@@ -113,6 +73,9 @@ async def main():
     encoded_arn = agent_arn.replace(":", "%3A").replace("/", "%2F")
     mcp_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
 
+    # Tool catalogue shared with invoke_mcp_tools.py (see get_full_tools_list)
+    catalogue = ToolCatalogueCache()
+
     try:
         async with create_streamable_http_transport_sigv4(
             mcp_url=mcp_url, service_name="bedrock-agentcore", region=region
@@ -121,17 +84,26 @@ async def main():
             write_stream,
             _,
         ):
-            async with ClientSession(read_stream, write_stream) as session:
+            async with ClientSession(
+                read_stream,
+                write_stream,
+                message_handler=catalogue.list_changed_handler(mcp_url),
+            ) as session:
                 print("\n🔄 Initializing MCP session...")
                 await session.initialize()
                 print("✓ MCP session initialized")
 
                 print("\n🔄 Listing available tools...")
-                tool_result = await session.list_tools()
+                tools = await asyncio.to_thread(
+                    get_full_tools_list,
+                    SessionToolClient(session, asyncio.get_running_loop()),
+                    catalogue,
+                    mcp_url,
+                )
 
                 print("\n📋 Available MCP Tools:")
                 print("=" * 50)
-                for tool in tool_result.tools:
+                for tool in tools:
                     print(f"🔧 {tool.name}")
                     print(f"   Description: {tool.description}")
                     if hasattr(tool, "inputSchema") and tool.inputSchema:
@@ -141,7 +113,7 @@ async def main():
                     print()
 
                 print(f"✅ Successfully connected to MCP server!")
-                print(f"Found {len(tool_result.tools)} tools available.")
+                print(f"Found {len(tools)} tools available.")
 
     except Exception as e:
         print(f"❌ Error connecting to MCP server: {e}")
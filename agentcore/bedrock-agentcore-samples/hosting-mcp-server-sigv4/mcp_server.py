@@ -1,23 +1,49 @@
+import os
+
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from jsonrpc_batch import JsonRpcBatchMiddleware
+from tool_cache import cache_metrics, cached_tool
+
 # stateless_http=True: Required for AgentCore Runtime compatibility
 mcp = FastMCP(host="0.0.0.0", stateless_http=True)
 
+# The tools are pure, so repeat calls are answered from an LRU (see tool_cache.py)
 @mcp.tool()
+@cached_tool
 def add_numbers(a: int, b: int) -> int:
     """Add two numbers together"""
     return a + b
 
 @mcp.tool()
+@cached_tool
 def multiply_numbers(a: int, b: int) -> int:
     """Multiply two numbers together"""
     return a * b
 
 @mcp.tool()
+@cached_tool
 def greet_user(name: str) -> str:
     """Greet a user by name"""
     return f"Hello, {name}! Nice to meet you."
 
+# Readiness probe for load balancers and mcp_workers.py
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ready", "pid": os.getpid()})
+
+# Tool-result cache counters (per worker process)
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse({"tool_cache": cache_metrics()})
+
+# Same streamable HTTP app as mcp.run(transport="streamable-http"), but also
+# accepts JSON-RPC batch arrays so clients can sign one POST for many calls.
+# Being stateless, it can also be served by several processes: see mcp_workers.py
+app = JsonRpcBatchMiddleware(mcp.streamable_http_app())
+
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http")
+    uvicorn.run(app, host=mcp.settings.host, port=mcp.settings.port)
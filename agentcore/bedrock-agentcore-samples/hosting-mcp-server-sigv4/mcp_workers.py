@@ -0,0 +1,66 @@
+"""
+Run a stateless FastMCP server's streamable HTTP app across several worker processes.
+
+`mcp.run(transport="streamable-http")` serves from a single process, so one busy core
+caps throughput. With stateless_http=True any worker can answer any request (there is
+no per-session state to keep on one process), so the app can be served by several
+uvicorn workers sharing one listening socket:
+
+  - --workers sets the process count (default: MCP_WORKERS or the number of cores)
+  - `kill -HUP <launcher pid>` reloads gracefully: each worker is replaced by a new
+    one, which must be ready before the old one is stopped and finishes its
+    in-flight requests
+  - GET /ready is the readiness probe; it answers 200 with the serving worker's pid
+
+Usage:
+  python mcp_workers.py --app mcp_server:app --workers 4 --port 8000
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import uvicorn
+
+
+def check_stateless(app_path: str) -> None:
+    """Refuse to fan out a stateful server: its sessions would land on random workers."""
+    module_name, _, _ = app_path.partition(":")
+    sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+    mcp = getattr(module, "mcp", None)
+    if mcp is not None and not mcp.settings.stateless_http:
+        raise SystemExit(f"{module_name}.mcp is not stateless_http=True; run it with a single worker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stateless FastMCP app with multiple workers")
+    parser.add_argument("--app", default="mcp_server:app", help="ASGI app as module:attribute")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MCP_WORKERS", os.cpu_count() or 1)),
+        help="Worker processes",
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=30, help="Seconds a stopping worker may finish in-flight requests"
+    )
+    parser.add_argument("--log-level", default="warning", help="uvicorn log level")
+    args = parser.parse_args()
+
+    check_stateless(args.app)
+    uvicorn.run(
+        args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,23 @@ This module extends the MCP StreamableHTTPTransport to add AWS SigV4 request sig
 for authentication with MCP servers that authenticate using AWS IAM.
 """
 
-from collections.abc import AsyncGenerator
+import hashlib
+import hmac
+import logging
+import threading
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Generator
+from urllib.parse import quote
 
+import boto3
 import httpx
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-from botocore.credentials import Credentials
+from botocore.auth import EMPTY_SHA256_HASH, SIGNED_HEADERS_BLACKLIST
+from botocore.credentials import Credentials, ReadOnlyCredentials, RefreshableCredentials
+from botocore.exceptions import NoCredentialsError
+from botocore.utils import normalize_url_path
 from mcp.client.streamable_http import (
     GetSessionIdCallback,
     StreamableHTTPTransport,
@@ -23,44 +30,337 @@ from mcp.client.streamable_http import (
 from mcp.shared._httpx_utils import McpHttpClientFactory, create_mcp_http_client
 from mcp.shared.message import SessionMessage
 
+logger = logging.getLogger(__name__)
 
-class SigV4HTTPXAuth(httpx.Auth):
-    """HTTPX Auth class that signs requests with AWS SigV4."""
+SIGV4_ALGORITHM = "AWS4-HMAC-SHA256"
+SIGV4_TIMESTAMP = "%Y%m%dT%H%M%SZ"
+
+# Bodies are fed to sha256 in slices of this size through a memoryview,
+# so large payloads are hashed incrementally without being copied
+PAYLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Returns fresh frozen credentials plus their expiry (None if they never expire)
+CredentialSource = Callable[[], tuple[ReadOnlyCredentials, datetime | None]]
+
+
+# Longest credential lifetime looked for; anything beyond is treated as not expiring
+MAX_CREDENTIAL_LIFETIME = timedelta(days=7)
+
+
+def credential_expiry(credentials: Credentials, now: datetime) -> datetime | None:
+    """When botocore credentials expire, to the second; None if they do not.
+
+    RefreshableCredentials only exposes its expiry through refresh_needed(seconds),
+    so the remaining lifetime is found by doubling and then bisecting on it.
+    """
+    if not isinstance(credentials, RefreshableCredentials):
+        return None
+    limit = int(MAX_CREDENTIAL_LIFETIME.total_seconds())
+    high = 1
+    while not credentials.refresh_needed(refresh_in=high):
+        if high >= limit:
+            return None
+        high *= 2
+    low = 0
+    # refresh_needed(low) is False (or low == 0) and refresh_needed(high) is True
+    while high - low > 1:
+        middle = (low + high) // 2
+        if credentials.refresh_needed(refresh_in=middle):
+            high = middle
+        else:
+            low = middle
+    return now + timedelta(seconds=low)
+
+
+def boto3_credential_source(session: boto3.Session | None = None) -> CredentialSource:
+    """Build a CredentialSource from a boto3 session's credential chain."""
+    session = session or boto3.Session()
+
+    def fetch() -> tuple[ReadOnlyCredentials, datetime | None]:
+        credentials = session.get_credentials()
+        if credentials is None:
+            raise NoCredentialsError()
+        # get_frozen_credentials() lets botocore refresh STS/SSO credentials first
+        frozen = credentials.get_frozen_credentials()
+        return frozen, credential_expiry(credentials, _utc_now())
+
+    return fetch
+
+
+class RefreshableCredentialProvider:
+    """
+    Serves frozen AWS credentials and renews them in the background before expiry.
+
+    Once the credentials are within ``advisory_refresh`` of expiring, a single
+    background thread fetches new ones while signing keeps using the current set,
+    so a tool call never waits on an STS round-trip. Only when the credentials are
+    within ``mandatory_refresh`` of expiring (e.g. the background fetch kept
+    failing) does get_frozen_credentials() block and refresh inline.
+    """
+
+    def __init__(
+        self,
+        source: CredentialSource | None = None,
+        advisory_refresh: timedelta = timedelta(minutes=15),
+        mandatory_refresh: timedelta = timedelta(minutes=2),
+        retry_interval: timedelta = timedelta(seconds=30),
+        clock: Callable[[], datetime] = _utc_now,
+    ):
+        """Initialize the provider and fetch the first set of credentials.
+
+        Args:
+            source: Callable returning (frozen credentials, expiry). Defaults to the
+                default boto3 session's credential chain.
+            advisory_refresh: Start a background refresh this long before expiry.
+            mandatory_refresh: Refresh inline (blocking) this long before expiry.
+            retry_interval: Minimum gap between background refresh attempts.
+            clock: Returns the current UTC time; overridable for testing.
+        """
+        self.source = source or boto3_credential_source()
+        self.advisory_refresh = advisory_refresh
+        self.mandatory_refresh = mandatory_refresh
+        self.retry_interval = retry_interval
+        self.clock = clock
+
+        # _lock guards the fields below; _fetch_lock serialises calls to source, so
+        # a slow fetch never holds up callers that only need the current credentials
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._credentials: ReadOnlyCredentials | None = None
+        self._expiry: datetime | None = None
+        self._next_attempt: datetime | None = None
+        self._refresh_thread: threading.Thread | None = None
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+        self._refresh()
+
+    @property
+    def expiry(self) -> datetime | None:
+        return self._expiry
+
+    def get_frozen_credentials(self) -> ReadOnlyCredentials:
+        """Return the current credentials, kicking off or forcing a refresh when due."""
+        now = self.clock()
+        expiry = self._expiry
+        if expiry is not None:
+            if now >= expiry - self.mandatory_refresh:
+                with self._fetch_lock:
+                    # Another caller may have refreshed while we waited for the lock
+                    if self._expiry is not None and now >= self._expiry - self.mandatory_refresh:
+                        self._fetch_locked()
+            elif now >= expiry - self.advisory_refresh:
+                self.refresh_in_background()
+        return self._credentials
+
+    def refresh_in_background(self) -> threading.Thread | None:
+        """Start a background refresh unless one is running or was just attempted."""
+        with self._lock:
+            now = self.clock()
+            if self._closed or (self._refresh_thread and self._refresh_thread.is_alive()):
+                return None
+            if self._next_attempt is not None and now < self._next_attempt:
+                return None
+            self._next_attempt = now + self.retry_interval
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="sigv4-credential-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def close(self) -> None:
+        """Stop scheduling background refreshes."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def _background_refresh(self) -> None:
+        try:
+            self._refresh()
+        except Exception:
+            # Keep signing with the current credentials; the next call past the
+            # advisory window retries, and the mandatory window refreshes inline
+            logger.warning("Background credential refresh failed", exc_info=True)
+
+    def _refresh(self) -> None:
+        with self._fetch_lock:
+            self._fetch_locked()
+
+    def _fetch_locked(self) -> None:
+        credentials, expiry = self.source()
+        with self._lock:
+            self._credentials = credentials
+            self._expiry = expiry
+            self._schedule_prefetch()
+        logger.debug("Refreshed AWS credentials, expiry %s", expiry)
+
+    def _schedule_prefetch(self) -> None:
+        """Arm a timer so idle sessions also refresh before the advisory window ends."""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._closed or self._expiry is None:
+            return
+        delay = (self._expiry - self.advisory_refresh - self.clock()).total_seconds()
+        self._timer = threading.Timer(max(delay, 0), self.refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+def payload_sha256(body: bytes) -> str:
+    """Return the hex SHA-256 of a request body, hashing it chunk by chunk."""
+    if not body:
+        return EMPTY_SHA256_HASH
+
+    checksum = hashlib.sha256()
+    view = memoryview(body)
+    for offset in range(0, len(view), PAYLOAD_CHUNK_SIZE):
+        checksum.update(view[offset : offset + PAYLOAD_CHUNK_SIZE])
+    return checksum.hexdigest()
+
+
+class CachedSigV4Signer:
+    """
+    SigV4 signer for httpx requests that caches the derived signing key.
+
+    The date/region/service signing key only changes at UTC midnight or when the
+    credentials rotate, so the four-step HMAC chain runs once per day (or per
+    rotation) instead of once per request. The canonical request is built straight
+    from the httpx request, without an intermediate AWSRequest or header copy.
+    """
 
     def __init__(
         self,
-        credentials: Credentials,
+        credentials: Credentials | RefreshableCredentialProvider,
         service: str,
         region: str,
+        clock: Callable[[], datetime] = _utc_now,
     ):
+        """Initialize the signer.
+
+        Args:
+            credentials: AWS credentials or a RefreshableCredentialProvider.
+            service: AWS service name (e.g., 'bedrock-agentcore').
+            region: AWS region (e.g., 'us-east-1').
+            clock: Returns the current UTC time; overridable for testing.
+        """
         self.credentials = credentials
         self.service = service
         self.region = region
-        self.signer = SigV4Auth(credentials, service, region)
+        self.clock = clock
+        # (date stamp, access key, secret key) -> derived key, replaced as a whole
+        # so concurrent signers never see a half-updated entry
+        self._signing_key: tuple[tuple[str, str, str], bytes] | None = None
 
-    def auth_flow(
-        self, request: httpx.Request
-    ) -> Generator[httpx.Request, httpx.Response, None]:
-        """Signs the request with SigV4 and adds the signature to the request headers."""
+    def signing_key(self, date_stamp: str, access_key: str, secret_key: str) -> bytes:
+        """Return the signing key for the given day, deriving it only on a cache miss."""
+        cache_key = (date_stamp, access_key, secret_key)
+        cached = self._signing_key
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        k_date = hmac.new(
+            f"AWS4{secret_key}".encode(), date_stamp.encode(), hashlib.sha256
+        ).digest()
+        k_region = hmac.new(k_date, self.region.encode(), hashlib.sha256).digest()
+        k_service = hmac.new(k_region, self.service.encode(), hashlib.sha256).digest()
+        k_signing = hmac.new(k_service, b"aws4_request", hashlib.sha256).digest()
+
+        self._signing_key = (cache_key, k_signing)
+        return k_signing
+
+    def sign(self, request: httpx.Request) -> None:
+        """Add X-Amz-Date, X-Amz-Security-Token and Authorization headers in place."""
+        creds = self.credentials.get_frozen_credentials()
+        timestamp = self.clock().strftime(SIGV4_TIMESTAMP)
+        date_stamp = timestamp[:8]
+
+        # This could be a retry, so drop any signature from a previous attempt
+        for name in ("authorization", "x-amz-date", "x-amz-security-token"):
+            request.headers.pop(name, None)
+        request.headers["X-Amz-Date"] = timestamp
+        if creds.token:
+            request.headers["X-Amz-Security-Token"] = creds.token
 
-        # Create an AWS request
-        headers = dict(request.headers)
         # Header 'connection' = 'keep-alive' is not used in calculating the request
-        # signature on the server-side, and results in a signature mismatch if included
-        headers.pop("connection", None)  # Remove if present, ignore if not
+        # signature on the server-side, so it is excluded like other hop-by-hop headers
+        headers_to_sign = {
+            name: " ".join(value.split())
+            for name, value in request.headers.items()
+            if name not in SIGNED_HEADERS_BLACKLIST
+        }
+        if "host" not in headers_to_sign:
+            headers_to_sign["host"] = request.url.netloc.decode("ascii")
+        signed_headers = ";".join(sorted(headers_to_sign))
+        canonical_headers = "".join(
+            f"{name}:{headers_to_sign[name]}\n" for name in sorted(headers_to_sign)
+        )
 
-        aws_request = AWSRequest(
-            method=request.method,
-            url=str(request.url),
-            data=request.content,
-            headers=headers,
+        raw_path = request.url.raw_path.decode("ascii").partition("?")[0]
+        query = request.url.query.decode("ascii")
+        query_pairs = (
+            sorted(pair.partition("=")[::2] for pair in query.split("&")) if query else []
         )
+        canonical_query = "&".join(f"{key}={value}" for key, value in query_pairs)
+
+        canonical_request = "\n".join(
+            [
+                request.method.upper(),
+                quote(normalize_url_path(raw_path), safe="/~"),
+                canonical_query,
+                canonical_headers,
+                signed_headers,
+                payload_sha256(request.content),
+            ]
+        )
+
+        credential_scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                SIGV4_ALGORITHM,
+                timestamp,
+                credential_scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+        signature = hmac.new(
+            self.signing_key(date_stamp, creds.access_key, creds.secret_key),
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        request.headers["Authorization"] = (
+            f"{SIGV4_ALGORITHM} Credential={creds.access_key}/{credential_scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+
+
+class SigV4HTTPXAuth(httpx.Auth):
+    """HTTPX Auth class that signs requests with AWS SigV4."""
 
-        # Sign the request with SigV4
-        self.signer.add_auth(aws_request)
+    requires_request_body = True
 
-        # Add the signature header to the original request
-        request.headers.update(dict(aws_request.headers))
+    def __init__(
+        self,
+        credentials: Credentials | RefreshableCredentialProvider,
+        service: str,
+        region: str,
+    ):
+        self.credentials = credentials
+        self.service = service
+        self.region = region
+        self.signer = CachedSigV4Signer(credentials, service, region)
+
+    def auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        """Signs the request with SigV4 and adds the signature to the request headers."""
+        self.signer.sign(request)
 
         yield request
 
@@ -76,7 +376,7 @@ class StreamableHTTPTransportWithSigV4(StreamableHTTPTransport):
     def __init__(
         self,
         url: str,
-        credentials: Credentials,
+        credentials: Credentials | RefreshableCredentialProvider | None,
         service: str,
         region: str,
         headers: dict[str, str] | None = None,
@@ -87,13 +387,18 @@ class StreamableHTTPTransportWithSigV4(StreamableHTTPTransport):
 
         Args:
             url: The endpoint URL.
-            credentials: AWS credentials for signing.
+            credentials: AWS credentials for signing. Pass a RefreshableCredentialProvider
+                (or None to build one from the default boto3 session) for long-lived
+                sessions that must outlive temporary STS credentials.
             service: AWS service name (e.g., 'lambda').
             region: AWS region (e.g., 'us-east-1').
             headers: Optional headers to include in requests.
             timeout: HTTP timeout for regular operations.
             sse_read_timeout: Timeout for SSE read operations.
         """
+        if credentials is None:
+            credentials = RefreshableCredentialProvider()
+
         # Initialize parent class with SigV4 auth handler
         super().__init__(
             url=url,
@@ -111,7 +416,7 @@ class StreamableHTTPTransportWithSigV4(StreamableHTTPTransport):
 @asynccontextmanager
 async def streamablehttp_client_with_sigv4(
     url: str,
-    credentials: Credentials,
+    credentials: Credentials | RefreshableCredentialProvider | None,
     service: str,
     region: str,
     headers: dict[str, str] | None = None,
@@ -133,6 +438,9 @@ async def streamablehttp_client_with_sigv4(
     This transport enables communication with MCP servers that authenticate using AWS IAM,
     such as servers behind a Lambda function URL or API Gateway.
 
+    If credentials is None, a RefreshableCredentialProvider over the default boto3
+    session is created for the lifetime of the client and closed on exit.
+
     Yields:
         Tuple containing:
             - read_stream: Stream for reading messages from the server
@@ -140,13 +448,21 @@ async def streamablehttp_client_with_sigv4(
             - get_session_id_callback: Function to retrieve the current session ID
     """
 
-    async with streamablehttp_client(
-        url=url,
-        headers=headers,
-        timeout=timeout,
-        sse_read_timeout=sse_read_timeout,
-        terminate_on_close=terminate_on_close,
-        httpx_client_factory=httpx_client_factory,
-        auth=SigV4HTTPXAuth(credentials, service, region),
-    ) as result:
-        yield result
\ No newline at end of file
+    owned_provider = None
+    if credentials is None:
+        credentials = owned_provider = RefreshableCredentialProvider()
+
+    try:
+        async with streamablehttp_client(
+            url=url,
+            headers=headers,
+            timeout=timeout,
+            sse_read_timeout=sse_read_timeout,
+            terminate_on_close=terminate_on_close,
+            httpx_client_factory=httpx_client_factory,
+            auth=SigV4HTTPXAuth(credentials, service, region),
+        ) as result:
+            yield result
+    finally:
+        if owned_provider is not None:
+            owned_provider.close()
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Opt-in result cache for pure FastMCP tools.
+
+A tool that always returns the same result for the same arguments (add_numbers,
+greet_user, or an expensive deterministic lookup) can be decorated with
+@cached_tool. Results are memoized in a bounded LRU keyed on the canonicalised
+arguments: bound to the signature with defaults applied and serialised with sorted
+keys, so add_numbers(a=1, b=2) and add_numbers(b=2, a=1) share an entry.
+
+  - maxsize bounds the number of entries per tool; the least recently used goes first
+  - min_cost (seconds) only stores results that took at least that long to compute,
+    so cheap tools do not churn the cache
+  - exceptions are never cached
+  - hits, misses and sizes for every cached tool are available from cache_metrics(),
+    which mcp_server.py serves on GET /metrics
+
+Put it below @mcp.tool() so FastMCP still sees the original signature:
+
+    @mcp.tool()
+    @cached_tool(maxsize=256)
+    def add_numbers(a: int, b: int) -> int:
+        ...
+
+Only use it for tools without side effects that return values callers do not mutate.
+"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+# Tool name -> decorated wrapper, for cache_metrics()
+CACHED_TOOLS: dict[str, Callable] = {}
+
+
+class ToolResultCache:
+    """Thread-safe bounded LRU of one tool's results."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.stats = Counter()
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, self._entries[key]
+            self.stats["misses"] += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "evictions": self.stats["evictions"],
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+def canonical_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return json.dumps(bound.arguments, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def cached_tool(fn: Callable | None = None, *, maxsize: int = 1024, min_cost: float = 0.0):
+    """Memoize a pure tool's results; works for sync and async tools.
+
+    The wrapper's `cache` attribute is its ToolResultCache.
+    """
+    if fn is None:
+        return functools.partial(cached_tool, maxsize=maxsize, min_cost=min_cost)
+
+    signature = inspect.signature(fn)
+    cache = ToolResultCache(maxsize)
+
+    def store(key: str, value: Any, started: float) -> None:
+        if time.perf_counter() - started >= min_cost:
+            cache.put(key, value)
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = canonical_key(signature, args, kwargs)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            started = time.perf_counter()
+            value = await fn(*args, **kwargs)
+            store(key, value, started)
+            return value
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = canonical_key(signature, args, kwargs)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            started = time.perf_counter()
+            value = fn(*args, **kwargs)
+            store(key, value, started)
+            return value
+
+    wrapper.cache = cache
+    CACHED_TOOLS[fn.__name__] = wrapper
+    return wrapper
+
+
+def cache_metrics() -> dict[str, dict[str, Any]]:
+    """Hit/miss counters and sizes for every @cached_tool, by tool name."""
+    return {name: wrapper.cache.metrics() for name, wrapper in CACHED_TOOLS.items()}
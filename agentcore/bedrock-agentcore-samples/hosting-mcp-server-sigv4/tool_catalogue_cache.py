@@ -0,0 +1,139 @@
+"""
+On-disk MCP tool catalogue cache, keyed by server URL.
+
+Agents list the gateway's tools on every startup, and for large gateways that means
+paging through many tools/list round-trips. ToolCatalogueCache keeps the last full
+catalogue for each server URL in a small JSON file:
+
+  - within the TTL, the catalogue is read from disk and no request is made
+  - after the TTL, only the first page is fetched; if it matches what was cached
+    (same tools, same next cursor) the cached catalogue is revalidated, otherwise
+    the full catalogue is fetched again
+  - after max_age, the full catalogue is always fetched again, which catches
+    changes beyond the first page that the server did not announce
+  - a notifications/tools/list_changed from the server invalidates the entry
+    (see list_changed_handler())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import mcp.types as types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("MCP_TOOL_CACHE_DIR", Path.home() / ".cache" / "mcp-tool-catalogue"))
+
+
+def page_digest(tools: list[types.Tool], next_cursor: str | None) -> str:
+    """Fingerprint one tools/list page so a cheap first-page fetch can revalidate the cache."""
+    payload = json.dumps(
+        {"tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools], "next": next_cursor},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ToolCatalogueCache:
+    """Persist full MCP tool catalogues on local disk with a TTL."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        ttl: timedelta = timedelta(hours=1),
+        max_age: timedelta = timedelta(days=1),
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per server URL.
+            ttl: How long a catalogue is served without contacting the server.
+            max_age: How long a catalogue may be kept alive by first-page revalidation.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.clock = clock
+
+    def _path(self, server_url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(server_url.encode()).hexdigest()}.json"
+
+    def load(self, server_url: str) -> dict[str, Any] | None:
+        """Return the cached entry for a server, or None if missing or unreadable."""
+        try:
+            with open(self._path(server_url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == server_url else None
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        return self.clock() - entry["validated_at"] < self.ttl.total_seconds()
+
+    def can_revalidate(self, entry: dict[str, Any]) -> bool:
+        return self.clock() - entry["fetched_at"] < self.max_age.total_seconds()
+
+    def store(
+        self,
+        server_url: str,
+        tools: list[dict[str, Any]],
+        first_page_digest: str,
+        fetched_at: float | None = None,
+    ) -> dict[str, Any]:
+        """Write a catalogue atomically so concurrent readers never see a partial file."""
+        now = self.clock()
+        entry = {
+            "url": server_url,
+            "fetched_at": now if fetched_at is None else fetched_at,
+            "validated_at": now,
+            "first_page_digest": first_page_digest,
+            "tools": tools,
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(server_url))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return entry
+
+    def touch(self, server_url: str, entry: dict[str, Any]) -> None:
+        """Mark a revalidated catalogue as fresh again (its max_age clock keeps running)."""
+        self.store(server_url, entry["tools"], entry["first_page_digest"], entry["fetched_at"])
+
+    def invalidate(self, server_url: str) -> None:
+        try:
+            self._path(server_url).unlink()
+        except FileNotFoundError:
+            pass
+
+    def list_changed_handler(self, server_url: str):
+        """Build a ClientSession message_handler that drops the entry on tools/list_changed.
+
+        Example:
+            >>> ClientSession(read, write, message_handler=cache.list_changed_handler(url))
+        """
+
+        async def handle(message) -> None:
+            if isinstance(message, types.ServerNotification) and isinstance(
+                message.root, types.ToolListChangedNotification
+            ):
+                logger.info("Server reported a tool list change; invalidating cached catalogue")
+                self.invalidate(server_url)
+
+        return handle
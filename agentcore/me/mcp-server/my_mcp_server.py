@@ -4,7 +4,10 @@
 # @mcp.tool(): Decorator that turns your Python functions into MCP tools
 # Tools: Three simple tools that demonstrate different types of operations
 
+import os
+
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 mcp = FastMCP(host="0.0.0.0", stateless_http=True)
@@ -24,5 +27,13 @@ def greet_user(name: str) -> str:
     """Greet a user by name"""
     return f"Hello, {name}! Nice to meet you."
 
+# Readiness probe for load balancers and mcp_workers.py
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ready", "pid": os.getpid()})
+
+# ASGI app for multi-process serving: python mcp_workers.py --app my_mcp_server:app
+app = mcp.streamable_http_app()
+
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
\ No newline at end of file
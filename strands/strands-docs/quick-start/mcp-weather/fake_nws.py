@@ -0,0 +1,135 @@
+"""
+Local stand-in for the National Weather Service API (api.weather.gov).
+
+Serves canned /alerts/active/area/{state}, /points/{lat},{lon} and
+/gridpoints/{office}/{x},{y}/forecast responses with an optional simulated
+latency and NWS-like Cache-Control/Expires headers, and counts the requests it
+receives per path. Point server-weather.py at it by setting NWS_API_BASE to the
+returned base URL, so the weather tools can be benchmarked and checked without
+touching the real API.
+
+Usage:
+    server = start_fake_nws(latency=0.05)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    ...
+    server.shutdown()
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ALERTS_PATH = re.compile(r"^/alerts/active/area/(?P<state>[A-Za-z]{2})$")
+POINTS_PATH = re.compile(r"^/points/(?P<lat>-?[\d.]+),(?P<lon>-?[\d.]+)$")
+FORECAST_PATH = re.compile(r"^/gridpoints/(?P<office>\w+)/(?P<x>\d+),(?P<y>\d+)/forecast$")
+
+
+def fake_alerts(state: str) -> dict:
+    return {
+        "features": [
+            {
+                "properties": {
+                    "event": event,
+                    "areaDesc": f"Somewhere in {state.upper()}",
+                    "severity": "Moderate",
+                    "description": f"A {event.lower()} is in effect.",
+                    "instruction": "Stay informed.",
+                }
+            }
+            for event in ("Wind Advisory", "Flood Watch")
+        ]
+    }
+
+
+def fake_grid_point(lat: float, lon: float) -> tuple[str, int, int]:
+    """Map a coordinate to a 2.5 km-ish grid cell, the way /points does."""
+    return "TST", int((lat + 90) * 40), int((lon + 180) * 40)
+
+
+def fake_forecast(office: str, x: int, y: int) -> dict:
+    return {
+        "properties": {
+            "periods": [
+                {
+                    "name": name,
+                    "temperature": 60 + i,
+                    "temperatureUnit": "F",
+                    "windSpeed": "5 to 10 mph",
+                    "windDirection": "NW",
+                    "detailedForecast": f"Partly sunny over grid {office} {x},{y}.",
+                }
+                for i, name in enumerate(["Today", "Tonight", "Monday", "Monday Night", "Tuesday", "Tuesday Night"])
+            ]
+        }
+    }
+
+
+class FakeNWSHandler(BaseHTTPRequestHandler):
+    """Answers the NWS endpoints that server-weather.py calls."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle plus delayed
+    # ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    latency = 0.0
+    requests: Counter
+    # Freshness headers per endpoint; alerts use Expires rather than Cache-Control
+    cache_control = {"points": "public, max-age=3600", "forecast": "public, max-age=600"}
+    alerts_expire_after = 30
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        base = f"http://{self.headers.get('Host')}"
+
+        if match := ALERTS_PATH.match(self.path):
+            self.requests["alerts"] += 1
+            expires = formatdate(time.time() + self.alerts_expire_after, usegmt=True)
+            self._send_json(fake_alerts(match["state"]), {"Expires": expires})
+        elif match := POINTS_PATH.match(self.path):
+            self.requests["points"] += 1
+            office, x, y = fake_grid_point(float(match["lat"]), float(match["lon"]))
+            properties = {
+                "gridId": office,
+                "gridX": x,
+                "gridY": y,
+                "forecast": f"{base}/gridpoints/{office}/{x},{y}/forecast",
+            }
+            self._send_json({"properties": properties}, {"Cache-Control": self.cache_control["points"]})
+        elif match := FORECAST_PATH.match(self.path):
+            self.requests["forecast"] += 1
+            forecast = fake_forecast(match["office"], int(match["x"]), int(match["y"]))
+            self._send_json(forecast, {"Cache-Control": self.cache_control["forecast"]})
+        else:
+            self.send_error(404)
+
+    def _send_json(self, payload: dict, headers: dict[str, str]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_nws(latency: float = 0.0) -> ThreadingHTTPServer:
+    """Start the fake NWS API on a free localhost port in a daemon thread.
+
+    The returned server's `requests` attribute counts hits per endpoint
+    ("alerts", "points", "forecast").
+    """
+    counter = Counter()
+    handler = type("Handler", (FakeNWSHandler,), {"latency": latency, "requests": counter})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = counter
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
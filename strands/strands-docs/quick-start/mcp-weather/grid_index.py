@@ -0,0 +1,148 @@
+"""
+Spatial index from quantised coordinates to NWS forecast grid points.
+
+get_forecast resolves every coordinate to an NWS grid cell with a /points lookup
+before it can fetch the forecast. The grid cells are about 2.5 km across, so nearby
+coordinates share a cell. GridPointIndex rounds coordinates to a fixed resolution
+(0.01 degrees, about 1 km, by default) and remembers the grid office, cell and
+forecast URL for each bucket, so most forecasts skip the /points hop entirely.
+
+The index lives in memory and can also be persisted to SQLite, so it survives
+server restarts. Hits and misses are counted for the /metrics route.
+
+Usage:
+    index = GridPointIndex(db_path="grid_points.sqlite3")
+    point = index.lookup(40.7128, -74.0060)
+    if point is None:
+        ... /points lookup ...
+        point = index.add(40.7128, -74.0060, points_data["properties"])
+    forecast_url = point.forecast_url
+"""
+
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class GridPoint:
+    """The NWS grid cell a coordinate bucket resolves to."""
+
+    office: str
+    grid_x: int
+    grid_y: int
+    forecast_url: str
+    updated_at: float
+
+
+class GridPointIndex:
+    """Quantised lat/lon -> GridPoint, in memory with optional SQLite persistence."""
+
+    def __init__(
+        self,
+        resolution: float = 0.01,
+        max_age: float = 30 * 24 * 3600,
+        db_path: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the index.
+
+        Args:
+            resolution: Bucket size in degrees; coordinates in one bucket share a grid point.
+            max_age: Seconds before an entry is looked up again (NWS grids change rarely).
+            db_path: SQLite file to persist entries in; None keeps them in memory only.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.resolution = resolution
+        self.max_age = max_age
+        self.clock = clock
+        self.stats = Counter()
+        self._points: dict[tuple[int, int], GridPoint] = {}
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if db_path is not None:
+            self._open(Path(db_path))
+
+    def _open(self, db_path: Path) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS grid_points (
+                lat_bucket INTEGER NOT NULL,
+                lon_bucket INTEGER NOT NULL,
+                office TEXT NOT NULL,
+                grid_x INTEGER NOT NULL,
+                grid_y INTEGER NOT NULL,
+                forecast_url TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (lat_bucket, lon_bucket)
+            )
+            """
+        )
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT lat_bucket, lon_bucket, office, grid_x, grid_y, forecast_url, updated_at FROM grid_points"
+        )
+        for lat_bucket, lon_bucket, *point in rows:
+            self._points[(lat_bucket, lon_bucket)] = GridPoint(*point)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def bucket(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return round(latitude / self.resolution), round(longitude / self.resolution)
+
+    def quantise(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Centre of the bucket a coordinate falls in, rounded for use in a /points URL."""
+        lat_bucket, lon_bucket = self.bucket(latitude, longitude)
+        return round(lat_bucket * self.resolution, 4), round(lon_bucket * self.resolution, 4)
+
+    def lookup(self, latitude: float, longitude: float) -> GridPoint | None:
+        key = self.bucket(latitude, longitude)
+        with self._lock:
+            point = self._points.get(key)
+            if point is not None and self.clock() - point.updated_at >= self.max_age:
+                point = None
+            self.stats["hits" if point is not None else "misses"] += 1
+        return point
+
+    def add(self, latitude: float, longitude: float, properties: dict[str, Any]) -> GridPoint:
+        """Record the grid point from a /points response's `properties`."""
+        key = self.bucket(latitude, longitude)
+        point = GridPoint(
+            office=properties.get("gridId", ""),
+            grid_x=int(properties.get("gridX", 0)),
+            grid_y=int(properties.get("gridY", 0)),
+            forecast_url=properties["forecast"],
+            updated_at=self.clock(),
+        )
+        with self._lock:
+            self._points[key] = point
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO grid_points VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, point.office, point.grid_x, point.grid_y, point.forecast_url, point.updated_at),
+                )
+                self._db.commit()
+        return point
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._points),
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "hit_rate": round(self.hit_rate, 4),
+        }
@@ -3,6 +3,7 @@ from strands.tools.mcp.mcp_client import MCPClient
 from mcp.client.streamable_http import streamablehttp_client
 import asyncio
 from strands.models import BedrockModel
+from mcp_client_pool import MCPClientPool
 
 model_id = "anthropic.claude-3-5-sonnet-20241022-v2:0"
 model = BedrockModel(
@@ -11,15 +12,20 @@ model = BedrockModel(
 
 # Pre-req, run the following to start the streamable Http server, in a different terminal:
 # python mcp-streamable-http/python-example/server/weather.py
-streamable_http_mcp_client = MCPClient(
+# The script asks one question per city. The pool keeps the initialized MCP session
+# warm between them, so after the first question each agent invocation borrows it
+# instead of opening a new HTTP session and re-running the initialize handshake
+mcp_client_pool = MCPClientPool(
     lambda: streamablehttp_client(
         url="http://localhost:8123/mcp"
     ))
 
+CITIES = ["New York", "Chicago", "Seattle"]
 
-async def process_streaming_response():
-    # Create an agent with MCP tools inside the context manager
-    with streamable_http_mcp_client:
+
+async def process_streaming_response(city):
+    # Create an agent with MCP tools while holding a pooled client
+    with mcp_client_pool.client() as streamable_http_mcp_client:
         # Get the tools from the MCP server
         tools = streamable_http_mcp_client.list_tools_sync()
 
@@ -30,7 +36,7 @@ async def process_streaming_response():
             tools=tools
         )
         
-        agent_stream = agent.stream_async("What is the weather in New York?")
+        agent_stream = agent.stream_async(f"What is the weather in {city}?")
         async for event in agent_stream:
             # Track event loop lifecycle
             if event.get("init_event_loop", False):
@@ -48,4 +54,15 @@ async def process_streaming_response():
                     f"🛑 Event loop force-stopped: {event.get('force_stop_reason', 'unknown reason')}"
                 )
 
-asyncio.run(process_streaming_response())
\ No newline at end of file
+
+async def main():
+    # One question at a time: pool.client() blocks while waiting for a free client,
+    # so borrowers must not share one event loop concurrently
+    for city in CITIES:
+        await process_streaming_response(city)
+
+
+try:
+    asyncio.run(main())
+finally:
+    mcp_client_pool.close()
@@ -0,0 +1,170 @@
+"""
+Pool of warm, initialized Strands MCPClient sessions.
+
+`MCPClient(lambda: streamablehttp_client(...))` opens a new HTTP session and runs the
+MCP `initialize` handshake every time it is entered. MCPClientPool keeps started
+clients around and lends them out, so short agent invocations reuse an initialized
+session instead of paying for the handshake each time.
+
+  - idle clients are health-checked (tools/list) before reuse if they have been
+    idle a while, or if the previous borrower raised
+  - clients idle longer than idle_timeout are stopped by a background reaper
+  - at most max_size clients exist at once; borrowers wait for a free one
+
+Example:
+    pool = MCPClientPool(lambda: streamablehttp_client("http://localhost:8123/mcp"))
+    with pool.client() as mcp_client:
+        agent = Agent(tools=mcp_client.list_tools_sync())
+        agent("What is the weather in New York?")
+    pool.close()
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from strands.tools.mcp.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+class MCPClientPool:
+    """Keeps started MCPClient sessions warm and hands them out to agents."""
+
+    def __init__(
+        self,
+        transport_callable: Callable[[], Any],
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_after: float = 30.0,
+        reap_interval: float = 30.0,
+        **client_kwargs: Any,
+    ):
+        """Initialize the pool.
+
+        Args:
+            transport_callable: Transport factory, as passed to MCPClient.
+            max_size: Maximum number of clients (idle plus borrowed).
+            idle_timeout: Seconds an idle client is kept before it is stopped.
+            health_check_after: Seconds of idleness after which a client is checked
+                with tools/list before being handed out again.
+            reap_interval: Seconds between idle-eviction sweeps.
+            **client_kwargs: Extra MCPClient arguments (prefix, tool_filters, ...).
+        """
+        self.transport_callable = transport_callable
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.client_kwargs = client_kwargs
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # Most recently returned last, so the warmest client is reused first
+        self._idle: list[tuple[MCPClient, float]] = []
+        self._closed = threading.Event()
+        self._reaper = threading.Thread(
+            target=self._reap_loop, args=(reap_interval,), name="mcp-client-pool-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def __enter__(self) -> "MCPClientPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def warm(self, count: int = 1) -> None:
+        """Start `count` clients ahead of time so the first borrowers skip initialize."""
+        clients = [self.acquire() for _ in range(count)]
+        for client in clients:
+            self.release(client)
+
+    def acquire(self, timeout: float | None = None) -> MCPClient:
+        """Borrow a started client, creating one if none is idle."""
+        if self._closed.is_set():
+            raise RuntimeError("MCPClientPool is closed")
+        if not self._slots.acquire(timeout=timeout if timeout is not None else -1):
+            raise TimeoutError("No MCP client available in the pool")
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    return self._start_client()
+                client, last_used = entry
+                if time.monotonic() - last_used < self.health_check_after or self._is_healthy(client):
+                    return client
+                logger.info("Discarding unhealthy pooled MCP client")
+                self._stop_client(client)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, client: MCPClient, needs_check: bool = False) -> None:
+        """Return a borrowed client; needs_check forces a health check before reuse."""
+        try:
+            if self._closed.is_set():
+                self._stop_client(client)
+                return
+            last_used = float("-inf") if needs_check else time.monotonic()
+            with self._lock:
+                self._idle.append((client, last_used))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def client(self, timeout: float | None = None) -> Iterator[MCPClient]:
+        """Borrow a client for the duration of a with-block."""
+        client = self.acquire(timeout)
+        failed = True
+        try:
+            yield client
+            failed = False
+        finally:
+            self.release(client, needs_check=failed)
+
+    def evict_idle(self) -> int:
+        """Stop clients that have been idle longer than idle_timeout; return how many."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            expired = [client for client, last_used in self._idle if last_used < cutoff]
+            self._idle = [(client, last_used) for client, last_used in self._idle if last_used >= cutoff]
+        for client in expired:
+            self._stop_client(client)
+        return len(expired)
+
+    def close(self) -> None:
+        """Stop the reaper and every idle client; borrowed clients stop when released."""
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client, _ in idle:
+            self._stop_client(client)
+
+    def _start_client(self) -> MCPClient:
+        client = MCPClient(self.transport_callable, **self.client_kwargs)
+        # start() opens the transport and runs the initialize handshake
+        return client.start()
+
+    @staticmethod
+    def _is_healthy(client: MCPClient) -> bool:
+        try:
+            client.list_tools_sync()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _stop_client(client: MCPClient) -> None:
+        try:
+            client.stop(None, None, None)
+        except Exception:
+            logger.warning("Error stopping pooled MCP client", exc_info=True)
+
+    def _reap_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            evicted = self.evict_idle()
+            if evicted:
+                logger.debug("Evicted %d idle MCP clients", evicted)
@@ -0,0 +1,106 @@
+"""
+Check the NWS response cache and grid-point index in server-weather.py against a
+local fake NWS API.
+
+Runs the weather tools directly (no MCP transport) against fake_nws.py and shows
+that repeated forecasts for the same area make no further upstream calls, that
+expired forecasts are fetched again, that nearby coordinates (and a restarted
+server, via SQLite) skip the /points lookup, and that concurrent identical tool
+calls share one upstream request.
+
+Usage:
+  python nws_cache_local.py
+"""
+
+import asyncio
+import importlib.util
+import tempfile
+from pathlib import Path
+
+from fake_nws import start_fake_nws
+from grid_index import GridPointIndex
+
+HERE = Path(__file__).resolve().parent
+
+
+def load_weather_server():
+    spec = importlib.util.spec_from_file_location("server_weather", HERE / "server-weather.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def main():
+    nws = start_fake_nws(latency=0.02)
+    weather = load_weather_server()
+    weather.NWS_API_BASE = f"http://127.0.0.1:{nws.server_port}"
+    now = [1_000_000.0]
+    weather.nws_client.clock = lambda: now[0]
+
+    try:
+        await weather.get_forecast(40.7128, -74.0060)
+        print(f"first forecast:            {dict(nws.requests)}")
+        assert nws.requests == {"points": 1, "forecast": 1}
+
+        for _ in range(10):
+            await weather.get_forecast(40.7128, -74.0060)
+        print(f"10 repeated forecasts:     {dict(nws.requests)}")
+        assert nws.requests == {"points": 1, "forecast": 1}, "repeated forecasts went upstream"
+
+        # /points follows the upstream max-age and only defaults to a day without one
+        points = weather.nws_client.policy_for(f"{weather.NWS_API_BASE}/points/40.7128,-74.006")
+        assert points.ttl(3600) == 3600 and points.ttl(None) == 24 * 3600
+
+        # Forecasts are cached for at most 10 minutes (max-age=600)
+        now[0] += 11 * 60
+        await weather.get_forecast(40.7128, -74.0060)
+        print(f"after 11 minutes:          {dict(nws.requests)}")
+        assert nws.requests == {"points": 1, "forecast": 2}
+
+        # The grid index keeps the /points answer for 30 days
+        now[0] += 25 * 60 * 60
+        await weather.get_forecast(40.7128, -74.0060)
+        print(f"after 25 hours:            {dict(nws.requests)}")
+        assert nws.requests == {"points": 1, "forecast": 3}
+
+        # A coordinate ~30 m away falls in the same 0.01 degree bucket
+        await weather.get_forecast(40.7130, -74.0058)
+        print(f"nearby coordinate:         {dict(nws.requests)}")
+        assert nws.requests == {"points": 1, "forecast": 3}
+
+        # A restarted server loads the grid index back from SQLite
+        with tempfile.TemporaryDirectory() as tmp:
+            weather.grid_index = GridPointIndex(db_path=Path(tmp) / "grid.sqlite3")
+            await weather.get_forecast(47.6062, -122.3321)
+            weather.grid_index.close()
+            weather.grid_index = GridPointIndex(db_path=Path(tmp) / "grid.sqlite3")
+            await weather.get_forecast(47.6062, -122.3321)
+            print(f"index after restart:       {dict(nws.requests)}")
+            assert nws.requests["points"] == 2
+            print(f"grid index metrics:        {weather.grid_index.metrics()}")
+            weather.grid_index.close()
+
+        # Alerts carry an Expires header 30 seconds ahead
+        await weather.get_alerts("NY")
+        await weather.get_alerts("NY")
+        now[0] += 31
+        await weather.get_alerts("NY")
+        print(f"alerts, 3 calls over 31 s: {nws.requests['alerts']} upstream")
+        assert nws.requests["alerts"] == 2
+
+        # With a cold cache, 10 concurrent identical calls still make one request
+        weather.nws_client.clear()
+        results = await asyncio.gather(*(weather.get_alerts("NY") for _ in range(10)))
+        print(f"10 concurrent get_alerts:  {nws.requests['alerts'] - 2} upstream")
+        assert nws.requests["alerts"] == 3 and len(set(results)) == 1
+        print(f"single-flight stats:       {dict(weather.get_alerts.stats)}")
+
+        print(f"\ncache stats: {dict(weather.nws_client.stats)}")
+        print("OK")
+    finally:
+        await weather.nws_client.aclose()
+        nws.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+"""
+Pooled, caching HTTP client for the National Weather Service API.
+
+server-weather.py used to open a new httpx.AsyncClient for every upstream request,
+so each call paid for a new connection and TLS handshake, and get_forecast did that
+twice in a row. NWSClient keeps one keep-alive client for the lifetime of the server
+and caches JSON responses in memory:
+
+  - freshness comes from the upstream Cache-Control (s-maxage, then max-age, minus
+    Age) or Expires header; no-store / no-cache responses are not cached
+  - a per-endpoint CachePolicy supplies the TTL when the upstream sends none and
+    caps it otherwise: /points grid lookups default to a day (the grid for a
+    coordinate practically never changes), forecasts and alerts only briefly
+  - errors are never cached
+
+Usage:
+    nws = NWSClient(user_agent="weather-app/1.0")
+    data = await nws.get_json("https://api.weather.gov/points/40.71,-74.0")
+    await nws.aclose()
+"""
+
+import logging
+import re
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """TTL bounds, in seconds, for one kind of NWS endpoint."""
+
+    default: float
+    minimum: float = 0.0
+    maximum: float = float("inf")
+
+    def ttl(self, upstream_ttl: float | None) -> float:
+        if upstream_ttl is None:
+            return self.default
+        return min(max(upstream_ttl, self.minimum), self.maximum)
+
+
+# Matched against the URL path in order; the first match wins
+DEFAULT_POLICIES: list[tuple[re.Pattern, CachePolicy]] = [
+    (re.compile(r"^/points/"), CachePolicy(default=24 * 3600, maximum=30 * 24 * 3600)),
+    (re.compile(r"/forecast(/hourly)?$"), CachePolicy(default=300, maximum=900)),
+    (re.compile(r"^/alerts/"), CachePolicy(default=30, maximum=120)),
+]
+FALLBACK_POLICY = CachePolicy(default=0, maximum=300)
+
+
+def ttl_from_headers(headers: httpx.Headers, now: float) -> float | None:
+    """Seconds a response may be reused for, per HTTP caching rules.
+
+    Returns 0 for responses that must not be reused and None if the headers say
+    nothing about freshness.
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    # This cache is shared by every MCP client, so s-maxage takes precedence
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            age = headers.get("age", "0")
+            return max(0.0, int(directives[name]) - (int(age) if age.isdigit() else 0))
+
+    expires = headers.get("expires")
+    if expires is None:
+        return None
+    try:
+        expires_at = parsedate_to_datetime(expires).timestamp()
+    except (TypeError, ValueError):
+        # An invalid Expires (such as "0") means already expired
+        return 0.0
+    try:
+        date = parsedate_to_datetime(headers["date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        date = now
+    return max(0.0, expires_at - date)
+
+
+class NWSClient:
+    """One pooled httpx.AsyncClient plus an in-memory TTL cache of JSON responses."""
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout: float = 30.0,
+        max_entries: int = 1024,
+        policies: list[tuple[re.Pattern, CachePolicy]] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the client.
+
+        Args:
+            user_agent: User-Agent sent upstream (NWS requires one).
+            timeout: HTTP timeout in seconds.
+            max_entries: Cached responses kept before the least recently used is dropped.
+            policies: (path pattern, CachePolicy) pairs; defaults to DEFAULT_POLICIES.
+            clock: Returns the current time in seconds; overridable for testing.
+        """
+        self.headers = {"User-Agent": user_agent, "Accept": "application/geo+json"}
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.clock = clock
+        self.stats = Counter()
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the server's running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def policy_for(self, url: str) -> CachePolicy:
+        path = httpx.URL(url).path
+        for pattern, policy in self.policies:
+            if pattern.search(path):
+                return policy
+        return FALLBACK_POLICY
+
+    def cached(self, url: str) -> dict[str, Any] | None:
+        """Return a fresh cached response for url, or None."""
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= self.clock():
+            del self._cache[url]
+            return None
+        self._cache.move_to_end(url)
+        return data
+
+    def store(self, url: str, data: dict[str, Any], ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._cache[url] = (self.clock() + ttl, data)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def get_json(self, url: str) -> dict[str, Any] | None:
+        """GET a JSON document, from the cache when fresh; None on any error."""
+        data = self.cached(url)
+        if data is not None:
+            self.stats["hits"] += 1
+            return data
+
+        self.stats["misses"] += 1
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            self.stats["errors"] += 1
+            logger.debug("NWS request failed: %s", url, exc_info=True)
+            return None
+
+        upstream_ttl = ttl_from_headers(response.headers, self.clock())
+        # no-store / no-cache always win over the policy minimum
+        if upstream_ttl != 0:
+            self.store(url, data, self.policy_for(url).ttl(upstream_ttl))
+        return data
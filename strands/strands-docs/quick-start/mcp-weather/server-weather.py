@@ -1,12 +1,19 @@
 """Weather tools for MCP Streamable HTTP server using NWS API."""
 
 import argparse
+import os
+from contextlib import asynccontextmanager
 from typing import Any
 
-import httpx
 import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from mcp.server.fastmcp import FastMCP
+from grid_index import GridPointIndex
+from nws_client import NWSClient
+from single_flight import single_flight
 
 
 # Initialize FastMCP server for Weather tools.
@@ -18,17 +25,20 @@ mcp = FastMCP(name="weather", json_response=False, stateless_http=False)
 NWS_API_BASE = "https://api.weather.gov"
 USER_AGENT = "weather-app/1.0"
 
+# One keep-alive connection pool and response cache for the lifetime of the server
+nws_client = NWSClient(user_agent=USER_AGENT)
+
+# Quantised lat/lon -> NWS grid point; set WEATHER_GRID_DB to persist it in SQLite
+grid_index = GridPointIndex(db_path=os.environ.get("WEATHER_GRID_DB"))
+
 
 async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
-    headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+    """Make a request to the NWS API with proper error handling.
+
+    Responses are cached as the upstream Cache-Control/Expires headers allow:
+    /points grid lookups for a day or more, forecasts and alerts for minutes.
+    """
+    return await nws_client.get_json(url)
 
 
 def format_alert(feature: dict) -> str:
@@ -44,6 +54,7 @@ Instructions: {props.get('instruction', 'No specific instructions provided')}
 
 
 @mcp.tool()
+@single_flight
 async def get_alerts(state: str) -> str:
     """Get weather alerts for a US state.
 
@@ -64,6 +75,7 @@ async def get_alerts(state: str) -> str:
 
 
 @mcp.tool()
+@single_flight
 async def get_forecast(latitude: float, longitude: float) -> str:
     """Get weather forecast for a location.
 
@@ -71,15 +83,19 @@ async def get_forecast(latitude: float, longitude: float) -> str:
         latitude: Latitude of the location
         longitude: Longitude of the location
     """
-    # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
+    # First get the forecast grid endpoint, from the index when a nearby point was seen
+    grid_point = grid_index.lookup(latitude, longitude)
+    if grid_point is None:
+        points_url = f"{NWS_API_BASE}/points/{','.join(map(str, grid_index.quantise(latitude, longitude)))}"
+        points_data = await make_nws_request(points_url)
+
+        if not points_data:
+            return "Unable to fetch forecast data for this location."
 
-    if not points_data:
-        return "Unable to fetch forecast data for this location."
+        grid_point = grid_index.add(latitude, longitude, points_data["properties"])
 
     # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
+    forecast_url = grid_point.forecast_url
     forecast_data = await make_nws_request(forecast_url)
 
     if not forecast_data:
@@ -100,10 +116,40 @@ Forecast: {period['detailedForecast']}
     return "\n---\n".join(forecasts)
 
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    """Grid index hit rate, NWS response cache and request coalescing counters."""
+    return JSONResponse(
+        {
+            "grid_index": grid_index.metrics(),
+            "nws_cache": dict(nws_client.stats),
+            "single_flight": {tool.__name__: dict(tool.stats) for tool in (get_alerts, get_forecast)},
+        }
+    )
+
+
+def create_app() -> Starlette:
+    """Streamable HTTP app that also closes the pooled NWS client on shutdown."""
+    app = mcp.streamable_http_app()
+    session_manager_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with session_manager_lifespan(app):
+            try:
+                yield
+            finally:
+                await nws_client.aclose()
+                grid_index.close()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run MCP Streamable HTTP based server")
     parser.add_argument("--port", type=int, default=8123, help="Localhost port to listen on")
     args = parser.parse_args()
 
     # Start the server with Streamable HTTP transport
-    uvicorn.run(mcp.streamable_http_app, host="localhost", port=args.port)
\ No newline at end of file
+    uvicorn.run(create_app(), host="localhost", port=args.port)
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Single-flight request coalescing for async FastMCP tools.
+
+When several agents call the same tool with the same arguments at the same moment,
+each call would otherwise make its own upstream request. @single_flight lets the
+first call run and makes every identical call that arrives while it is in flight
+await the same result (or exception). Once the call finishes, the next one runs
+again, so this coalesces concurrent work without caching anything.
+
+Put it below @mcp.tool() so FastMCP still sees the original signature:
+
+    @mcp.tool()
+    @single_flight
+    async def get_alerts(state: str) -> str:
+        ...
+
+Calls are identical when their bound arguments (defaults applied) are equal; pass
+key=... to choose a different key, e.g. key=lambda state: state.upper().
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def single_flight(
+    fn: Callable[..., Awaitable[T]] | None = None,
+    *,
+    key: Callable[..., Hashable] | None = None,
+):
+    """Coalesce concurrent identical calls of an async function into one.
+
+    The wrapper's `stats` counter records "calls" and "coalesced" (calls that
+    shared another call's result).
+    """
+    if fn is None:
+        return functools.partial(single_flight, key=key)
+    if not inspect.iscoroutinefunction(fn):
+        raise TypeError(f"single_flight needs an async function, got {fn!r}")
+
+    signature = inspect.signature(fn)
+    in_flight: dict[Hashable, asyncio.Task] = {}
+    stats = Counter()
+
+    def call_key(args: tuple, kwargs: dict) -> Hashable:
+        if key is not None:
+            return key(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return json.dumps(bound.arguments, sort_keys=True, default=repr)
+
+    def forget(flight_key: Hashable, task: asyncio.Task) -> None:
+        if in_flight.get(flight_key) is task:
+            del in_flight[flight_key]
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        # Futures belong to one event loop, so flights are never shared across loops
+        flight_key = (id(asyncio.get_running_loop()), call_key(args, kwargs))
+        stats["calls"] += 1
+        task = in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            in_flight[flight_key] = task
+            task.add_done_callback(functools.partial(forget, flight_key))
+        else:
+            stats["coalesced"] += 1
+        # shield: one caller being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    wrapper.stats = stats
+    return wrapper